@@ -0,0 +1,19 @@
+import django_filters
+
+from meetings.filters import MeetingFilterSet
+
+
+class MeetingFilter(MeetingFilterSet):
+    """
+    The shared meeting filters (q, status, date_from, date_to; see
+    meetings.filters) plus
+    ?room=<id>&organizer=<id>&start_after=<datetime>&start_before=<datetime>
+    Every bound compares the raw start_time/end_time columns so indexes stay usable.
+    """
+    room = django_filters.NumberFilter(field_name='room_id')
+    organizer = django_filters.NumberFilter(field_name='organizer_id')
+    start_after = django_filters.IsoDateTimeFilter(field_name='start_time', lookup_expr='gte')
+    start_before = django_filters.IsoDateTimeFilter(field_name='start_time', lookup_expr='lt')
+
+    class Meta(MeetingFilterSet.Meta):
+        fields = MeetingFilterSet.Meta.fields + ['room', 'organizer', 'start_after', 'start_before']
@@ -0,0 +1,71 @@
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from meetings.pagination import KeysetPaginator
+
+
+class MeetingKeysetPagination(BasePagination):
+    """
+    DRF adapter for meetings.pagination.KeysetPaginator.
+    Query params: ``cursor``, ``page_size`` (capped) and ``count``
+    (``exact``, ``estimate`` or ``capped``; omitted means no total).
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    count_query_param = "count"
+    ordering = ("-start_time", "-id")
+
+    def _paginator(self, queryset, request):
+        self.request = request
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode not in ("exact", "estimate", "capped"):
+            count_mode = "none"
+        self.paginator = KeysetPaginator(
+            queryset,
+            request.query_params.get(self.page_size_query_param),
+            ordering=self.ordering,
+            count_mode=count_mode,
+        )
+        return self.paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        paginator = self._paginator(queryset, request)
+        self.page = paginator.get_page(request.query_params.get(self.cursor_query_param))
+        return list(self.page)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset`` for async views; the total is loaded up front."""
+        paginator = self._paginator(queryset, request)
+        self.page = await paginator.aget_page(request.query_params.get(self.cursor_query_param))
+        return list(self.page)
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        body = {
+            "next": self._link(self.page.next_cursor),
+            "previous": self._link(self.page.previous_cursor),
+            "results": data,
+        }
+        if self.paginator.count is not None:
+            body["count"] = self.paginator.count
+            body["count_is_exact"] = self.paginator.count_is_exact
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "count": {"type": "integer"},
+                "count_is_exact": {"type": "boolean"},
+                "results": schema,
+            },
+        }
@@ -1,5 +1,9 @@
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
 from rest_framework import serializers
+from meetings import recurrence
 from meetings.models import MeetingRoom, Meeting
+from meetings.services import BookingConflict, book_meeting
 
 class MeetingRoomSerializer(serializers.ModelSerializer):
     class Meta:
@@ -12,3 +16,84 @@ class MeetingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Meeting
         fields = '__all__'
+
+    def create(self, validated_data):
+        return self._book(Meeting(**validated_data))
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        return self._book(instance)
+
+    def _book(self, meeting):
+        # Same rule validation and atomic overlap check as the HTML views and the admin.
+        try:
+            recurrence.validate(meeting)
+            return book_meeting(meeting)
+        except ValidationError as exc:
+            raise serializers.ValidationError({"non_field_errors": exc.messages})
+        except BookingConflict as exc:
+            raise serializers.ValidationError({"non_field_errors": [str(exc)]})
+
+
+class MeetingListSerializer:
+    """
+    Read-only list representation built straight from ``values()`` rows.
+    Produces the same shape as MeetingSerializer without instantiating models
+    or running per-field ModelSerializer machinery for every row.
+    """
+    values_fields = (
+        'id', 'title', 'description', 'start_time', 'end_time', 'is_active',
+        'created_at', 'minutes_file', 'organizer_id', 'room_id', 'room__name',
+        'room__location', 'room__capacity', 'room__created_at',
+        *recurrence.FIELDS, 'series_end',
+    )
+    _datetime = serializers.DateTimeField()
+
+    def __init__(self, rows, request=None):
+        self.rows = rows
+        self.request = request
+
+    @classmethod
+    def values(cls, queryset):
+        return queryset.values(*cls.values_fields)
+
+    def _dt(self, value):
+        return self._datetime.to_representation(value) if value else None
+
+    def _file_url(self, name):
+        if not name:
+            return None
+        url = default_storage.url(name)
+        return self.request.build_absolute_uri(url) if self.request else url
+
+    @property
+    def data(self):
+        dt = self._dt
+        return [
+            {
+                'id': row['id'],
+                'room': {
+                    'id': row['room_id'],
+                    'name': row['room__name'],
+                    'location': row['room__location'],
+                    'capacity': row['room__capacity'],
+                    'created_at': dt(row['room__created_at']),
+                },
+                'title': row['title'],
+                'description': row['description'],
+                'start_time': dt(row['start_time']),
+                'end_time': dt(row['end_time']),
+                'is_active': row['is_active'],
+                'created_at': dt(row['created_at']),
+                'minutes_file': self._file_url(row['minutes_file']),
+                'organizer': row['organizer_id'],
+                'recurrence': row['recurrence'],
+                'recurrence_interval': row['recurrence_interval'],
+                'recurrence_count': row['recurrence_count'],
+                'recurrence_until': row['recurrence_until'].isoformat() if row['recurrence_until'] else None,
+                'recurrence_exceptions': row['recurrence_exceptions'],
+                'series_end': dt(row['series_end']),
+            }
+            for row in self.rows
+        ]
@@ -1,3 +1,112 @@
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from meetings import listing_cache
+from meetings.availability import availability
+from meetings.models import Meeting, MeetingRoom
+
+from .filters import MeetingFilter
+from .views import MeetingViewSet
+
+
+class ApiTestCase(TestCase):
+    """One user, one room and a reference time; requests go straight to the viewset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('alice', password='pass12345')
+        cls.room = MeetingRoom.objects.create(name='Boardroom', capacity=8)
+        cls.now = timezone.now().replace(microsecond=0)
+
+    def setUp(self):
+        availability.clear()
+        cache.clear()
+        listing_cache.get_cache().clear()
+        self.factory = APIRequestFactory(SERVER_NAME='localhost')
+
+    def make_meeting(self, start_offset, hours=1, **kwargs):
+        start = self.now + timedelta(hours=start_offset)
+        fields = {
+            'title': 'Sync',
+            'organizer': self.user,
+            'room': self.room,
+            'start_time': start,
+            'end_time': start + timedelta(hours=hours),
+        }
+        fields.update(kwargs)
+        return Meeting.objects.create(**fields)
+
+    def call(self, action, request, method='get', **kwargs):
+        force_authenticate(request, self.user)
+        view = MeetingViewSet.as_view({method: action})
+        if iscoroutinefunction(view):
+            view = async_to_sync(view)
+        response = view(request, **kwargs)
+        if hasattr(response, 'render'):  # 304s are plain Django responses
+            response.render()
+        return response
+
+
+# -----------------------------------
+# FILTERS
+# -----------------------------------
+class MeetingFilterTests(ApiTestCase):
+    def test_invalid_values_are_rejected(self):
+        self.make_meeting(1, title='Planning')
+        self.assertFalse(MeetingFilter({'status': 'soon'}, queryset=Meeting.objects.all()).is_valid())
+        api = MeetingFilter({'status': 'upcoming', 'q': 'plan'}, queryset=Meeting.objects.all())
+        self.assertEqual([m.title for m in api.qs], ['Planning'])
+
+
+# -----------------------------------
+# MEETING ENDPOINTS
+# -----------------------------------
+class MeetingViewSetTests(ApiTestCase):
+    def test_list_pages_by_cursor_and_answers_304_when_unchanged(self):
+        for hours in (1, 2, 3):
+            self.make_meeting(hours, title=f'Sync {hours}')
+        response = self.call('list', self.factory.get('/api/meetings/', {'page_size': 2, 'count': 'exact'}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['title'] for row in response.data['results']], ['Sync 3', 'Sync 2'])
+        self.assertEqual((response.data['count'], response.data['count_is_exact']), (3, True))
+        cursor = parse_qs(urlsplit(response.data['next']).query)['cursor'][0]
+        rest = self.call('list', self.factory.get('/api/meetings/', {'page_size': 2, 'cursor': cursor}))
+        self.assertEqual([row['title'] for row in rest.data['results']], ['Sync 1'])
+
+        again = self.factory.get(
+            '/api/meetings/', {'page_size': 2, 'count': 'exact'}, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(self.call('list', again).status_code, 304)
+
+    def test_occurrences_window_is_capped(self):
+        self.make_meeting(1, recurrence='daily', recurrence_count=3)
+        params = {'start': self.now.isoformat(), 'end': (self.now + timedelta(days=7)).isoformat()}
+        response = self.call('occurrences', self.factory.get('/api/meetings/occurrences/', params))
+        self.assertEqual(len(response.data), 3)
+        params['end'] = (self.now + timedelta(days=93)).isoformat()
+        response = self.call('occurrences', self.factory.get('/api/meetings/occurrences/', params))
+        self.assertEqual(response.status_code, 400)
 
-# Create your tests here.
+    def test_import_dry_run_writes_nothing(self):
+        start = self.now + timedelta(days=1)
+        upload = SimpleUploadedFile(
+            'meetings.csv',
+            (
+                'title,room,start_time,end_time\n'
+                f'Planning,Boardroom,{start.isoformat()},{(start + timedelta(hours=1)).isoformat()}\n'
+            ).encode(),
+            content_type='text/csv',
+        )
+        request = self.factory.post('/api/meetings/import/', {'file': upload, 'dry_run': '1'}, format='multipart')
+        response = self.call('bulk_import', request, method='post')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 1)
+        self.assertFalse(Meeting.objects.exists())
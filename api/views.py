@@ -1,11 +1,138 @@
-from rest_framework import viewsets
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from adrf.viewsets import GenericViewSet as AsyncGenericViewSet
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from meetings import recurrence, versioning
+from meetings.imports import READERS, ImportFormatError, import_meetings
 from meetings.models import MeetingRoom, Meeting
-from .serializers import MeetingRoomSerializer, MeetingSerializer
+from .filters import MeetingFilter
+from .pagination import MeetingKeysetPagination
+from .serializers import MeetingListSerializer, MeetingRoomSerializer, MeetingSerializer
 
 class MeetingRoomViewSet(viewsets.ModelViewSet):
     queryset = MeetingRoom.objects.all()
     serializer_class = MeetingRoomSerializer
+    replica_reads = True
 
-class MeetingViewSet(viewsets.ModelViewSet):
-    queryset = Meeting.objects.all()
+class MeetingViewSet(
+    mixins.CreateModelMixin,
+    mixins.UpdateModelMixin,
+    mixins.DestroyModelMixin,
+    AsyncGenericViewSet,
+):
+    """
+    Meetings. ``list`` and ``retrieve`` are async and use the async ORM;
+    writes, ``occurrences`` and ``import`` stay synchronous (run in a worker
+    thread).
+    """
+    queryset = Meeting.objects.select_related('room')
+    # GET/HEAD read from a replica (see meeting_manager.routing).
+    replica_reads = True
     serializer_class = MeetingSerializer
+    pagination_class = MeetingKeysetPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = MeetingFilter
+
+    def _list_scopes(self, request):
+        # Narrow the validator to the filtered room/organizer when possible.
+        room = request.query_params.get('room', '')
+        organizer = request.query_params.get('organizer', '')
+        if room.isdigit():
+            return [versioning.room_scope(room)]
+        if organizer.isdigit():
+            return [versioning.organizer_scope(organizer), versioning.ROOMS]
+        return [versioning.GLOBAL]
+
+    async def _conditional(self, request, scopes, view, time_bucket=False):
+        versions = await versioning.aget_versions(sorted(set(scopes)))
+        etag, last_modified = versioning.validators(
+            scopes, time_bucket=time_bucket, versions=versions
+        )
+        not_modified = versioning.conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return versioning.set_validators(await view(), etag, last_modified)
+
+    async def list(self, request, *args, **kwargs):
+        return await self._conditional(
+            request,
+            self._list_scopes(request),
+            lambda: self._list(request),
+            time_bucket='status' in request.query_params,
+        )
+
+    async def _list(self, request):
+        # Always paginated; rows are serialised from values() in one query.
+        # MeetingFilter only parses query params, so filtering needs no await.
+        queryset = self.filter_queryset(self.get_queryset())
+        page = await self.paginator.apaginate_queryset(
+            MeetingListSerializer.values(queryset), request, view=self
+        )
+        return self.get_paginated_response(MeetingListSerializer(page, request).data)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self._conditional(
+            request,
+            [versioning.meeting_scope(kwargs['pk']), versioning.ROOMS],
+            self._retrieve,
+        )
+
+    async def _retrieve(self):
+        return Response(self.get_serializer(await self.aget_object()).data)
+
+    @action(detail=False)
+    def occurrences(self, request):
+        """
+        Occurrences between ``start`` and ``end`` (ISO datetimes, at most 92
+        days apart) of the filtered meetings, with series expanded lazily for
+        that window only.
+        """
+        start = parse_datetime(request.query_params.get('start', ''))
+        end = parse_datetime(request.query_params.get('end', ''))
+        if not start or not end or not start < end <= start + timedelta(days=92):
+            raise ValidationError('start and end must be ISO datetimes at most 92 days apart.')
+        start, end = (timezone.make_aware(v) if timezone.is_naive(v) else v for v in (start, end))
+        meetings = recurrence.in_window(self.filter_queryset(self.get_queryset()), start, end)
+        return Response([
+            {
+                'meeting': occurrence.meeting_id,
+                'start': occurrence.start.isoformat(),
+                'end': occurrence.end.isoformat(),
+            }
+            for occurrence in recurrence.expand(meetings.order_by(), start, end)
+        ])
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        """
+        Import the uploaded CSV or iCalendar ``file`` (see meetings.imports)
+        and answer with the per-row report. Rows without an organizer are the
+        caller's; only staff may import meetings for other users. Pass
+        ``dry_run=1`` to check the file without writing anything.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': 'Upload a .csv or .ics file.'})
+        fmt = upload.name.rsplit('.', 1)[-1].lower()
+        if fmt not in READERS:
+            fmt = {'text/csv': 'csv', 'text/calendar': 'ics'}.get(upload.content_type)
+        if fmt is None:
+            raise ValidationError({'file': 'Upload a .csv or .ics file.'})
+        dry_run = request.data.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        lines = (line.decode('utf-8-sig') for line in upload)
+        try:
+            report = import_meetings(
+                lines, fmt, organizer=request.user,
+                allow_organizers=request.user.is_staff, dry_run=dry_run,
+            )
+        except (UnicodeDecodeError, ImportFormatError) as exc:
+            raise ValidationError({'file': str(exc)})
+        created = report['created'] and not dry_run
+        return Response(report, status=201 if created else 200)
@@ -10,3 +10,9 @@ python manage.py collectstatic --no-input
 
 # Run database migrations
 python manage.py migrate
+
+# Create the table of a database-backed listing cache (no-op otherwise)
+python manage.py createcachetable
+
+# Backfill the room utilisation rollup once; meeting changes keep it current
+python manage.py rebuild_room_usage --if-empty
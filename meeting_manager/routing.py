@@ -0,0 +1,147 @@
+"""
+Read-replica routing.
+
+Replicas are the extra aliases in ``DATABASES`` (``DATABASE_REPLICAS``;
+see meeting_manager/database.py for the environment variables). Writes
+always go to ``default``, the primary. Reads go to a replica only while
+``ReplicaRoutingMiddleware`` serves a safe-method (GET/HEAD/OPTIONS)
+request for a view marked with ``@replica_reads`` (or a DRF view class with
+``replica_reads = True``), and only when none of these holds:
+
+* the request has already written something: later reads in it see the write;
+* the client wrote within the last ``REPLICA_PIN_SECONDS``, which a short-lived
+  cookie set on the writing response records, so people see their own
+  bookings however far the replicas lag.
+
+Everything else (unmarked views, unsafe methods, management commands, the
+task worker) reads from the primary, as it did with a single database.
+Sessions and database cache entries always use the primary, without pinning
+anyone: a lagging replica must not log people out or serve cache misses.
+"""
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = "db_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Sessions and DatabaseCache entries.
+PRIMARY_ONLY_APPS = {"sessions", "django_cache"}
+
+
+def replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", ()))
+
+
+def pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", 10)
+
+
+def replica_reads(view):
+    """Mark ``view`` as safe to serve from a replica on GET/HEAD/OPTIONS."""
+    view.replica_reads = True
+    return view
+
+
+class _RequestState:
+    __slots__ = ("read_alias", "wrote")
+
+    def __init__(self):
+        self.read_alias = None
+        self.wrote = False
+
+
+_state = ContextVar("meeting_manager_db_routing", default=None)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.wrote or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        return state.read_alias or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's rows, so objects from any of them may relate.
+        aliases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary.
+        return False if db in replicas() else None
+
+
+def _pinned(request):
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _wants_replica(view_func):
+    view_class = getattr(view_func, "cls", None)
+    return getattr(view_func, "replica_reads", False) or getattr(view_class, "replica_reads", False)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Routes a marked view's reads to a random replica and pins the client to
+    the primary after it writes.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = _RequestState()
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._finish(state, response)
+
+    async def __acall__(self, request):
+        state = _RequestState()
+        token = _state.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _state.reset(token)
+        return self._finish(state, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _state.get()
+        aliases = replicas()
+        if (
+            state is not None and aliases and request.method in SAFE_METHODS
+            and _wants_replica(view_func) and not _pinned(request)
+        ):
+            state.read_alias = random.choice(aliases)
+        return None
+
+    def _finish(self, state, response):
+        if state.wrote and replicas():
+            seconds = pin_seconds()
+            response.set_cookie(
+                PIN_COOKIE, str(int(time.time() + seconds)), max_age=seconds,
+                httponly=True, samesite="Lax",
+            )
+        return response
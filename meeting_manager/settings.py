@@ -1,5 +1,8 @@
+import os
 from pathlib import Path
 
+from meeting_manager import database
+
 # ---------- BASE DIRECTORY ----------
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -22,6 +25,7 @@ INSTALLED_APPS = [
 # ---------- MIDDLEWARE ----------
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "meeting_manager.routing.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -56,12 +60,19 @@ TEMPLATES = [
 ]
 
 # ---------- DATABASE ----------
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
-}
+# SQLite (tuned for concurrent writers) unless DATABASE_URL or POSTGRES_DB
+# points at PostgreSQL; see meeting_manager/database.py for every variable.
+# SQLite transactions take the write lock when they start so concurrent
+# bookings queue up instead of both passing the overlap check.
+DATABASES = {"default": database.from_env(os.environ, BASE_DIR)}
+
+# Read replicas from DATABASE_REPLICA_URLS or SQLITE_REPLICA_PATHS. Views
+# marked @replica_reads read from one on safe methods; a client that wrote
+# reads from the primary for REPLICA_PIN_SECONDS (see meeting_manager/routing.py).
+DATABASES.update(database.replicas_from_env(os.environ))
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["meeting_manager.routing.ReplicaRouter"]
+REPLICA_PIN_SECONDS = 10
 
 # ---------- PASSWORD VALIDATORS ----------
 AUTH_PASSWORD_VALIDATORS = [
@@ -98,6 +109,23 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Minutes are stored by content hash (see meetings.storage). Resumable uploads
+# are staged under MINUTES_UPLOAD_STAGING_DIR and sent in chunks of at most
+# MINUTES_MAX_CHUNK_SIZE bytes.
+MINUTES_MAX_UPLOAD_SIZE = 50 * 1024 * 1024
+MINUTES_MAX_CHUNK_SIZE = 8 * 1024 * 1024
+MINUTES_UPLOAD_STAGING_DIR = MEDIA_ROOT / "uploads"
+
+# Minutes downloads are permission-checked by Django. Set MINUTES_SENDFILE to
+# "x-accel-redirect" (nginx, serving MEDIA_ROOT at the internal location
+# MINUTES_ACCEL_PREFIX) or "x-sendfile" (Apache/lighttpd) to let the
+# front-end server stream the bytes instead of a worker.
+MINUTES_SENDFILE = os.environ.get("MINUTES_SENDFILE") or None
+MINUTES_ACCEL_PREFIX = "/protected-media/"
+
+# Most characters of a minutes document that are indexed for search.
+MINUTES_TEXT_MAX_CHARS = 200_000
+
 # ---------- AUTHENTICATION ----------
 LOGIN_REDIRECT_URL = "home"
 LOGIN_URL = "/accounts/login/"
@@ -117,3 +145,96 @@ REST_FRAMEWORK = {
 }
 
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+
+# ---------- CACHE ----------
+# Per-process memory cache. Point this at a shared backend when running
+# several workers so invalidations reach every process.
+#
+# "listings" holds the shared meeting listings' pages and rendered rows (see
+# meetings.listing_cache). LISTING_CACHE_BACKEND picks where:
+#   locmem   - per process (default),
+#   file     - shared by the processes of one host (LISTING_CACHE_LOCATION dir),
+#   database - shared by every host; needs `manage.py createcachetable`,
+#   redis    - a Redis server at LISTING_CACHE_LOCATION (needs redis-py).
+# Keys are versioned, so entries are never stale. MAX_ENTRIES bounds the size
+# of the locmem, file and database caches; Redis passes OPTIONS to its
+# connection pool, so bound it with the server's maxmemory policy instead.
+_LISTING_CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "meeting-listings"),
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", str(BASE_DIR / "cache" / "listings")),
+    "database": ("django.core.cache.backends.db.DatabaseCache", "meeting_listing_cache"),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://127.0.0.1:6379/1"),
+}
+LISTING_CACHE_BACKEND = os.environ.get("LISTING_CACHE_BACKEND", "locmem")
+_listing_backend, _listing_location = _LISTING_CACHE_BACKENDS[LISTING_CACHE_BACKEND]
+_listing_options = {} if LISTING_CACHE_BACKEND == "redis" else {
+    "MAX_ENTRIES": int(os.environ.get("LISTING_CACHE_MAX_ENTRIES", 5000)),
+    # Drop a quarter of the entries when full.
+    "CULL_FREQUENCY": 4,
+}
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "meeting-manager",
+    },
+    "listings": {
+        "BACKEND": _listing_backend,
+        "LOCATION": os.environ.get("LISTING_CACHE_LOCATION", _listing_location),
+        "TIMEOUT": 60 * 60,
+        "OPTIONS": _listing_options,
+    },
+}
+
+# Seconds a user's cached dashboard counts are kept (see meetings.stats).
+DASHBOARD_STATS_TIMEOUT = 60 * 60 * 24
+
+# ---------- PAGINATION ----------
+# Default and maximum rows per page for the keyset-paginated meeting lists.
+MEETING_PAGE_SIZE = 10
+MEETING_MAX_PAGE_SIZE = 100
+
+# ---------- CONDITIONAL GET ----------
+# ETags of pages showing Upcoming/Ongoing/Ended badges roll over this often
+# (seconds) so statuses refresh even when no meeting changed.
+CONDITIONAL_GET_TIME_BUCKET = 60
+
+# ---------- CALENDAR FEEDS ----------
+# Days of meetings before/after today included in room and organizer ICS feeds.
+MEETING_FEED_PAST_DAYS = 30
+MEETING_FEED_FUTURE_DAYS = 180
+MEETING_FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+# ---------- ROOM AVAILABILITY INDEX ----------
+# Seconds before a room's in-memory schedule is reloaded from the database,
+# so bookings made by other worker processes show up in suggestions.
+AVAILABILITY_INDEX_TTL = 60
+
+# ---------- BACKGROUND TASKS ----------
+# Queue stored in the database and run by `manage.py run_tasks`. Retries wait
+# backoff * 2**(attempt - 1) seconds, up to TASK_MAX_BACKOFF; tasks running
+# longer than TASK_LEASE_SECONDS are assumed lost and re-queued.
+TASK_MAX_BACKOFF = 60 * 60
+TASK_LEASE_SECONDS = 15 * 60
+TASK_RETENTION_DAYS = 7
+
+# ---------- ROOM UTILISATION ----------
+# Bookable hours (local, [open, close)) and weekdays (Monday = 0) that room
+# utilisation is measured against (see meetings.analytics).
+ROOM_UTILIZATION_HOURS = (8, 18)
+ROOM_UTILIZATION_WEEKDAYS = (0, 1, 2, 3, 4)
+
+# ---------- LIVE MEETING EVENTS ----------
+# Server-Sent Events at /live/meetings/ (see meetings.live): events kept for
+# reconnecting clients, per-subscriber queue length before it must resync,
+# idle seconds between keepalives and seconds before a stream is recycled.
+LIVE_EVENTS_BUFFER = 1000
+LIVE_EVENTS_QUEUE = 100
+LIVE_HEARTBEAT = 15
+LIVE_STREAM_MAX_AGE = 300
+
+# ---------- MEETING ARCHIVE ----------
+# Meetings whose last occurrence ended more than this many days ago are moved
+# to the archive table by `manage.py archive_meetings` (see meetings.archive).
+# Keep it above MEETING_FEED_PAST_DAYS: calendar feeds read current meetings only.
+MEETING_ARCHIVE_AFTER_DAYS = 180
+MEETING_ARCHIVE_BATCH_SIZE = 500
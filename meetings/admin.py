@@ -1,5 +1,9 @@
+from django import forms
 from django.contrib import admin
-from .models import MeetingRoom, Meeting
+from . import archive
+from .models import ArchivedMeeting, MeetingRoom, Meeting, RoomDailyUsage, Task
+from .recurrence import FIELDS as RULE_FIELDS, validate as validate_rule
+from .services import book_meeting, has_conflict
 
 @admin.register(MeetingRoom)
 class MeetingRoomAdmin(admin.ModelAdmin):
@@ -14,10 +18,40 @@ class MeetingRoomAdmin(admin.ModelAdmin):
         return request.user.is_superuser or request.user.is_staff
 
 
+class MeetingAdminForm(forms.ModelForm):
+    """Reports room overlaps as a form error instead of failing on save."""
+    class Meta:
+        model = Meeting
+        fields = "__all__"
+
+    def clean(self):
+        cleaned_data = super().clean()
+        room = cleaned_data.get("room")
+        start_time = cleaned_data.get("start_time")
+        end_time = cleaned_data.get("end_time")
+        if not (room and start_time and end_time):
+            return cleaned_data
+        candidate = Meeting(
+            pk=self.instance.pk, room=room, start_time=start_time, end_time=end_time,
+            **{field: cleaned_data[field] for field in RULE_FIELDS if field in cleaned_data},
+        )
+        try:
+            validate_rule(candidate)
+        except forms.ValidationError:
+            return cleaned_data  # Reported by the model's own clean().
+        if has_conflict(candidate):
+            raise forms.ValidationError(
+                f"A meeting already exists in {room.name} during this time."
+            )
+        return cleaned_data
+
+
 @admin.register(Meeting)
 class MeetingAdmin(admin.ModelAdmin):
+    form = MeetingAdminForm
     list_display = ('title', 'organizer', 'room', 'start_time', 'end_time', 'is_active')
-    list_filter = ('room', 'is_active', 'start_time')
+    list_select_related = ('organizer', 'room')
+    list_filter = ('room', 'is_active', 'recurrence', 'start_time')
     search_fields = ('title', 'description', 'organizer__username')
 
     # Anyone (staff or normal user) can add a meeting, but only admin can delete
@@ -30,5 +64,46 @@ class MeetingAdmin(admin.ModelAdmin):
     def save_model(self, request, obj, form, change):
         if not change or not obj.organizer:
             obj.organizer = request.user
-        obj.save()
+        book_meeting(obj)
+
+
+@admin.register(ArchivedMeeting)
+class ArchivedMeetingAdmin(admin.ModelAdmin):
+    # Filled by `manage.py archive_meetings`; read-only apart from restoring.
+    list_display = ('title', 'organizer', 'room', 'start_time', 'end_time', 'archived_at')
+    list_select_related = ('organizer', 'room')
+    list_filter = ('room', 'archived_at')
+    search_fields = ('title', 'description', 'organizer__username')
+    actions = ['restore_meetings']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description="Restore selected meetings")
+    def restore_meetings(self, request, queryset):
+        count = archive.restore(queryset)
+        self.message_user(request, f"Restored {count} meetings.")
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('name', 'status', 'attempts', 'run_at', 'duration_ms', 'worker')
+    list_filter = ('status', 'name')
+    readonly_fields = ('started_at', 'finished_at', 'duration_ms', 'worker', 'last_error')
+
+
+@admin.register(RoomDailyUsage)
+class RoomDailyUsageAdmin(admin.ModelAdmin):
+    # Derived data: rebuilt with `manage.py rebuild_room_usage`, never edited.
+    list_display = ('room', 'date', 'meeting_count', 'booked_seconds', 'updated_at')
+    list_filter = ('room',)
+    date_hierarchy = 'date'
+
+    def has_add_permission(self, request):
+        return False
 
+    def has_change_permission(self, request, obj=None):
+        return False
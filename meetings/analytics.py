@@ -0,0 +1,319 @@
+"""
+Room utilisation analytics.
+
+Meetings are loaded as NumPy arrays of start/end epoch seconds per room
+(recurring series expanded for the window), and everything else is computed
+on whole arrays:
+
+* booked seconds per bucket come from the cumulative coverage
+  ``C(t) = sum(min(t, end) - start for start < t)``, evaluated at every bucket
+  edge with ``searchsorted`` over the sorted starts and ends and prefix sums,
+  then differenced;
+* concurrency is a running sum over start (+1) and end (-1) events sorted by
+  time, with ends first at ties because intervals are half-open.
+
+Dashboards read ``RoomDailyUsage`` (booked seconds per room, local day and
+hour, plus the day's peak concurrency in the room) instead of meetings.
+Saving or deleting a meeting queues ``meetings.refresh_room_usage`` for the
+room and days it touches (see ``meetings.signals``), which recomputes just
+those days; ``manage.py
+rebuild_room_usage`` backfills the table (build.sh runs it while the table is
+empty). Utilisation is time-based: the share of bookable room-hours that are
+booked. Meetings do not record attendance, so room capacity is reported but
+does not weigh in.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from .models import ArchivedMeeting, Meeting, MeetingRoom, RoomDailyUsage
+from .recurrence import FIELDS as RULE_FIELDS, in_window, occurrences
+
+HOURS = 24
+
+
+def _epoch(value):
+    return int(value.timestamp())
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def _days(first_day, last_day):
+    return [first_day + timedelta(days=n) for n in range((last_day - first_day).days + 1)]
+
+
+# ---------- loading ----------
+def load_intervals(start, end, room_ids=None):
+    """
+    ``{room_id: (starts, ends)}`` for every occurrence overlapping [start, end),
+    as sorted int64 epoch-second arrays clipped to the window. One-off meetings
+    come straight from a values query; only series are expanded in Python.
+    """
+    starts, ends = defaultdict(list), defaultdict(list)
+    # Archived meetings still count: archiving must not change past usage.
+    for model in (Meeting, ArchivedMeeting):
+        qs = in_window(model.objects.order_by(), start, end)
+        if room_ids is not None:
+            qs = qs.filter(room_id__in=room_ids)
+        for room_id, meeting_start, meeting_end in qs.filter(recurrence="").values_list(
+            "room_id", "start_time", "end_time"
+        ).iterator(chunk_size=5000):
+            starts[room_id].append(_epoch(meeting_start))
+            ends[room_id].append(_epoch(meeting_end))
+        series = qs.exclude(recurrence="").only("id", "room_id", "start_time", "end_time", *RULE_FIELDS)
+        for meeting in series.iterator(chunk_size=2000):
+            for occurrence in occurrences(meeting, start, end):
+                starts[meeting.room_id].append(_epoch(occurrence.start))
+                ends[meeting.room_id].append(_epoch(occurrence.end))
+
+    lo, hi = _epoch(start), _epoch(end)
+    intervals = {}
+    for room_id in starts:
+        room_starts = np.clip(np.array(starts[room_id], dtype=np.int64), lo, hi)
+        room_ends = np.clip(np.array(ends[room_id], dtype=np.int64), lo, hi)
+        order = np.argsort(room_starts, kind="stable")
+        intervals[room_id] = (room_starts[order], room_ends[order])
+    return intervals
+
+
+# ---------- vectorised kernels ----------
+def coverage(starts, ends, at):
+    """Booked seconds before each instant in ``at`` (overlaps counted twice)."""
+    at = np.asarray(at, dtype=np.int64)
+    sorted_starts = np.sort(starts)
+    sorted_ends = np.sort(ends)
+    start_sums = np.concatenate(([0], np.cumsum(sorted_starts)))
+    end_sums = np.concatenate(([0], np.cumsum(sorted_ends)))
+    started = np.searchsorted(sorted_starts, at, side="left")
+    ended = np.searchsorted(sorted_ends, at, side="left")
+    return (started * at - start_sums[started]) - (ended * at - end_sums[ended])
+
+
+def occupancy(starts, ends, edges):
+    """Booked seconds in each bucket [edges[i], edges[i+1]); ``edges`` may be 2-D."""
+    edges = np.asarray(edges, dtype=np.int64)
+    return np.diff(coverage(starts, ends, edges.ravel()).reshape(edges.shape), axis=-1)
+
+
+def concurrency(starts, ends):
+    """(event times, meetings running from each time on), for half-open intervals."""
+    times = np.concatenate((starts, ends))
+    steps = np.concatenate((np.ones(len(starts), np.int64), -np.ones(len(ends), np.int64)))
+    order = np.lexsort((steps, times))
+    return times[order], np.cumsum(steps[order])
+
+
+def peak_concurrency(starts, ends):
+    """(most meetings running at once, epoch second it is first reached)."""
+    if not len(starts):
+        return 0, None
+    times, running = concurrency(starts, ends)
+    peak = int(np.argmax(running))
+    return int(running[peak]), int(times[peak])
+
+
+def peaks_per_day(starts, ends, edges):
+    """(peak, epoch second or None) per local day given by ``hour_edges``."""
+    peaks = []
+    for day_start, day_end in zip(edges[:, 0], edges[:, -1]):
+        inside = (starts < day_end) & (ends > day_start)
+        peaks.append(peak_concurrency(
+            np.maximum(starts[inside], day_start), np.minimum(ends[inside], day_end)
+        ))
+    return peaks
+
+
+def hour_edges(days):
+    """
+    Local hour boundaries, shape (len(days), 25). On DST-change days the
+    last hour is clipped to (or stretched to) the next local midnight.
+    """
+    midnights = np.array(
+        [_epoch(_local_midnight(day)) for day in [*days, days[-1] + timedelta(days=1)]],
+        dtype=np.int64,
+    )
+    edges = midnights[:-1, None] + np.arange(HOURS + 1, dtype=np.int64) * 3600
+    edges = np.minimum(edges, midnights[1:, None])
+    edges[:, -1] = midnights[1:]
+    return edges
+
+
+def meetings_per_day(starts, ends, edges):
+    """Number of meetings overlapping each local day given by ``hour_edges``."""
+    day_starts, day_ends = edges[:, 0], edges[:, -1]
+    return np.searchsorted(np.sort(starts), day_ends, side="left") - np.searchsorted(
+        np.sort(ends), day_starts, side="right"
+    )
+
+
+# ---------- daily rollup ----------
+def refresh_room_days(room_id, first_day, last_day):
+    """Recompute ``RoomDailyUsage`` for one room over [first_day, last_day]; returns rows kept."""
+    days = _days(first_day, last_day)
+    edges = hour_edges(days)
+    tz = timezone.get_current_timezone()
+    window_start = datetime.fromtimestamp(int(edges[0, 0]), tz)
+    window_end = datetime.fromtimestamp(int(edges[-1, -1]), tz)
+    empty = np.zeros(0, np.int64)
+    starts, ends = load_intervals(window_start, window_end, [room_id]).get(room_id, (empty, empty))
+    hourly = occupancy(starts, ends, edges)
+    counts = meetings_per_day(starts, ends, edges)
+    booked = hourly.sum(axis=1)
+    peaks = [
+        (peak, datetime.fromtimestamp(at, tz) if at is not None else None)
+        for peak, at in peaks_per_day(starts, ends, edges)
+    ]
+
+    now = timezone.now()
+    rows = [
+        RoomDailyUsage(
+            room_id=room_id, date=days[i], meeting_count=int(counts[i]),
+            booked_seconds=int(booked[i]), hourly_seconds=hourly[i].tolist(),
+            peak_meetings=peaks[i][0], peak_at=peaks[i][1], updated_at=now,
+        )
+        for i in np.flatnonzero(counts)
+    ]
+    with transaction.atomic():
+        RoomDailyUsage.objects.filter(room_id=room_id, date__range=(first_day, last_day)).exclude(
+            date__in=[row.date for row in rows]
+        ).delete()
+        RoomDailyUsage.objects.bulk_create(
+            rows, batch_size=500, update_conflicts=True, unique_fields=["room", "date"],
+            update_fields=[
+                "meeting_count", "booked_seconds", "hourly_seconds", "peak_meetings", "peak_at", "updated_at",
+            ],
+        )
+    return len(rows)
+
+
+def local_span(start, end):
+    """First and last local dates touched by [start, end)."""
+    return timezone.localdate(start), timezone.localdate(end - timedelta(microseconds=1))
+
+
+def schedule_refresh(room_id, start, end):
+    """Queue a rollup refresh for the days a meeting (or series) spans."""
+    from .tasks import refresh_room_usage
+
+    first_day, last_day = local_span(start, end)
+    refresh_room_usage.enqueue(
+        room_id=room_id, first_day=first_day.isoformat(), last_day=last_day.isoformat()
+    )
+
+
+def rebuild(first_day=None, last_day=None, room_ids=None):
+    """Recompute the rollup for every room (or ``room_ids``); returns rows written."""
+    rooms = MeetingRoom.objects.order_by("pk")
+    if room_ids is not None:
+        rooms = rooms.filter(pk__in=room_ids)
+    span_of = {}
+    for model in (Meeting, ArchivedMeeting):
+        spans = model.objects.order_by().values("room_id").annotate(
+            first=Min("start_time"), last=Max("series_end")
+        )
+        for row in spans:
+            seen = span_of.setdefault(row["room_id"], row)
+            seen["first"] = min(seen["first"], row["first"])
+            seen["last"] = max(seen["last"], row["last"])
+    written = 0
+    for room_id in rooms.values_list("pk", flat=True):
+        if room_id not in span_of:
+            RoomDailyUsage.objects.filter(room_id=room_id).delete()
+            continue
+        first, last = local_span(span_of[room_id]["first"], span_of[room_id]["last"])
+        written += refresh_room_days(room_id, first_day or first, last_day or last)
+    return written
+
+
+# ---------- dashboard reads ----------
+def _open_mask(days):
+    """(days, 24) booleans for the bookable hours in ``ROOM_UTILIZATION_HOURS``."""
+    open_hour, close_hour = getattr(settings, "ROOM_UTILIZATION_HOURS", (8, 18))
+    weekdays = getattr(settings, "ROOM_UTILIZATION_WEEKDAYS", (0, 1, 2, 3, 4))
+    hours = np.arange(HOURS)
+    by_hour = (hours >= open_hour) & (hours < close_hour)
+    by_day = np.isin([day.weekday() for day in days], weekdays)
+    return by_day[:, None] & by_hour[None, :]
+
+
+def usage_summary(first_day, last_day, room_ids=None):
+    """
+    Utilisation for [first_day, last_day]: per-room totals and share of
+    bookable hours booked (time-based; capacity is not weighed), an
+    hour-of-day profile, a weekday x hour heatmap, the most rooms in use in
+    any one hour and the most meetings running at once in any one room (double
+    bookings), all from the daily rollup.
+    """
+    rooms = MeetingRoom.objects.order_by("name")
+    if room_ids is not None:
+        rooms = rooms.filter(pk__in=room_ids)
+    rooms = list(rooms.values("id", "name", "capacity"))
+    days = _days(first_day, last_day)
+    room_index = {room["id"]: i for i, room in enumerate(rooms)}
+
+    # (rooms, days, hours) cube of booked seconds.
+    cube = np.zeros((len(rooms), len(days), HOURS), dtype=np.int64)
+    counts = np.zeros(len(rooms), dtype=np.int64)
+    peak = (0, None, None)
+    for room_id, day, meeting_count, hourly, peak_meetings, peak_at in RoomDailyUsage.objects.filter(
+        room_id__in=room_index, date__range=(first_day, last_day)
+    ).order_by("date").values_list(
+        "room_id", "date", "meeting_count", "hourly_seconds", "peak_meetings", "peak_at"
+    ):
+        cube[room_index[room_id], (day - first_day).days] = hourly
+        counts[room_index[room_id]] += meeting_count
+        if peak_meetings > peak[0]:
+            peak = (peak_meetings, room_id, peak_at)
+
+    mask = _open_mask(days)
+    open_seconds = mask.sum() * 3600
+    booked = cube.sum(axis=(1, 2))
+    booked_open = (cube * mask).sum(axis=(1, 2))
+    hourly_share = cube / 3600.0
+
+    weekdays = np.array([day.weekday() for day in days])
+    heatmap = np.zeros((7, HOURS))
+    day_totals = hourly_share.mean(axis=0) if len(rooms) else np.zeros((len(days), HOURS))
+    np.add.at(heatmap, weekdays, day_totals)
+    heatmap /= np.maximum(np.bincount(weekdays, minlength=7), 1)[:, None]
+
+    in_use = (cube > 0).sum(axis=0)
+    peak_day, peak_hour = np.unravel_index(np.argmax(in_use), in_use.shape)
+
+    def ratio(value, total):
+        return round(float(value) / total, 4) if total else 0.0
+
+    return {
+        "from": first_day.isoformat(),
+        "to": last_day.isoformat(),
+        "rooms": [
+            {
+                **room,
+                "meetings": int(counts[i]),
+                "booked_hours": round(float(booked[i]) / 3600, 2),
+                "utilization": ratio(booked_open[i], open_seconds),
+                "busiest_hour": int(np.argmax(cube[i].sum(axis=0))) if booked[i] else None,
+            }
+            for i, room in enumerate(rooms)
+        ],
+        "overall_utilization": ratio(booked_open.sum(), open_seconds * len(rooms)),
+        "hourly_profile": np.round(day_totals.mean(axis=0), 4).tolist(),
+        "weekday_heatmap": np.round(heatmap, 4).tolist(),
+        "peak_rooms_in_use": {
+            "rooms": int(in_use[peak_day, peak_hour]),
+            "date": days[peak_day].isoformat() if in_use.any() else None,
+            "hour": int(peak_hour) if in_use.any() else None,
+        },
+        "peak_concurrency": {
+            "meetings": peak[0],
+            "room": peak[1],
+            "at": timezone.localtime(peak[2]).isoformat() if peak[2] else None,
+        },
+    }
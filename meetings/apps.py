@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MeetingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "meetings"
+
+    def ready(self):
+        from . import signals  # noqa: F401  (connects the model signal receivers)
+        from . import tasks  # noqa: F401  (registers the background tasks)
@@ -0,0 +1,262 @@
+"""
+Hot/archive split for ended meetings.
+
+Meetings whose last occurrence ended more than ``MEETING_ARCHIVE_AFTER_DAYS``
+ago are moved, in batches, from ``Meeting`` to ``ArchivedMeeting``: the same
+columns under the same id, plus ``archived_at``. Everything on the hot path
+(the dashboard, "My meetings", booking conflict checks, the availability
+index, calendar feeds, the API) keeps reading ``Meeting`` alone, so its
+working set is the size of current data however much history piles up.
+
+History stays reachable through ``history()``, a read-only union of one
+query over both tables that the all-meetings page, the minutes repository,
+searches and exports use; ``find()`` falls back to the archive for detail
+pages and downloads. ``restore()`` moves meetings back unchanged.
+
+Rows are moved with ``INSERT ... SELECT`` and a plain ``DELETE``, so no model
+signals fire; what they would maintain is either unaffected or handled here:
+
+* the search index keeps its rows, since ids are shared;
+* minutes reference counts stay as they are: the file is still in use;
+* the room usage rollup reads both tables;
+* the availability index only holds occurrences that have not ended;
+* versions of the moved meetings, their rooms and organizers are bumped and
+  the organizers' dashboard counts, which cover current meetings, dropped.
+
+Meetings with an unfinished minutes upload are left alone until it finishes
+or is purged; finished upload sessions are detached from archived meetings.
+"""
+import heapq
+from datetime import timedelta
+from itertools import islice
+from operator import attrgetter, itemgetter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from . import versioning
+from .models import ArchivedMeeting, Meeting, MinutesUpload
+from .stats import invalidate_user_stats
+
+
+def archive_after():
+    return timedelta(days=getattr(settings, "MEETING_ARCHIVE_AFTER_DAYS", 180))
+
+
+def batch_size():
+    return getattr(settings, "MEETING_ARCHIVE_BATCH_SIZE", 500)
+
+
+def archive_cutoff(now=None):
+    """Meetings whose series ended before this instant are due for the archive."""
+    return (now or timezone.now()) - archive_after()
+
+
+# ---------- moving rows ----------
+def _move(source, target, ids, archived_at=None):
+    """Copy rows ``ids`` from ``source`` to ``target`` and delete them from ``source``."""
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(field.column) for field in Meeting._meta.concrete_fields)
+    marks = ", ".join(["%s"] * len(ids))
+    into, select, params = columns, columns, list(ids)
+    if archived_at is not None:
+        into += ", " + quote("archived_at")
+        select += ", %s"
+        params.insert(0, connection.ops.adapt_datetimefield_value(archived_at))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(target._meta.db_table)} ({into}) "
+            f"SELECT {select} FROM {quote(source._meta.db_table)} WHERE id IN ({marks})",
+            params,
+        )
+        cursor.execute(f"DELETE FROM {quote(source._meta.db_table)} WHERE id IN ({marks})", list(ids))
+
+
+def _moved(ids, room_ids, organizer_ids):
+    """What the Meeting signals would have done for rows moved between the tables."""
+    versioning.bump(
+        versioning.GLOBAL,
+        *(versioning.room_scope(pk) for pk in room_ids),
+        *(versioning.organizer_scope(pk) for pk in organizer_ids),
+        *(versioning.meeting_scope(pk) for pk in ids),
+    )
+
+    def invalidate():
+        for organizer_id in organizer_ids:
+            invalidate_user_stats(organizer_id)
+
+    transaction.on_commit(invalidate)
+
+
+def archivable(before):
+    """Meetings whose last occurrence ended before ``before`` and that can move now."""
+    pending = MinutesUpload.objects.filter(meeting=OuterRef("pk"), stored_name="")
+    return Meeting.objects.filter(series_end__lt=before).exclude(Exists(pending))
+
+
+def archive(before=None, size=None, limit=None):
+    """
+    Move meetings whose series ended before ``before`` (default:
+    ``archive_cutoff()``) to the archive, ``size`` per transaction, and
+    return how many moved. ``limit`` caps the total for one run.
+    """
+    now = timezone.now()
+    before = archive_cutoff(now) if before is None else before
+    if before > now:
+        raise ValueError("Only meetings that have ended can be archived.")
+    size = size or batch_size()
+    moved, last_pk = 0, 0
+    while limit is None or moved < limit:
+        take = size if limit is None else min(size, limit - moved)
+        with transaction.atomic():
+            # Walks the primary key, so each batch resumes where the last one stopped.
+            rows = list(
+                archivable(before).filter(pk__gt=last_pk).select_for_update()
+                .order_by("pk").values_list("pk", "room_id", "organizer_id")[:take]
+            )
+            if not rows:
+                break
+            ids = [pk for pk, _, _ in rows]
+            MinutesUpload.objects.filter(meeting_id__in=ids).update(meeting=None)
+            _move(Meeting, ArchivedMeeting, ids, archived_at=now)
+            _moved(ids, {row[1] for row in rows}, {row[2] for row in rows})
+        moved += len(ids)
+        last_pk = ids[-1]
+    return moved
+
+
+def restore(queryset=None, size=None):
+    """
+    Move archived meetings (``queryset``, all by default) back to ``Meeting``
+    unchanged and return how many moved. They are archived again by the next
+    run that finds them past the cutoff.
+    """
+    queryset = ArchivedMeeting.objects.all() if queryset is None else queryset
+    size = size or batch_size()
+    moved, last_pk = 0, 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                queryset.filter(pk__gt=last_pk).select_for_update()
+                .order_by("pk").values_list("pk", "room_id", "organizer_id")[:size]
+            )
+            if not rows:
+                break
+            ids = [pk for pk, _, _ in rows]
+            _move(ArchivedMeeting, Meeting, ids)
+            _moved(ids, {row[1] for row in rows}, {row[2] for row in rows})
+        moved += len(ids)
+        last_pk = ids[-1]
+    return moved
+
+
+# ---------- reading current and archived meetings ----------
+class History:
+    """
+    The same query over ``Meeting`` and ``ArchivedMeeting``, read as one.
+
+    Supports what list pages and exports do with a queryset: ``filter()``,
+    ``order_by()`` (all ascending or all descending), ``[:n]`` slices,
+    ``count()``, ``values_list()``, ``iterator()`` and (async) iteration.
+    Each table is queried with the same ordering and limit and the sorted
+    results are merged, so a page costs one indexed query per table.
+    """
+
+    def __init__(self, querysets, ordering=(), limit=None, fields=None):
+        self.querysets = list(querysets)
+        self.ordering = tuple(ordering)
+        self.limit = limit
+        self.fields = fields
+
+    def _clone(self, **changes):
+        state = {
+            "querysets": self.querysets,
+            "ordering": self.ordering,
+            "limit": self.limit,
+            "fields": self.fields,
+        }
+        state.update(changes)
+        return History(**state)
+
+    def filter(self, *args, **kwargs):
+        return self._clone(querysets=[qs.filter(*args, **kwargs) for qs in self.querysets])
+
+    def exclude(self, *args, **kwargs):
+        return self._clone(querysets=[qs.exclude(*args, **kwargs) for qs in self.querysets])
+
+    def order_by(self, *fields):
+        if len({name.startswith("-") for name in fields}) > 1:
+            raise ValueError("History orderings must be all ascending or all descending.")
+        return self._clone(ordering=fields)
+
+    def values_list(self, *fields):
+        return self._clone(fields=fields)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.start or key.step or key.stop is None:
+            raise TypeError("History only supports [:n] slices.")
+        limit = key.stop if self.limit is None else min(key.stop, self.limit)
+        return self._clone(limit=limit)
+
+    def _parts(self):
+        for qs in self.querysets:
+            qs = qs.order_by(*self.ordering)
+            if self.fields is not None:
+                qs = qs.values_list(*self.fields)
+            yield qs if self.limit is None else qs[: self.limit]
+
+    def _merge(self, parts):
+        if self.ordering:
+            keys = [name.lstrip("-") for name in self.ordering]
+            if self.fields is not None:
+                key = itemgetter(*(self.fields.index(name) for name in keys))
+            else:
+                key = attrgetter(*keys)
+            rows = heapq.merge(*parts, key=key, reverse=self.ordering[0].startswith("-"))
+        else:
+            rows = (row for part in parts for row in part)
+        return rows if self.limit is None else islice(rows, self.limit)
+
+    def __iter__(self):
+        return self._merge([list(part) for part in self._parts()])
+
+    async def __aiter__(self):
+        parts = [[row async for row in part] for part in self._parts()]
+        for row in self._merge(parts):
+            yield row
+
+    def iterator(self, chunk_size=None):
+        """Stream the merged rows, reading each table in chunks."""
+        return self._merge([part.iterator(chunk_size=chunk_size) for part in self._parts()])
+
+    def count(self):
+        total = sum(part.count() for part in self._parts())
+        return total if self.limit is None else min(total, self.limit)
+
+
+def history(build=None):
+    """A History of ``build(queryset)`` over both tables (the whole tables by default)."""
+    build = build or (lambda qs: qs)
+    return History([build(Meeting.objects.all()), build(ArchivedMeeting.objects.all())])
+
+
+def find(pk, build=None):
+    """The current or archived meeting ``pk`` (each queryset through ``build``), or None."""
+    build = build or (lambda qs: qs)
+    for manager in (Meeting.objects, ArchivedMeeting.objects):
+        meeting = build(manager.all()).filter(pk=pk).first()
+        if meeting is not None:
+            return meeting
+    return None
+
+
+async def afind(pk, build=None):
+    """``find`` for async views."""
+    build = build or (lambda qs: qs)
+    for manager in (Meeting.objects, ArchivedMeeting.objects):
+        meeting = await build(manager.all()).filter(pk=pk).afirst()
+        if meeting is not None:
+            return meeting
+    return None
@@ -0,0 +1,251 @@
+"""
+In-memory availability index.
+
+Each room's bookings are kept as a list of (start, end, meeting_id) tuples
+sorted by start time (a recurring meeting contributes one tuple per
+occurrence), so "is this room busy between X and Y" is a bisect
+instead of a query. Rooms are loaded lazily on first use, kept current by the
+Meeting/MeetingRoom signals in ``meetings.signals``, and reloaded after
+``AVAILABILITY_INDEX_TTL`` seconds to pick up writes made by other worker
+processes. The room list expires the same way, and is also reloaded when asked
+about a room it does not know, so rooms created elsewhere are found at once.
+The index only answers "what is free" questions; booking itself is still
+guarded by ``meetings.services.book_meeting``.
+"""
+import threading
+import time
+from bisect import bisect_left
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Meeting, MeetingRoom
+from .recurrence import FIELDS as RULE_FIELDS, occurrences
+
+
+def _ttl():
+    return getattr(settings, "AVAILABILITY_INDEX_TTL", 60)
+
+
+class RoomSchedule:
+    """Sorted bookings for a single room, from ``horizon`` onwards."""
+
+    def __init__(self, horizon, rows=()):
+        self.horizon = horizon
+        self.loaded_at = time.monotonic()
+        self.entries = sorted((start, end, pk) for pk, start, end in rows)
+        self.starts = [entry[0] for entry in self.entries]
+        # Longest booking seen; bounds how far back an overlapping booking can
+        # start. It never shrinks, which only makes lookups a little wider.
+        self.max_duration = max(
+            (end - start for start, end, _ in self.entries), default=timedelta(0)
+        )
+
+    def add(self, pk, start, end):
+        entry = (start, end, pk)
+        index = bisect_left(self.entries, entry)
+        self.entries.insert(index, entry)
+        self.starts.insert(index, start)
+        self.max_duration = max(self.max_duration, end - start)
+
+    def remove(self, pk):
+        kept = [entry for entry in self.entries if entry[2] != pk]
+        removed = len(kept) != len(self.entries)
+        if removed:
+            self.entries = kept
+            self.starts = [entry[0] for entry in kept]
+        return removed
+
+    def busy(self, start, end):
+        """Bookings overlapping [start, end), ordered by start time."""
+        lo = bisect_left(self.starts, start - self.max_duration)
+        hi = bisect_left(self.starts, end)
+        return [entry for entry in self.entries[lo:hi] if entry[1] > start]
+
+    def is_free(self, start, end):
+        return not self.busy(start, end)
+
+
+def _merge(intervals):
+    """Merge (start, end, ...) tuples into sorted, non-overlapping (start, end) pairs."""
+    merged = []
+    for start, end, *_ in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(pair) for pair in merged]
+
+
+def _gaps(busy, start, end, min_duration=None):
+    """Free (start, end) pairs inside [start, end) around the merged ``busy`` list."""
+    min_duration = min_duration or timedelta(0)
+    slots = []
+    cursor = start
+    for busy_start, busy_end in busy:
+        if busy_start > cursor and busy_start - cursor >= min_duration:
+            slots.append((cursor, min(busy_start, end)))
+        cursor = max(cursor, busy_end)
+        if cursor >= end:
+            break
+    if cursor < end and end - cursor >= min_duration:
+        slots.append((cursor, end))
+    return [slot for slot in slots if slot[1] > slot[0]]
+
+
+class AvailabilityIndex:
+    """Process-wide per-room interval index. Use the module-level ``availability``."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._schedules = {}
+        self._rooms = None
+        self._rooms_loaded_at = 0
+        self._room_of = {}
+
+    # ---------- loading ----------
+    def _load_rooms(self, room_ids=()):
+        """Rooms by id, reloaded when stale or missing any of ``room_ids``."""
+        if (
+            self._rooms is None
+            or time.monotonic() - self._rooms_loaded_at > _ttl()
+            or any(pk not in self._rooms for pk in room_ids)
+        ):
+            self._rooms_loaded_at = time.monotonic()
+            self._rooms = {
+                pk: {"id": pk, "name": name, "capacity": capacity}
+                for pk, name, capacity in MeetingRoom.objects.values_list(
+                    "id", "name", "capacity"
+                )
+            }
+        return self._rooms
+
+    def _ensure(self, room_ids, since):
+        """Load schedules for ``room_ids`` covering ``since`` onwards, in one query."""
+        ttl = _ttl()
+        now = time.monotonic()
+        stale = [
+            pk
+            for pk in room_ids
+            if pk not in self._schedules
+            or self._schedules[pk].horizon > since
+            or now - self._schedules[pk].loaded_at > ttl
+        ]
+        if not stale:
+            return
+        horizon = min(since, timezone.now() - timedelta(days=1))
+        rows = {pk: [] for pk in stale}
+        for meeting in (
+            Meeting.objects.filter(room_id__in=stale, series_end__gt=horizon)
+            .order_by()
+            .only("id", "room_id", "start_time", "end_time", *RULE_FIELDS)
+            .iterator(chunk_size=2000)
+        ):
+            rows[meeting.room_id].extend(occurrences(meeting, start=horizon))
+            self._room_of[meeting.pk] = meeting.room_id
+        for pk in stale:
+            self._schedules[pk] = RoomSchedule(horizon, rows[pk])
+
+    def _candidate_rooms(self, room_ids=None, min_capacity=None):
+        rooms = self._load_rooms(room_ids or ())
+        ids = rooms.keys() if room_ids is None else [pk for pk in room_ids if pk in rooms]
+        if min_capacity:
+            ids = [pk for pk in ids if rooms[pk]["capacity"] >= min_capacity]
+        return list(ids)
+
+    # ---------- signal hooks ----------
+    def meeting_saved(self, meeting):
+        with self._lock:
+            self.meeting_deleted(meeting.pk)
+            schedule = self._schedules.get(meeting.room_id)
+            if schedule is not None:
+                for pk, start, end in occurrences(meeting, start=schedule.horizon):
+                    schedule.add(pk, start, end)
+                    self._room_of[pk] = meeting.room_id
+
+    def meeting_deleted(self, meeting_id):
+        with self._lock:
+            room_id = self._room_of.pop(meeting_id, None)
+            if room_id in self._schedules:
+                self._schedules[room_id].remove(meeting_id)
+
+    def room_changed(self, room):
+        with self._lock:
+            if self._rooms is not None:
+                self._rooms[room.pk] = {
+                    "id": room.pk, "name": room.name, "capacity": room.capacity
+                }
+
+    def room_deleted(self, room_id):
+        with self._lock:
+            if self._rooms is not None:
+                self._rooms.pop(room_id, None)
+            self._schedules.pop(room_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._schedules.clear()
+            self._room_of.clear()
+            self._rooms = None
+
+    # ---------- queries ----------
+    def is_free(self, room_id, start, end):
+        with self._lock:
+            self._ensure([room_id], start)
+            return self._schedules[room_id].is_free(start, end)
+
+    def free_slots(self, room_ids, start, end, min_duration=None, min_capacity=None):
+        """Map each room id to its free (start, end) slots inside [start, end)."""
+        with self._lock:
+            room_ids = self._candidate_rooms(room_ids, min_capacity)
+            self._ensure(room_ids, start)
+            return {
+                pk: _gaps(
+                    _merge(self._schedules[pk].busy(start, end)), start, end, min_duration
+                )
+                for pk in room_ids
+            }
+
+    def free_rooms(self, start, end, min_capacity=None, room_ids=None):
+        """Rooms (as dicts with id, name, capacity) with no booking in [start, end)."""
+        with self._lock:
+            candidates = self._candidate_rooms(room_ids, min_capacity)
+            self._ensure(candidates, start)
+            return [
+                dict(self._rooms[pk])
+                for pk in sorted(candidates, key=lambda pk: self._rooms[pk]["name"])
+                if self._schedules[pk].is_free(start, end)
+            ]
+
+    def earliest_common_slot(self, room_ids, duration, after, before=None):
+        """
+        First (start, end) of length ``duration`` at or after ``after`` when every
+        room in ``room_ids`` is free, or None if nothing fits before ``before``.
+        """
+        before = before or after + timedelta(days=30)
+        with self._lock:
+            room_ids = self._candidate_rooms(room_ids)
+            if not room_ids:
+                return None
+            self._ensure(room_ids, after)
+            busy = []
+            for pk in room_ids:
+                busy.extend(self._schedules[pk].busy(after, before))
+            for slot_start, _ in _gaps(_merge(busy), after, before, duration):
+                return slot_start, slot_start + duration
+            return None
+
+    def suggest_alternatives(self, room_id, start, end, min_capacity=None):
+        """Other rooms free for [start, end) and the next free slot in ``room_id``."""
+        return {
+            "rooms": [
+                room
+                for room in self.free_rooms(start, end, min_capacity)
+                if room["id"] != room_id
+            ],
+            "next_slot": self.earliest_common_slot([room_id], end - start, start),
+        }
+
+
+availability = AvailabilityIndex()
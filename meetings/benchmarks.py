@@ -0,0 +1,245 @@
+"""
+Latency and query-count benchmarks for the paths the app depends on
+(``manage.py run_benchmarks``).
+
+Every case runs in-process against the configured database (seed it with
+``manage.py seed_meetings`` first), as the organizer with the most meetings.
+Pages go through the test client with the full middleware stack; caches
+are cleared before each iteration unless ``warm`` is set, so the numbers
+track the queries rather than the cache. A result is a JSON-serialisable
+dict::
+
+    {"meta": {"git_commit", "database", "rows": {...}, "iterations", "warm", ...},
+     "cases": {"home": {"p50_ms", "p95_ms", "p99_ms", "mean_ms", "queries", ...}}}
+
+``compare(baseline, current)`` lines two results up case by case and flags
+regressions: a median more than ``threshold`` slower, or more queries.
+"""
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import timedelta
+
+import django
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import listing_cache, recurrence
+from .availability import availability
+from .models import ArchivedMeeting, Meeting, MeetingRoom
+from .services import series_conflicts
+
+
+class Skip(Exception):
+    """A case that cannot run here (e.g. an optional dependency is missing)."""
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def clear_caches():
+    cache.clear()
+    listing_cache.get_cache().clear()
+    availability.clear()
+
+
+class Context:
+    """What the cases need, looked up once."""
+
+    def __init__(self, username=None):
+        if username:
+            self.user = User.objects.get(username=username)
+        else:
+            busiest = (
+                Meeting.objects.values("organizer").annotate(n=Count("id")).order_by("-n").first()
+            )
+            if busiest is None:
+                raise Skip("No meetings to benchmark; run manage.py seed_meetings first.")
+            self.user = User.objects.get(pk=busiest["organizer"])
+        self.client = Client(SERVER_NAME="localhost")
+        self.client.force_login(self.user)
+        self.meeting = Meeting.objects.filter(organizer=self.user).order_by("-start_time").first()
+        if self.meeting is None:
+            raise Skip(f"{self.user.username} has no meetings.")
+        self.search_term = self.meeting.title.split()[0]
+
+    def get(self, url, params=None):
+        response = self.client.get(url, params)
+        if response.status_code != 200:
+            raise AssertionError(f"GET {url} answered {response.status_code}")
+        return response
+
+
+# ---------- cases ----------
+def _page(name, params=None):
+    def case(ctx):
+        url = reverse(name)
+        return lambda: ctx.get(url, params and params(ctx))
+    return case
+
+
+def _booking_conflicts(ctx):
+    # An existing slot, so the check finds (and reports) a clash.
+    candidate = Meeting(
+        room_id=ctx.meeting.room_id, start_time=ctx.meeting.start_time,
+        end_time=ctx.meeting.end_time,
+    )
+    return lambda: series_conflicts(candidate)
+
+
+def _series_conflicts(ctx):
+    # A year of weekly meetings in the busiest room.
+    busiest = MeetingRoom.objects.annotate(n=Count("meeting")).order_by("-n").first()
+    start = timezone.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    candidate = Meeting(
+        room_id=busiest.pk, start_time=start, end_time=start + timedelta(hours=1),
+        recurrence=recurrence.WEEKLY, recurrence_interval=1, recurrence_count=52,
+    )
+    return lambda: series_conflicts(candidate)
+
+
+def _api_list(ctx):
+    try:
+        from rest_framework.test import APIRequestFactory, force_authenticate
+
+        from api.views import MeetingViewSet
+    except ImportError as exc:
+        raise Skip(f"API dependencies are not installed ({exc.name}).")
+    view = MeetingViewSet.as_view({"get": "list"})
+    if iscoroutinefunction(view):
+        view = async_to_sync(view)
+    factory = APIRequestFactory(SERVER_NAME="localhost")
+
+    def run():
+        request = factory.get("/api/meetings/", {"organizer": ctx.user.pk, "count": "capped"})
+        force_authenticate(request, ctx.user)
+        response = view(request)
+        response.render()
+        if response.status_code != 200:
+            raise AssertionError(f"API list answered {response.status_code}")
+    return run
+
+
+CASES = {
+    "home": _page("home"),
+    "meeting_list": _page("meeting_list"),
+    "meeting_list_search": _page("meeting_list", lambda ctx: {"q": ctx.search_term}),
+    "all_meetings": _page("all_meetings"),
+    "all_meetings_search": _page("all_meetings", lambda ctx: {"q": ctx.search_term}),
+    "minutes_repository": _page("minutes_repository"),
+    "booking_conflicts": _booking_conflicts,
+    "series_conflicts": _series_conflicts,
+    "api_list": _api_list,
+}
+
+
+# ---------- running ----------
+def measure(run, iterations, warmup=2, warm=False):
+    """Timings (ms) and the most queries of any iteration for ``run``."""
+    for _ in range(warmup):
+        if not warm:
+            clear_caches()
+        run()
+    timings, queries = [], 0
+    for _ in range(iterations):
+        if not warm:
+            clear_caches()
+        with CaptureQueriesContext(connection) as ctx:
+            began = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - began) * 1000)
+        queries = max(queries, len(ctx))
+    return {
+        "status": "ok",
+        "iterations": iterations,
+        "queries": queries,
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "p50_ms": round(_percentile(timings, 0.50), 3),
+        "p95_ms": round(_percentile(timings, 0.95), 3),
+        "p99_ms": round(_percentile(timings, 0.99), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def run_suite(names=None, iterations=20, warmup=2, warm=False, username=None):
+    """Run the named cases (all by default) and return the result document."""
+    names = list(names or CASES)
+    unknown = set(names) - set(CASES)
+    if unknown:
+        raise ValueError(f"Unknown cases: {', '.join(sorted(unknown))}.")
+    ctx = Context(username)
+    cases = {}
+    for name in names:
+        try:
+            run = CASES[name](ctx)
+        except Skip as exc:
+            cases[name] = {"status": "skipped", "reason": str(exc)}
+            continue
+        cases[name] = measure(run, iterations, warmup, warm)
+    return {
+        "meta": {
+            "started_at": timezone.now().isoformat(),
+            "git_commit": _git_commit(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "host": platform.node(),
+            "cpu_count": os.cpu_count(),
+            "iterations": iterations,
+            "warm": warm,
+            "user": ctx.user.username,
+            "rows": {
+                "meetings": Meeting.objects.count(),
+                "archived_meetings": ArchivedMeeting.objects.count(),
+                "rooms": MeetingRoom.objects.count(),
+                "users": User.objects.count(),
+            },
+        },
+        "cases": cases,
+    }
+
+
+def compare(baseline, current, threshold=0.2):
+    """
+    One row per case present in both results: medians, query counts and
+    whether it regressed (median more than ``threshold`` slower or more queries).
+    """
+    rows = []
+    for name, now in current["cases"].items():
+        before = baseline["cases"].get(name)
+        if not before or before.get("status") != "ok" or now.get("status") != "ok":
+            continue
+        change = (now["p50_ms"] - before["p50_ms"]) / before["p50_ms"] if before["p50_ms"] else 0.0
+        rows.append({
+            "case": name,
+            "baseline_p50_ms": before["p50_ms"],
+            "p50_ms": now["p50_ms"],
+            "p50_change": round(change, 4),
+            "baseline_queries": before["queries"],
+            "queries": now["queries"],
+            "regressed": change > threshold or now["queries"] > before["queries"],
+        })
+    return rows
@@ -0,0 +1,151 @@
+"""
+Serving stored files to clients.
+
+``serve_file`` answers conditional requests (ETag / Last-Modified) and
+single byte ranges itself. Whole-file responses are FileResponses, which the
+WSGI server can send with sendfile(). When ``MINUTES_SENDFILE`` is set the
+view only checks permissions and hands the transfer to the front-end server:
+
+* ``"x-accel-redirect"`` - nginx; the file is served from the internal
+  location ``MINUTES_ACCEL_PREFIX`` + storage name,
+* ``"x-sendfile"``       - Apache mod_xsendfile / lighttpd; the absolute path.
+
+The front-end server then handles ranges and conditionals too.
+"""
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe, quote_etag
+
+STREAM_CHUNK_SIZE = 64 * 1024
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_CONTENT_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".txt": "text/plain; charset=utf-8",
+}
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header, size):
+    """
+    Inclusive (start, end) of a single byte range, or None to send the whole
+    file. Multi-range and malformed headers are ignored, as RFC 9110 allows.
+    """
+    match = _RANGE.match((header or "").strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    return start, end
+
+
+def _if_range_matches(request, etag, mtime):
+    value = request.headers.get("If-Range")
+    if not value:
+        return True
+    if value.startswith(('"', "W/")):
+        return value == quote_etag(etag)
+    return parse_http_date_safe(value) == int(mtime)
+
+
+def file_etag(name, stat):
+    """Strong ETag: the storage name for content-addressed files, else mtime and size."""
+    stem = os.path.splitext(os.path.basename(name))[0]
+    if re.fullmatch(r"[0-9a-f]{64}", stem):
+        return stem
+    return f"{int(stat.st_mtime):x}-{stat.st_size:x}"
+
+
+def _offloaded(storage, name, content_type, mode):
+    response = HttpResponse(content_type=content_type)
+    if mode == "x-accel-redirect":
+        prefix = getattr(settings, "MINUTES_ACCEL_PREFIX", "/protected-media/")
+        response["X-Accel-Redirect"] = prefix.rstrip("/") + "/" + name
+    else:
+        response["X-Sendfile"] = storage.path(name)
+    return response
+
+
+def _iter_slice(handle, start, length):
+    try:
+        handle.seek(start)
+        while length > 0:
+            piece = handle.read(min(STREAM_CHUNK_SIZE, length))
+            if not piece:
+                break
+            length -= len(piece)
+            yield piece
+    finally:
+        handle.close()
+
+
+def serve_file(request, storage, name, download_name, as_attachment=False):
+    """Response serving ``name`` from a filesystem ``storage``."""
+    content_type = _CONTENT_TYPES.get(
+        os.path.splitext(name)[1].lower(), "application/octet-stream"
+    )
+    mode = getattr(settings, "MINUTES_SENDFILE", None)
+    if mode:
+        response = _offloaded(storage, name, content_type, mode)
+    else:
+        response = _serve_directly(request, storage, name, content_type)
+    if response.status_code in (200, 206):
+        response["Content-Disposition"] = content_disposition_header(as_attachment, download_name)
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def _serve_directly(request, storage, name, content_type):
+    path = storage.path(name)
+    stat = os.stat(path)
+    etag = file_etag(name, stat)
+    not_modified = get_conditional_response(
+        request, etag=quote_etag(etag), last_modified=int(stat.st_mtime)
+    )
+    if not_modified is not None:
+        return not_modified
+
+    size = stat.st_size
+    byte_range = None
+    if request.method == "GET" and _if_range_matches(request, etag, stat.st_mtime):
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, "rb"), content_type=content_type)
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _iter_slice(open(path, "rb"), start, end - start + 1),
+            status=206, content_type=content_type,
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = end - start + 1
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = quote_etag(etag)
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    return response
@@ -0,0 +1,168 @@
+"""
+Text extraction from minutes files for full-text search.
+
+Text is extracted once per stored file: files are content-addressed (see
+``meetings.storage``), so a new or changed document is a new ``MinutesBlob``
+whose ``extracted_at`` is empty, and re-using a document for another meeting
+costs nothing. Saved text goes into the blob row and the meetings using the
+file are re-indexed, so searching minutes is an index lookup.
+
+New files are extracted by a background task queued with the upload (see
+``meetings.tasks``). ``manage.py extract_minutes_text`` backfills pending files across several
+processes; ``extract_path`` does no database work so it can run in them.
+"""
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def _max_chars():
+    return getattr(settings, "MINUTES_TEXT_MAX_CHARS", 200_000)
+
+
+# ---------- per-format extractors (no database access) ----------
+def _txt_text(path):
+    with open(path, "rb") as handle:
+        return handle.read().decode("utf-8", errors="replace")
+
+
+def _docx_text(path):
+    paragraphs, current = [], []
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as xml:
+        for _, element in ElementTree.iterparse(xml):
+            if element.tag == f"{_WORD_NS}t":
+                current.append(element.text or "")
+            elif element.tag == f"{_WORD_NS}tab":
+                current.append("\t")
+            elif element.tag == f"{_WORD_NS}p":
+                paragraphs.append("".join(current))
+                current = []
+                element.clear()
+    return "\n".join(paragraphs)
+
+
+def _pdf_text(path):
+    from pypdf import PdfReader
+
+    return "\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+
+
+def _doc_text(path):
+    # Legacy Word binaries have no simple text layer; keep runs of readable
+    # UTF-16 or ASCII characters, which is enough for word search.
+    with open(path, "rb") as handle:
+        data = handle.read()
+    runs = re.findall(rb"(?:[\x20-\x7e]\x00){4,}", data)
+    if runs:
+        return " ".join(run.decode("utf-16-le") for run in runs)
+    return " ".join(run.decode("ascii") for run in re.findall(rb"[\x20-\x7e]{4,}", data))
+
+
+_EXTRACTORS = {
+    "txt": _txt_text,
+    "docx": _docx_text,
+    "pdf": _pdf_text,
+    "doc": _doc_text,
+}
+
+
+def extract_path(path, max_chars=200_000):
+    """(text, error) for the file at ``path``; errors are reported, not raised."""
+    extension = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    extractor = _EXTRACTORS.get(extension)
+    if extractor is None:
+        return "", f"No text extractor for .{extension} files."
+    try:
+        text = extractor(path)
+    except Exception as exc:  # A corrupt upload must not stop a backfill.
+        return "", f"{type(exc).__name__}: {exc}"[:255]
+    return " ".join(text.split())[:max_chars], ""
+
+
+# ---------- storing results ----------
+def save_text(name, text, error=""):
+    """
+    Store a file's text, re-index the meetings that use it and bump their
+    versions, so cached search pages and their ETags pick the text up.
+    """
+    from . import versioning
+    from .models import ArchivedMeeting, Meeting, MinutesBlob
+    from .search import get_backend
+
+    with transaction.atomic():
+        MinutesBlob.objects.filter(name=name).update(
+            text=text, extraction_error=error, extracted_at=timezone.now()
+        )
+        meeting_ids = []
+        for model in (Meeting, ArchivedMeeting):
+            meetings = model.objects.filter(minutes_file=name)
+            get_backend().index(meetings)
+            meeting_ids.extend(meetings.values_list("pk", flat=True))
+        versioning.bump(versioning.GLOBAL, *(versioning.meeting_scope(pk) for pk in meeting_ids))
+
+
+def pending_names(force=False):
+    from .models import MinutesBlob
+
+    blobs = MinutesBlob.objects.all()
+    if not force:
+        blobs = blobs.filter(extracted_at__isnull=True)
+    return list(blobs.order_by("name").values_list("name", flat=True))
+
+
+def extract_blob(name, force=False):
+    """Extract one stored file unless already done; returns True if it ran."""
+    from .models import MinutesBlob
+    from .storage import minutes_storage
+
+    blob = MinutesBlob.objects.filter(name=name).values("extracted_at").first()
+    if blob is None or (blob["extracted_at"] and not force):
+        return False
+    if not minutes_storage.exists(name):
+        save_text(name, "", "File is missing from storage.")
+        return True
+    save_text(name, *extract_path(minutes_storage.path(name), _max_chars()))
+    return True
+
+
+def extract_pending(processes=1, force=False):
+    """
+    Extract every pending file, parsing in ``processes`` worker processes
+    while this process writes the results. Returns the number of files
+    parsed; files missing from storage are marked with an error.
+    """
+    from .storage import minutes_storage
+
+    names = []
+    for name in pending_names(force):
+        if minutes_storage.exists(name):
+            names.append(name)
+        else:
+            save_text(name, "", "File is missing from storage.")
+    paths = [minutes_storage.path(name) for name in names]
+    limits = [_max_chars()] * len(paths)
+    if processes > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = pool.map(extract_path, paths, limits, chunksize=4)
+            for name, result in zip(names, results):
+                save_text(name, *result)
+    else:
+        for name, path, limit in zip(names, paths, limits):
+            save_text(name, *extract_path(path, limit))
+    return len(names)
+
+
+# ---------- background extraction ----------
+def schedule_extraction(name):
+    """Queue extraction of ``name``; the task row commits with the caller."""
+    from .tasks import extract_minutes_text
+
+    if name:
+        extract_minutes_text.enqueue(name=name)
@@ -0,0 +1,136 @@
+"""
+iCalendar subscription feeds per room and per organizer.
+
+A feed covers meetings from ``MEETING_FEED_PAST_DAYS`` before today to
+``MEETING_FEED_FUTURE_DAYS`` after it, so its size does not grow with
+history. The rendered text is cached under the ScopeVersion of the room or
+organizer (see ``meetings.versioning``), so polling clients are served from
+cache until a meeting in that scope changes. When a feed is rebuilt, events
+whose row did not change reuse the VEVENT text from the previous build.
+
+Calendar clients cannot log in, so feed URLs carry a signed token.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.core.cache import cache
+from django.http import Http404
+from django.urls import reverse
+from django.utils import timezone
+
+from . import ical, recurrence, versioning
+from .models import Meeting, MeetingRoom
+
+_signer = signing.Signer(salt="meetings.feeds")
+
+ROOM = "room"
+ORGANIZER = "organizer"
+
+
+def feed_window():
+    """(start, end) datetimes of the current feed window, aligned to local days."""
+    today = timezone.localdate()
+    past = getattr(settings, "MEETING_FEED_PAST_DAYS", 30)
+    future = getattr(settings, "MEETING_FEED_FUTURE_DAYS", 180)
+    tz = timezone.get_current_timezone()
+    start = datetime.combine(today - timedelta(days=past), time.min, tzinfo=tz)
+    end = datetime.combine(today + timedelta(days=future + 1), time.min, tzinfo=tz)
+    return start, end
+
+
+def feed_scopes(kind, pk):
+    """Version scopes a feed depends on, including the names it shows."""
+    if kind == ROOM:
+        return [versioning.room_scope(pk), versioning.USERS]
+    return [versioning.organizer_scope(pk), versioning.ROOMS]
+
+
+def feed_token(kind, pk):
+    return _signer.sign(f"{kind}:{pk}").rsplit(":", 1)[1]
+
+
+def check_feed_token(kind, pk, token):
+    try:
+        _signer.unsign(f"{kind}:{pk}:{token or ''}")
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def feed_url(request, kind, pk):
+    """Absolute, tokenised subscription URL for a feed."""
+    name = "room_feed" if kind == ROOM else "organizer_feed"
+    path = reverse(name, args=[pk])
+    return request.build_absolute_uri(f"{path}?token={feed_token(kind, pk)}")
+
+
+def _rows(kind, pk, start, end):
+    """Hashable event rows; a series is one row carrying its rule."""
+    qs = recurrence.in_window(Meeting.objects.all(), start, end)
+    qs = qs.filter(room_id=pk) if kind == ROOM else qs.filter(organizer_id=pk)
+    for row in qs.order_by("start_time", "id").values_list(
+        "id", "title", "description", "room__name", "organizer__username",
+        "start_time", "end_time", "created_at", *recurrence.FIELDS,
+    ):
+        yield row[:-1] + (tuple(row[-1] or ()),)
+
+
+def _render_event(row):
+    pk, title, description, room, organizer, start, end, created_at = row[:8]
+    # Series are sent as one VEVENT with RRULE/EXDATE; clients expand them.
+    rule = Meeting(start_time=start, end_time=end, **dict(zip(recurrence.FIELDS, row[8:])))
+    rule.recurrence_exceptions = list(rule.recurrence_exceptions)
+    return ical.vevent(
+        ical.meeting_uid(pk), start, end, title,
+        description=description, location=room, organizer=organizer, stamp=created_at,
+        rrule=recurrence.rrule(rule), exdates=recurrence.exception_starts(rule),
+    )
+
+
+def _feed_name(kind, pk):
+    if kind == ROOM:
+        name = MeetingRoom.objects.filter(pk=pk).values_list("name", flat=True).first()
+        return name and f"{name} meetings"
+    name = User.objects.filter(pk=pk).values_list("username", flat=True).first()
+    return name and f"Meetings organised by {name}"
+
+
+def build_feed(kind, pk):
+    """Calendar text for a feed, reusing unchanged events from the last build."""
+    name = _feed_name(kind, pk)
+    if name is None:
+        raise Http404("No such calendar.")
+    start, end = feed_window()
+    fragments_key = f"meetings:feed:{kind}:{pk}:events"
+    previous = cache.get(fragments_key) or {}
+    fragments = {}
+    parts = [ical.calendar_header(name)]
+    for row in _rows(kind, pk, start, end):
+        text = previous.get(row) or _render_event(row)
+        fragments[row] = text
+        parts.append(text)
+    parts.append(ical.calendar_footer())
+    cache.set(fragments_key, fragments, _timeout())
+    return "".join(parts)
+
+
+def _timeout():
+    return getattr(settings, "MEETING_FEED_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def feed_validators(kind, pk):
+    """(etag, last_modified) of a feed; also its cache key."""
+    start, _ = feed_window()
+    return versioning.validators(feed_scopes(kind, pk), vary=[kind, start.date()])
+
+
+def get_feed(kind, pk, etag):
+    """Calendar text for the feed version ``etag``, from cache when possible."""
+    key = f"meetings:feed:{kind}:{pk}:{etag}"
+    text = cache.get(key)
+    if text is None:
+        text = build_feed(kind, pk)
+        cache.set(key, text, _timeout())
+    return text
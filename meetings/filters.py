@@ -0,0 +1,104 @@
+"""
+Meeting filters shared by the list views, exports and the API.
+
+Every filter is a range predicate on the raw ``start_time``/``end_time``
+columns, so the (organizer, start_time), (start_time, id) and
+(organizer, end_time, start_time) indexes stay usable:
+
+* ``status``: upcoming is ``start_time > now``, ongoing is
+  ``start_time <= now <= end_time`` and ended is ``end_time < now``, the same
+  boundaries as the dashboard counts in ``meetings.stats``;
+* ``date_from``/``date_to``: local calendar days, as the half-open range
+  [midnight starting date_from, midnight after date_to) in the current time
+  zone. The bounds absorb the UTC offset (and any DST change) once, instead
+  of a ``__date`` lookup converting every row.
+
+``MeetingFilterSet`` parses them from a query string. ``filter_meetings``
+ignores values that do not parse, for the HTML views and exports;
+``api.filters.MeetingFilter`` extends the set and answers 400 instead.
+``meeting_status`` classifies a single meeting the same way, for templates.
+"""
+from datetime import datetime, time, timedelta
+
+import django_filters
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Meeting
+from .search import search_meetings
+
+UPCOMING, ONGOING, ENDED = "upcoming", "ongoing", "ended"
+STATUS_CHOICES = (
+    (UPCOMING, "Upcoming"),
+    (ONGOING, "Ongoing"),
+    (ENDED, "Ended"),
+)
+
+
+def status_q(status, now):
+    """Predicate for meetings in ``status`` at ``now``."""
+    if status == UPCOMING:
+        return Q(start_time__gt=now)
+    if status == ONGOING:
+        return Q(start_time__lte=now, end_time__gte=now)
+    if status == ENDED:
+        return Q(end_time__lt=now)
+    raise ValueError(f"Unknown meeting status {status!r}.")
+
+
+def meeting_status(meeting, now):
+    """UPCOMING, ONGOING or ENDED for ``meeting`` at ``now``, as ``status_q`` decides."""
+    if meeting.start_time > now:
+        return UPCOMING
+    if meeting.end_time >= now:
+        return ONGOING
+    return ENDED
+
+
+def day_start(day):
+    """Aware local midnight at the start of ``day`` in the current time zone."""
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+class MeetingFilterSet(django_filters.FilterSet):
+    """
+    ?q=<text>&status=all|upcoming|ongoing|ended&date_from=<date>&date_to=<date>
+    Works on Meeting and ArchivedMeeting querysets.
+    """
+    q = django_filters.CharFilter(method="filter_q")
+    status = django_filters.ChoiceFilter(
+        choices=(("all", "All"), *STATUS_CHOICES), method="filter_status"
+    )
+    date_from = django_filters.DateFilter(method="filter_date_from")
+    date_to = django_filters.DateFilter(method="filter_date_to")
+
+    class Meta:
+        model = Meeting
+        fields = ["q", "status", "date_from", "date_to"]
+
+    def __init__(self, data=None, queryset=None, *, now=None, **kwargs):
+        super().__init__(data, queryset, **kwargs)
+        self.now = now or timezone.now()
+
+    def filter_q(self, queryset, name, value):
+        return search_meetings(queryset, value)
+
+    def filter_status(self, queryset, name, value):
+        if value == "all":
+            return queryset
+        return queryset.filter(status_q(value, self.now))
+
+    def filter_date_from(self, queryset, name, value):
+        return queryset.filter(start_time__gte=day_start(value))
+
+    def filter_date_to(self, queryset, name, value):
+        return queryset.filter(start_time__lt=day_start(value + timedelta(days=1)))
+
+
+def filter_meetings(qs, params, now):
+    """
+    Apply the ``q``, ``status``, ``date_from`` and ``date_to`` filters from
+    ``params`` (a QueryDict or dict) to a Meeting queryset; values that do not
+    parse are ignored.
+    """
+    return MeetingFilterSet(params, queryset=qs, now=now).qs
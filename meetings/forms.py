@@ -1,11 +1,37 @@
+from datetime import date
+
 from django import forms
 from django.utils import timezone
 from zoneinfo import ZoneInfo
 from .models import Meeting
+from .storage import signature_matches
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 
 
+class SkippedDatesField(forms.CharField):
+    """Comma-separated YYYY-MM-DD dates, stored as a list of ISO strings."""
+
+    def __init__(self, *, encoder=None, decoder=None, **kwargs):
+        # Passed by the model's JSONField; the value here is plain text.
+        super().__init__(**kwargs)
+
+    def prepare_value(self, value):
+        if isinstance(value, (list, tuple)):
+            return ", ".join(value)
+        return value
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        dates = []
+        for part in filter(None, (p.strip() for p in (value or "").split(","))):
+            try:
+                dates.append(date.fromisoformat(part).isoformat())
+            except ValueError:
+                raise forms.ValidationError(f"{part} is not a YYYY-MM-DD date.")
+        return sorted(set(dates))
+
+
 class MeetingForm(forms.ModelForm):
     """
     Form will help in creating and editing meetings, (will add upload feature).
@@ -20,7 +46,13 @@ class MeetingForm(forms.ModelForm):
             "start_time",
             "end_time",
             "minutes_file",
+            "recurrence",
+            "recurrence_interval",
+            "recurrence_count",
+            "recurrence_until",
+            "recurrence_exceptions",
         ]
+        field_classes = {"recurrence_exceptions": SkippedDatesField}
 
         widgets = {
             "title": forms.TextInput(
@@ -48,6 +80,15 @@ class MeetingForm(forms.ModelForm):
                     "accept": ".pdf,.doc,.docx,.txt",
                 }
             ),
+            "recurrence": forms.Select(attrs={"class": "form-select"}),
+            "recurrence_interval": forms.NumberInput(attrs={"class": "form-control", "min": 1}),
+            "recurrence_count": forms.NumberInput(
+                attrs={"class": "form-control", "min": 1, "placeholder": "e.g. 10"}
+            ),
+            "recurrence_until": forms.DateInput(attrs={"type": "date", "class": "form-control"}),
+            "recurrence_exceptions": forms.TextInput(
+                attrs={"class": "form-control", "placeholder": "YYYY-MM-DD, YYYY-MM-DD"}
+            ),
         }
 
     def __init__(self, *args, **kwargs):
@@ -60,6 +101,17 @@ class MeetingForm(forms.ModelForm):
                 self.initial[field] = value.astimezone(nairobi).strftime("%Y-%m-%dT%H:%M")
 
         self.fields["minutes_file"].required = False
+        self.fields["recurrence_interval"].required = False
+
+    def clean_minutes_file(self):
+        upload = self.cleaned_data.get("minutes_file")
+        # Only freshly uploaded files have content to sniff.
+        if upload and hasattr(upload, "content_type"):
+            head = upload.read(16)
+            upload.seek(0)
+            if not signature_matches(upload.name.rsplit(".", 1)[-1], head):
+                raise forms.ValidationError("The file's content does not match its extension.")
+        return upload
 
     def clean(self):
         cleaned_data = super().clean()
@@ -75,6 +127,9 @@ class MeetingForm(forms.ModelForm):
         if start_time and end_time and end_time <= start_time:
             raise forms.ValidationError("End time must be after the start time.")
 
+        # A blank interval means "every" day/week/month.
+        cleaned_data["recurrence_interval"] = cleaned_data.get("recurrence_interval") or 1
+
         if not self.cleaned_data.get("minutes_file") and self.instance and self.instance.pk:
             cleaned_data["minutes_file"] = self.instance.minutes_file
 
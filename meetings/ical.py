@@ -0,0 +1,80 @@
+"""Minimal iCalendar (RFC 5545) serialisation for meetings."""
+from datetime import timezone as dt_timezone
+
+PRODID = "-//Mkutano IO//Meeting Manager//EN"
+
+
+def escape(value):
+    """Escape a TEXT value."""
+    return (
+        str(value or "")
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line):
+    """Fold a content line at 75 octets, as the spec requires."""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    while data:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(data))
+        # Never split a multi-byte UTF-8 sequence.
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_datetime(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_header(name=None):
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN"]
+    if name:
+        lines.append(f"X-WR-CALNAME:{escape(name)}")
+    return "".join(fold(line) for line in lines)
+
+
+def calendar_footer():
+    return "END:VCALENDAR\r\n"
+
+
+def vevent(
+    uid, start, end, summary, description="", location="", organizer="", stamp=None,
+    rrule="", exdates=(),
+):
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_datetime(stamp or start)}",
+        f"DTSTART:{format_datetime(start)}",
+        f"DTEND:{format_datetime(end)}",
+        f"SUMMARY:{escape(summary)}",
+    ]
+    if rrule:
+        lines.append(f"RRULE:{rrule}")
+    if exdates:
+        lines.append("EXDATE:" + ",".join(format_datetime(value) for value in exdates))
+    if description:
+        lines.append(f"DESCRIPTION:{escape(description)}")
+    if location:
+        lines.append(f"LOCATION:{escape(location)}")
+    if organizer:
+        # Parameter values are quoted rather than escaped; quotes are not allowed.
+        cn = str(organizer).replace('"', "")
+        lines.append(f'ORGANIZER;CN="{cn}":mailto:noreply@mkutano.io')
+    lines.append("END:VEVENT")
+    return "".join(fold(line) for line in lines)
+
+
+def meeting_uid(meeting_id):
+    return f"meeting-{meeting_id}@mkutano.io"
@@ -0,0 +1,611 @@
+"""
+Bulk meeting import from CSV or iCalendar (``manage.py import_meetings``,
+``POST /api/meetings/import/``).
+
+``import_meetings(lines, fmt)`` reads any iterable of text lines (an open
+file, an upload) one record at a time and works through the records in
+batches as they arrive: each batch is checked and its valid, conflict-free
+rows are written with ``bulk_create`` before the next is read, so only the
+report grows with the file. It returns a per-row report::
+
+    {"created": 1, "conflicts": 1, "invalid": 1, "dry_run": False,
+     "rows": [{"row": 1, "status": "created", "meeting": 41},
+              {"row": 2, "status": "conflict", "meetings": [7], "rows": []},
+              {"row": 3, "status": "invalid", "errors": ["Unknown room 'Atrium'."]}]}
+
+Rooms and organizers are looked up by name in bulk. Conflicts are found per
+room rather than with a query per row: the bookings of up to 500 rooms that
+may overlap a batch are read in one query, series expanded, and merged into
+a sorted list of busy intervals per room. Rows are then taken in file order
+and each occurrence is checked with a binary search; a row that fits joins
+the list, so a later row clashing with it is a conflict too. The lists live
+for the whole import, and a later batch only reads the bookings outside the
+span already read for a room.
+
+``bulk_create`` skips the Meeting signals, so their work is done once per
+batch instead: search index and scope versions, and after commit the
+dashboard stats, availability index and live events. The usage rollup is
+queued once per room for the whole import.
+"""
+import csv
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from . import recurrence, versioning
+from .analytics import schedule_refresh
+from .availability import availability
+from .live import hub, meeting_event
+from .models import Meeting, MeetingRoom
+from .search import get_backend
+from .stats import invalidate_user_stats
+
+CREATED = "created"
+CONFLICT = "conflict"
+INVALID = "invalid"
+
+BATCH_SIZE = 2000
+# Names per lookup query and rooms per bookings query, well under any
+# backend's limit on query parameters.
+LOOKUP_CHUNK = 500
+REQUIRED_CSV_COLUMNS = ("title", "room", "start_time", "end_time")
+
+
+class ImportFormatError(Exception):
+    """The input as a whole cannot be read (e.g. a CSV header lacks a column)."""
+
+
+class Row:
+    """One input record: its parsed fields, then its meeting or errors."""
+
+    __slots__ = ("number", "fields", "errors", "meeting", "status", "clashes")
+
+    def __init__(self, number, fields=None, errors=None):
+        self.number = number
+        self.fields = fields or {}
+        self.errors = errors or []
+        self.meeting = None
+        self.status = INVALID if self.errors else None
+        self.clashes = None
+
+    def report(self):
+        entry = {"row": self.number, "status": self.status}
+        if "uid" in self.fields:
+            entry["uid"] = self.fields["uid"]
+        if self.status == CREATED:
+            entry["meeting"] = self.meeting.pk
+        elif self.status == CONFLICT:
+            entry["meetings"] = sorted(self.clashes[0])
+            entry["rows"] = sorted(self.clashes[1])
+        elif self.status == INVALID:
+            entry["errors"] = self.errors
+        return entry
+
+
+def _chunks(items, size):
+    """Lists of up to ``size`` items, taken from ``items`` as it is consumed."""
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+# ---------- CSV ----------
+def _csv_datetime(value, column, tz):
+    try:
+        parsed = parse_datetime(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"{column} is not a date and time: {value!r}.")
+    return timezone.make_aware(parsed, tz) if parsed.tzinfo is None else parsed
+
+
+def _csv_int(value, column):
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{column} is not a whole number: {value!r}.")
+
+
+def _csv_date(value, column):
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValueError(f"{column} is not a date: {value!r}.")
+    return parsed
+
+
+# column -> parser for the optional repeat rule columns
+_CSV_RULE_PARSERS = {
+    "recurrence_interval": _csv_int,
+    "recurrence_count": _csv_int,
+    "recurrence_until": _csv_date,
+}
+
+
+def read_csv(lines):
+    """
+    Rows of a CSV file with a header line. ``title``, ``room``, ``start_time``
+    and ``end_time`` are required; ``description``, ``organizer`` (username)
+    and the ``recurrence*`` rule columns are optional, and other columns
+    (``id``, ``created_at`` from an export) are ignored. Times without an
+    offset are in ``TIME_ZONE``.
+    """
+    reader = csv.DictReader(lines)
+    missing = [column for column in REQUIRED_CSV_COLUMNS if column not in (reader.fieldnames or ())]
+    if missing:
+        raise ImportFormatError(f"The CSV header lacks {', '.join(missing)}.")
+    tz = timezone.get_current_timezone()
+    for number, record in enumerate(reader, 1):
+        record = {key: (value or "").strip() for key, value in record.items() if key}
+        fields, errors = {
+            "title": record["title"],
+            "description": record.get("description", ""),
+            "room": record["room"],
+            "organizer": record.get("organizer", ""),
+            "recurrence": record.get("recurrence", "").lower(),
+        }, []
+        for column in ("start_time", "end_time"):
+            try:
+                fields[column] = _csv_datetime(record[column], column, tz)
+            except ValueError as exc:
+                errors.append(str(exc))
+        for column, parse in _CSV_RULE_PARSERS.items():
+            if record.get(column):
+                try:
+                    fields[column] = parse(record[column], column)
+                except ValueError as exc:
+                    errors.append(str(exc))
+        if record.get("recurrence_exceptions"):
+            fields["recurrence_exceptions"] = re.findall(
+                r"\d{4}-\d{2}-\d{2}", record["recurrence_exceptions"]
+            )
+        yield Row(number, fields, errors)
+
+
+# ---------- iCalendar ----------
+_ICS_DATETIME = re.compile(r"(\d{4})(\d\d)(\d\d)T(\d\d)(\d\d)(\d\d)(Z?)$")
+_ICS_DATE = re.compile(r"(\d{4})(\d\d)(\d\d)$")
+_ICS_DURATION = re.compile(r"P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+_ICS_WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+_ICS_UNESCAPE = re.compile(r"\\([\\;,nN])")
+
+
+def _unfold(lines):
+    """Logical content lines: continuation lines (leading space or tab) joined back."""
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _content_line(line):
+    """(NAME, {PARAM: value}, value) of a content line; quoted parameters may hold ':' and ';'."""
+    if '"' not in line:
+        head, _, value = line.partition(":")
+        parts = head.split(";")
+    else:
+        quoted, split_at = False, len(line)
+        for index, char in enumerate(line):
+            if char == '"':
+                quoted = not quoted
+            elif char == ":" and not quoted:
+                split_at = index
+                break
+        head, value = line[:split_at], line[split_at + 1:]
+        parts = re.findall(r'(?:[^;"]|"[^"]*")+', head)
+    params = {}
+    for part in parts[1:]:
+        key, _, param = part.partition("=")
+        params[key.upper()] = param.strip('"')
+    return parts[0].upper(), params, value
+
+
+def _ics_text(value):
+    return _ICS_UNESCAPE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def _ics_zone(params):
+    tzid = params.get("TZID")
+    if not tzid:
+        return timezone.get_current_timezone()
+    try:
+        return ZoneInfo(tzid)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown time zone {tzid!r}.")
+
+
+def _ics_datetime(value, params, name):
+    match = _ICS_DATETIME.match(value.strip())
+    if not match:
+        if params.get("VALUE") == "DATE" or _ICS_DATE.match(value.strip()):
+            raise ValueError("All-day events are not supported.")
+        raise ValueError(f"{name} is not a date and time: {value!r}.")
+    year, month, day, hour, minute, second, utc = match.groups()
+    try:
+        parsed = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+    except ValueError:
+        raise ValueError(f"{name} is not a date and time: {value!r}.")
+    if utc:
+        return parsed.replace(tzinfo=dt_timezone.utc)
+    return timezone.make_aware(parsed, _ics_zone(params))
+
+
+def _ics_duration(value):
+    match = _ICS_DURATION.match(value.strip().lstrip("+"))
+    if not match or not any(match.groups()):
+        raise ValueError(f"DURATION is not a duration: {value!r}.")
+    weeks, days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+
+
+def _ics_until(value):
+    value = value.strip()
+    if _ICS_DATE.match(value):
+        return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    return timezone.localdate(_ics_datetime(value, {}, "UNTIL"))
+
+
+def _ics_rule(value, start):
+    """Rule fields for an RRULE the Meeting model can represent."""
+    parts = dict(part.partition("=")[::2] for part in value.upper().split(";") if part)
+    frequency = parts.pop("FREQ", "").lower()
+    if frequency not in (recurrence.DAILY, recurrence.WEEKLY, recurrence.MONTHLY):
+        raise ValueError(f"Unsupported repeat frequency {frequency.upper() or 'none'}.")
+    parts.pop("WKST", None)
+    local_start = timezone.localtime(start)
+    # Calendar apps spell out the start's own weekday or day of the month.
+    if frequency == recurrence.WEEKLY and parts.get("BYDAY") == _ICS_WEEKDAYS[local_start.weekday()]:
+        del parts["BYDAY"]
+    if frequency == recurrence.MONTHLY and parts.get("BYMONTHDAY") == str(local_start.day):
+        del parts["BYMONTHDAY"]
+    fields = {"recurrence": frequency}
+    try:
+        if "INTERVAL" in parts:
+            fields["recurrence_interval"] = int(parts.pop("INTERVAL"))
+        if "COUNT" in parts:
+            fields["recurrence_count"] = int(parts.pop("COUNT"))
+    except ValueError:
+        raise ValueError(f"RRULE is malformed: {value!r}.")
+    if "UNTIL" in parts:
+        fields["recurrence_until"] = _ics_until(parts.pop("UNTIL"))
+    if parts:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(parts))}.")
+    return fields
+
+
+def _ics_row(number, properties):
+    fields, errors = {"title": "", "description": "", "room": "", "organizer": ""}, []
+    values = {}
+    for name, params, value in properties:
+        if name == "EXDATE":
+            values.setdefault(name, []).append((params, value))
+        else:
+            values.setdefault(name, (params, value))
+    if "UID" in values:
+        fields["uid"] = values["UID"][1]
+    fields["title"] = _ics_text(values.get("SUMMARY", ({}, ""))[1]).strip()
+    fields["description"] = _ics_text(values.get("DESCRIPTION", ({}, ""))[1])
+    fields["room"] = _ics_text(values.get("LOCATION", ({}, ""))[1]).strip()
+    if "ORGANIZER" in values:
+        params, value = values["ORGANIZER"]
+        fields["organizer"] = params.get("CN") or value.split(":", 1)[-1].split("@", 1)[0]
+    try:
+        if "DTSTART" not in values:
+            raise ValueError("DTSTART is missing.")
+        start = fields["start_time"] = _ics_datetime(*values["DTSTART"][::-1], "DTSTART")
+        if "DTEND" in values:
+            fields["end_time"] = _ics_datetime(*values["DTEND"][::-1], "DTEND")
+        elif "DURATION" in values:
+            fields["end_time"] = start + _ics_duration(values["DURATION"][1])
+        else:
+            raise ValueError("DTEND or DURATION is missing.")
+        if "RRULE" in values:
+            fields.update(_ics_rule(values["RRULE"][1], start))
+        skipped = [
+            timezone.localdate(_ics_datetime(item, params, "EXDATE"))
+            for params, value in values.get("EXDATE", ())
+            for item in value.split(",")
+        ]
+        if skipped:
+            fields["recurrence_exceptions"] = sorted({day.isoformat() for day in skipped})
+    except ValueError as exc:
+        errors.append(str(exc))
+    return Row(number, fields, errors)
+
+
+def read_ics(lines):
+    """
+    Rows of an iCalendar file, one per VEVENT: SUMMARY is the title,
+    LOCATION the room name and ORGANIZER's CN the username. DTEND or
+    DURATION, TZID parameters, RRULE (daily, weekly or monthly with
+    INTERVAL, COUNT or UNTIL) and EXDATE are understood; nested components
+    such as VALARM are skipped.
+    """
+    number, event, depth = 0, None, 0
+    for line in _unfold(lines):
+        name, params, value = _content_line(line)
+        value_upper = value.strip().upper()
+        if event is None:
+            if name == "BEGIN" and value_upper == "VEVENT":
+                event, depth = [], 0
+            continue
+        if name == "BEGIN":
+            depth += 1
+        elif name == "END" and depth:
+            depth -= 1
+        elif name == "END" and value_upper == "VEVENT":
+            number += 1
+            yield _ics_row(number, event)
+            event = None
+        elif not depth:
+            event.append((name, params, value))
+
+
+READERS = {"csv": read_csv, "ics": read_ics}
+
+
+# ---------- checking ----------
+def _lookup(model, field, names):
+    found = {}
+    for chunk in _chunks(names, LOOKUP_CHUNK):
+        found.update(model.objects.filter(**{f"{field}__in": chunk}).values_list(field, "pk"))
+    return found
+
+
+def _build(rows, organizer, allow_organizers):
+    """Attach an unsaved Meeting to every row that parsed, or record why it cannot be one."""
+    parsed = [row for row in rows if row.status is None]
+    rooms = _lookup(MeetingRoom, "name", {row.fields["room"] for row in parsed})
+    usernames = {row.fields["organizer"] for row in parsed if row.fields["organizer"]}
+    users = _lookup(User, "username", usernames) if allow_organizers else {}
+    for row in parsed:
+        fields, errors = row.fields, row.errors
+        if not fields["title"]:
+            errors.append("Title is required.")
+        elif len(fields["title"]) > Meeting._meta.get_field("title").max_length:
+            errors.append("Title is longer than 200 characters.")
+        room_id = rooms.get(fields["room"])
+        if room_id is None:
+            errors.append(f"Unknown room {fields['room']!r}." if fields["room"] else "Room is required.")
+        name = fields["organizer"]
+        if not name or (organizer is not None and name == organizer.username):
+            organizer_id = organizer.pk if organizer is not None else None
+            if organizer_id is None:
+                errors.append("Organizer is required.")
+        elif not allow_organizers:
+            organizer_id = None
+            errors.append("Meetings can only be imported for yourself.")
+        else:
+            organizer_id = users.get(name)
+            if organizer_id is None:
+                errors.append(f"Unknown organizer {name!r}.")
+        if fields["end_time"] <= fields["start_time"]:
+            errors.append("The meeting must end after it starts.")
+        if errors:
+            row.status = INVALID
+            continue
+        meeting = Meeting(
+            title=fields["title"],
+            description=fields["description"],
+            room_id=room_id,
+            organizer_id=organizer_id,
+            start_time=fields["start_time"],
+            end_time=fields["end_time"],
+            recurrence=fields["recurrence"] if "recurrence" in fields else "",
+            recurrence_interval=fields.get("recurrence_interval", 1),
+            recurrence_count=fields.get("recurrence_count"),
+            recurrence_until=fields.get("recurrence_until"),
+            recurrence_exceptions=fields.get("recurrence_exceptions", []),
+            minutes_file="",
+        )
+        if meeting.recurrence not in ("", recurrence.DAILY, recurrence.WEEKLY, recurrence.MONTHLY):
+            errors.append(f"Unknown repeat frequency {meeting.recurrence!r}.")
+        else:
+            try:
+                recurrence.validate(meeting)
+            except ValidationError as exc:
+                errors.extend(exc.messages)
+        if errors:
+            row.status = INVALID
+            continue
+        # Meeting.save() would set this; bulk_create does not call it.
+        meeting.series_end = recurrence.series_end(meeting)
+        row.meeting = meeting
+
+
+class _Busy:
+    """A room's booked intervals as disjoint, sorted (start, end) epoch seconds and their owners."""
+
+    def __init__(self):
+        self.starts, self.ends, self.owners = [], [], []
+
+    def clashes(self, start, end):
+        """Owners of the intervals overlapping [start, end)."""
+        found = []
+        index = bisect_left(self.starts, end) - 1
+        while index >= 0 and self.ends[index] > start:
+            found.append(self.owners[index])
+            index -= 1
+        return found
+
+    def add(self, start, end, owner):
+        """Book [start, end) for ``owner``; overlapping bookings share one interval."""
+        first = bisect_right(self.ends, start)
+        last = bisect_left(self.starts, end)
+        owners = {owner}
+        if first < last:
+            start, end = min(start, self.starts[first]), max(end, self.ends[last - 1])
+            owners.update(*self.owners[first:last])
+        self.starts[first:last] = [start]
+        self.ends[first:last] = [end]
+        self.owners[first:last] = [owners]
+
+
+class _Schedule:
+    """Every room's ``_Busy`` list for one import, kept across batches."""
+
+    def __init__(self):
+        self.busy = defaultdict(_Busy)
+        # room id -> (start, end) span whose bookings have been read
+        self.read = {}
+        # Meetings written by this import are in ``busy`` as rows already.
+        self.created = set()
+
+    def load(self, windows):
+        """Read the bookings needed to cover ``{room_id: (start, end)}``, in one query."""
+        missing = defaultdict(list)
+        for room_id, (start, end) in windows.items():
+            if room_id not in self.read:
+                missing[room_id].append((start, end))
+                self.read[room_id] = (start, end)
+                continue
+            read_start, read_end = self.read[room_id]
+            if start < read_start:
+                missing[room_id].append((start, read_start))
+            if end > read_end:
+                missing[room_id].append((read_end, end))
+            self.read[room_id] = (min(start, read_start), max(end, read_end))
+        if not missing:
+            return
+        bookings = recurrence.in_window(
+            Meeting.objects.filter(room_id__in=list(missing)),
+            min(start for spans in missing.values() for start, _ in spans),
+            max(end for spans in missing.values() for _, end in spans),
+        )
+        for meeting in bookings.order_by().only(
+            "id", "room_id", "start_time", "end_time", *recurrence.FIELDS
+        ).iterator(chunk_size=BATCH_SIZE):
+            if meeting.pk in self.created:
+                continue
+            busy = self.busy[meeting.room_id]
+            for start, end in missing[meeting.room_id]:
+                for occurrence in recurrence.occurrences(meeting, start, end):
+                    busy.add(occurrence.start.timestamp(), occurrence.end.timestamp(), meeting.pk)
+
+
+def _check_conflicts(rows, schedule):
+    """Mark each row with a meeting as accepted (status None) or a conflict, in file order."""
+    by_room = defaultdict(list)
+    for row in rows:
+        if row.meeting is not None:
+            by_room[row.meeting.room_id].append(row)
+    for room_ids in _chunks(sorted(by_room), LOOKUP_CHUNK):
+        schedule.load({
+            room_id: (
+                min(row.meeting.start_time for row in by_room[room_id]),
+                max(row.meeting.series_end for row in by_room[room_id]),
+            )
+            for room_id in room_ids
+        })
+        for room_id in room_ids:
+            busy = schedule.busy[room_id]
+            for row in by_room[room_id]:
+                spans = [
+                    (occurrence.start.timestamp(), occurrence.end.timestamp())
+                    for occurrence in recurrence.occurrences(row.meeting)
+                ]
+                owners = set()
+                for start, end in spans:
+                    for found in busy.clashes(start, end):
+                        owners |= found
+                if owners:
+                    row.status = CONFLICT
+                    row.clashes = (
+                        {owner for owner in owners if not isinstance(owner, Row)},
+                        {owner.number for owner in owners if isinstance(owner, Row)},
+                    )
+                    continue
+                for start, end in spans:
+                    busy.add(start, end, row)
+
+
+# ---------- writing ----------
+def _after_bulk_create(meetings, spans):
+    """
+    What the Meeting signals would have done for ``meetings``, once per
+    batch. Each room's overall span is widened in ``spans`` so the usage
+    rollup is refreshed once per room at the end.
+    """
+    get_backend().index(Meeting.objects.filter(pk__in=[meeting.pk for meeting in meetings]))
+    room_ids = {meeting.room_id for meeting in meetings}
+    organizer_ids = {meeting.organizer_id for meeting in meetings}
+    versioning.bump(
+        versioning.GLOBAL,
+        *(versioning.room_scope(pk) for pk in room_ids),
+        *(versioning.organizer_scope(pk) for pk in organizer_ids),
+    )
+    for meeting in meetings:
+        first, last = spans.get(meeting.room_id, (meeting.start_time, meeting.series_end))
+        spans[meeting.room_id] = (min(first, meeting.start_time), max(last, meeting.series_end))
+
+    def published():
+        for organizer_id in organizer_ids:
+            invalidate_user_stats(organizer_id)
+        for meeting in meetings:
+            availability.meeting_saved(meeting)
+            hub.publish(meeting_event("booked", meeting))
+
+    transaction.on_commit(published)
+
+
+def import_meetings(
+    lines, fmt, *, organizer=None, allow_organizers=True, dry_run=False, batch_size=BATCH_SIZE
+):
+    """
+    Import meetings from ``lines`` in format ``fmt`` (a key of READERS) and
+    return the report. Rows without an organizer get ``organizer``; unless
+    ``allow_organizers`` is set, naming anyone else makes a row invalid.
+    With ``dry_run`` nothing is written and rows that would be created are
+    reported as such (without a meeting id). Records are read, checked and
+    written ``batch_size`` at a time, all in one transaction.
+    """
+    report = {"created": 0, "conflicts": 0, "invalid": 0, "dry_run": dry_run, "rows": []}
+    totals = {CREATED: "created", CONFLICT: "conflicts", INVALID: "invalid"}
+    schedule, locked, spans = _Schedule(), set(), {}
+    with transaction.atomic():
+        for rows in _chunks(READERS[fmt](lines), batch_size):
+            _build(rows, organizer, allow_organizers)
+            # Lock the rooms, as book_meeting() does, so no booking lands
+            # between the conflict check and the insert.
+            room_ids = sorted({row.meeting.room_id for row in rows if row.meeting is not None} - locked)
+            for chunk in _chunks(room_ids, LOOKUP_CHUNK):
+                list(MeetingRoom.objects.select_for_update().filter(pk__in=chunk).values_list("pk"))
+            locked.update(room_ids)
+            _check_conflicts(rows, schedule)
+            accepted = [row for row in rows if row.meeting is not None and row.status is None]
+            for row in accepted:
+                row.status = CREATED
+            if accepted and not dry_run:
+                meetings = Meeting.objects.bulk_create([row.meeting for row in accepted])
+                schedule.created.update(meeting.pk for meeting in meetings)
+                _after_bulk_create(meetings, spans)
+            for row in rows:
+                entry = row.report()
+                if dry_run:
+                    entry.pop("meeting", None)
+                report[totals[row.status]] += 1
+                report["rows"].append(entry)
+                # Accepted rows stay in the busy lists; only their number is read again.
+                row.fields = row.meeting = None
+        for room_id, (first, last) in spans.items():
+            schedule_refresh(room_id, first, last)
+    return report
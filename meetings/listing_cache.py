@@ -0,0 +1,160 @@
+"""
+Shared cache for the listings every user sees alike (all meetings, the
+minutes repository).
+
+Two layers, both keyed on the current versions of the scopes the listing
+depends on (see ``meetings.versioning``):
+
+* pages - the rows and pagination state for one (listing, search, cursor,
+  page size), as a ``PageSnapshot``;
+* rows  - the rendered ``<tr>`` of one meeting in one listing (and status,
+  where the row shows it), fetched for a whole page with one ``get_many``.
+
+Meeting/MeetingRoom/username signals bump those versions as the write
+commits, so a change makes every older entry unreachable at once and stale
+rows are not served past that moment; unreachable entries age out through the
+backend's bounded eviction (``MAX_ENTRIES``/``CULL_FREQUENCY``) and timeout.
+The backend is the ``LISTING_CACHE_ALIAS`` cache (``"listings"``), chosen in
+settings. Hits and misses are counted per process; ``stats()`` reports them.
+"""
+import hashlib
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from . import versioning
+from .filters import meeting_status
+
+_lock = threading.Lock()
+_counters = Counter()
+
+
+def get_cache():
+    return caches[getattr(settings, "LISTING_CACHE_ALIAS", "listings")]
+
+
+def _count(layer, hits, misses):
+    with _lock:
+        _counters[f"{layer}_hits"] += hits
+        _counters[f"{layer}_misses"] += misses
+
+
+def stats():
+    """Hit/miss counts and hit ratio per layer since this process started (or ``reset()``)."""
+    with _lock:
+        counts = dict(_counters)
+    data = {"backend": type(get_cache()).__name__}
+    for layer in ("page", "row"):
+        hits, misses = counts.get(f"{layer}_hits", 0), counts.get(f"{layer}_misses", 0)
+        data[layer] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+    return data
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+
+
+def _token(known, scopes):
+    return ".".join(f"{scope}={known[scope][0]}" for scope in sorted(set(scopes)))
+
+
+def version(request, scopes):
+    """Version token for ``scopes``, reusing the lookup made by ``@versioned``."""
+    known = getattr(request, "scope_versions", None) or {}
+    if not set(scopes) <= known.keys():
+        known = versioning.get_versions(sorted(set(scopes)))
+    return _token(known, scopes)
+
+
+async def aversion(request, scopes):
+    known = getattr(request, "scope_versions", None) or {}
+    if not set(scopes) <= known.keys():
+        known = await versioning.aget_versions(sorted(set(scopes)))
+    return _token(known, scopes)
+
+
+def _key(*parts):
+    # Search terms and cursors are client input; hash them into a safe key.
+    digest = hashlib.md5("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f"listings:{parts[0]}:{digest}"
+
+
+def get_page(listing, token, params, build):
+    """The cached snapshot for ``params``, or ``build()``'s page snapshotted and stored."""
+    cache = get_cache()
+    key = _key(listing, "page", token, *sorted(params.items()))
+    page = cache.get(key)
+    if page is not None:
+        _count("page", 1, 0)
+        return page
+    _count("page", 0, 1)
+    page = build().snapshot()
+    cache.set(key, page)
+    return page
+
+
+async def aget_page(listing, token, params, abuild):
+    """``get_page`` for async views; ``abuild()`` is awaited for the page on a miss."""
+    cache = get_cache()
+    key = _key(listing, "page", token, *sorted(params.items()))
+    page = await cache.aget(key)
+    if page is not None:
+        _count("page", 1, 0)
+        return page
+    _count("page", 0, 1)
+    page = (await abuild()).snapshot()
+    await cache.aset(key, page)
+    return page
+
+
+def _row_keys(template_name, meetings, token, now):
+    return [
+        _key(template_name, "row", token, meeting.pk, now and meeting_status(meeting, now))
+        for meeting in meetings
+    ]
+
+
+def _fill_rows(template_name, meetings, keys, found, now):
+    """Render the rows missing from ``found``; returns (html, newly rendered rows)."""
+    _count("row", len(found), len(keys) - len(found))
+    missing = {}
+    rows = []
+    for key, meeting in zip(keys, meetings):
+        if key not in found:
+            found[key] = missing[key] = render_to_string(
+                template_name, {"meeting": meeting, "now": now}
+            )
+        rows.append(found[key])
+    return mark_safe("".join(rows)), missing
+
+
+def render_rows(template_name, meetings, token, now=None):
+    """
+    Rendered rows for ``meetings``, reusing cached fragments. With ``now``
+    the row shows a status badge, which becomes part of the key.
+    """
+    cache = get_cache()
+    keys = _row_keys(template_name, meetings, token, now)
+    html, missing = _fill_rows(template_name, meetings, keys, cache.get_many(keys), now)
+    if missing:
+        cache.set_many(missing)
+    return html
+
+
+async def arender_rows(template_name, meetings, token, now=None):
+    """``render_rows`` for async views."""
+    cache = get_cache()
+    keys = _row_keys(template_name, meetings, token, now)
+    html, missing = _fill_rows(template_name, meetings, keys, await cache.aget_many(keys), now)
+    if missing:
+        await cache.aset_many(missing)
+    return html
@@ -0,0 +1,226 @@
+"""
+Live meeting events, pushed to browsers as Server-Sent Events.
+
+``hub`` is a process-wide publish/subscribe hub. The Meeting signals in
+``meetings.signals`` publish one small event per booking, edit or delete once
+the writing transaction commits::
+
+    {"type": "booked" | "updated" | "deleted", "meeting": 7, "room": 2,
+     "previous_room": 1, "title": "...", "start": "...", "end": "...",
+     "series_end": "...", "recurring": false}
+
+(``previous_room`` only when an edit moved the meeting). Clients apply the
+delta to what they show instead of re-fetching a list.
+
+Each subscriber is an ``asyncio.Queue`` on the event loop serving its
+stream, so an idle connection is one suspended coroutine rather than a
+thread. Subscribers are indexed by room, so publishing touches only the
+streams that asked for that room (or for every room). Publishing is
+thread-safe and never blocks the writer: events are handed to each
+subscriber's loop with ``call_soon_threadsafe``, and a subscriber whose queue
+is full gets a single ``resync`` event instead. The last
+``LIVE_EVENTS_BUFFER`` events are kept so a reconnecting ``EventSource``
+(``Last-Event-ID``) receives what it missed; a new stream starts with the
+hub's current id for that reason, before any event arrives.
+
+Like the availability index, the hub only sees writes made by its own
+process; under several workers a stream reports its own worker's writes.
+"""
+import asyncio
+import json
+import threading
+from collections import deque
+
+from django.conf import settings
+
+ALL_ROOMS = None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def meeting_event(kind, meeting, previous_room=None):
+    """The delta published for ``meeting``; ``kind`` is booked, updated or deleted."""
+    event = {
+        "type": kind,
+        "meeting": meeting.pk,
+        "room": meeting.room_id,
+        "title": meeting.title,
+        "start": meeting.start_time.isoformat(),
+        "end": meeting.end_time.isoformat(),
+        "series_end": (meeting.series_end or meeting.end_time).isoformat(),
+        "recurring": bool(meeting.recurrence),
+    }
+    if previous_room is not None and previous_room != meeting.room_id:
+        event["previous_room"] = previous_room
+    return event
+
+
+def _rooms_of(event):
+    rooms = {event["room"]}
+    if "previous_room" in event:
+        rooms.add(event["previous_room"])
+    return rooms
+
+
+class Subscription:
+    """One open stream: a bounded queue living on the stream's event loop."""
+
+    def __init__(self, rooms, loop, maxsize):
+        self.rooms = frozenset(rooms) if rooms else ALL_ROOMS
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+        # The hub's last event id when the subscription started.
+        self.position = 0
+
+    def wants(self, event):
+        return self.rooms is ALL_ROOMS or bool(self.rooms & _rooms_of(event))
+
+    def deliver(self, event):
+        # Runs on self.loop.
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop what is queued and ask for a refetch.
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"type": "resync"})
+
+    async def get(self, timeout):
+        """The next event, or None after ``timeout`` seconds without one."""
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event["type"] == "resync":
+            self.overflowed = False
+        return event
+
+    def get_nowait(self):
+        try:
+            return self.queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+
+class LiveHub:
+    """Process-wide publish/subscribe hub. Use the module-level ``hub``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._recent = deque(maxlen=_setting("LIVE_EVENTS_BUFFER", 1000))
+        self._last_id = 0
+
+    def publish(self, event):
+        """Number ``event`` and hand it to every interested subscriber."""
+        with self._lock:
+            self._last_id += 1
+            event = {"id": self._last_id, **event}
+            self._recent.append(event)
+            targets = set(self._subscribers.get(ALL_ROOMS, ()))
+            for room in _rooms_of(event):
+                targets.update(self._subscribers.get(room, ()))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The stream's loop has closed; it unsubscribes on its way out.
+                pass
+        return event
+
+    def subscribe(self, rooms=None, last_event_id=None):
+        """
+        Register a stream for ``rooms`` (None for all) on the running loop.
+        Buffered events after ``last_event_id`` are queued first, or a
+        ``resync`` if some of them have already left the buffer.
+        """
+        subscription = Subscription(
+            rooms, asyncio.get_running_loop(), _setting("LIVE_EVENTS_QUEUE", 100)
+        )
+        with self._lock:
+            subscription.position = self._last_id
+            for room in subscription.rooms or [ALL_ROOMS]:
+                self._subscribers.setdefault(room, set()).add(subscription)
+            if last_event_id is not None:
+                oldest = self._recent[0]["id"] if self._recent else self._last_id + 1
+                if last_event_id < oldest - 1 or last_event_id > self._last_id:
+                    missed = [{"type": "resync"}]
+                else:
+                    missed = [
+                        event for event in self._recent
+                        if event["id"] > last_event_id and subscription.wants(event)
+                    ]
+                for event in missed:
+                    subscription.deliver(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for room in subscription.rooms or [ALL_ROOMS]:
+                subscribers = self._subscribers.get(room)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[room]
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(set().union(*self._subscribers.values()))
+
+    def clear(self):
+        with self._lock:
+            self._subscribers.clear()
+            self._recent.clear()
+            self._last_id = 0
+
+
+hub = LiveHub()
+
+
+# ---------- Server-Sent Events ----------
+def format_event(event):
+    """One SSE message; ``resync`` carries no id so the client's position is kept."""
+    lines = []
+    if "id" in event:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps({k: v for k, v in event.items() if k != 'type'})}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def stream(rooms=None, last_event_id=None, *, once=False):
+    """
+    SSE text for a subscriber until ``LIVE_STREAM_MAX_AGE`` seconds have
+    passed (the browser reconnects with ``Last-Event-ID``). A comment is sent
+    every ``LIVE_HEARTBEAT`` idle seconds so proxies keep the connection open.
+    With ``once`` it sends only the events already waiting and ends without
+    blocking: polling every ``LIVE_RETRY_MS``, for servers that cannot hold
+    streams. Without ``last_event_id`` it first sends the current id, so the
+    reconnect resumes from there.
+    """
+    heartbeat = _setting("LIVE_HEARTBEAT", 15)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + _setting("LIVE_STREAM_MAX_AGE", 300)
+    subscription = hub.subscribe(rooms, last_event_id)
+    try:
+        yield f"retry: {_setting('LIVE_RETRY_MS', 3000)}\n\n"
+        if last_event_id is None:
+            yield f"id: {subscription.position}\n\n"
+        if once:
+            while (event := subscription.get_nowait()) is not None:
+                yield format_event(event)
+            return
+        while loop.time() < deadline:
+            event = await subscription.get(min(heartbeat, max(deadline - loop.time(), 0)))
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        hub.unsubscribe(subscription)
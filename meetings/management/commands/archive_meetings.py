@@ -0,0 +1,81 @@
+import time
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from meetings import archive
+from meetings.models import ArchivedMeeting
+
+
+class Command(BaseCommand):
+    help = (
+        "Move meetings whose last occurrence ended long ago to the archive table, "
+        "or move archived meetings back with --restore (see meetings.archive)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int,
+                            help="Archive series that ended more than this many days ago "
+                                 f"(default: MEETING_ARCHIVE_AFTER_DAYS, {archive.archive_after().days}).")
+        parser.add_argument("--batch-size", type=int,
+                            help=f"Meetings moved per transaction (default: {archive.batch_size()}).")
+        parser.add_argument("--limit", type=int, help="Stop after this many meetings.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the meetings that would move.")
+        parser.add_argument("--restore", action="store_true", help="Move archived meetings back instead.")
+        parser.add_argument("--id", type=int, action="append", dest="ids",
+                            help="With --restore: only this meeting id (repeatable).")
+        parser.add_argument("--organizer", help="With --restore: only meetings organised by this username.")
+        parser.add_argument("--archived-since", type=datetime.fromisoformat,
+                            help="With --restore: only meetings archived at or after this time, "
+                                 "to undo a run (ISO 8601).")
+
+    def handle(self, *args, **options):
+        if options["restore"]:
+            return self._restore(options)
+        if options["ids"] or options["organizer"] or options["archived_since"]:
+            raise CommandError("--id, --organizer and --archived-since only apply with --restore.")
+        if options["days"] is not None and options["days"] < 0:
+            raise CommandError("--days cannot be negative.")
+
+        now = timezone.now()
+        before = (
+            archive.archive_cutoff(now) if options["days"] is None
+            else now - timedelta(days=options["days"])
+        )
+        if options["dry_run"]:
+            count = archive.archivable(before).count()
+            self.stdout.write(f"Would archive {count} meetings that ended before {before:%Y-%m-%d %H:%M}.")
+            return
+
+        began = time.perf_counter()
+        count = archive.archive(before, options["batch_size"], options["limit"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {count} meetings that ended before {before:%Y-%m-%d %H:%M} "
+            f"({time.perf_counter() - began:.1f}s)."
+        ))
+
+    def _restore(self, options):
+        qs = ArchivedMeeting.objects.all()
+        if options["ids"]:
+            qs = qs.filter(pk__in=options["ids"])
+        if options["organizer"]:
+            try:
+                qs = qs.filter(organizer=User.objects.get(username=options["organizer"]))
+            except User.DoesNotExist:
+                raise CommandError(f"No user named {options['organizer']!r}.")
+        if options["archived_since"]:
+            since = options["archived_since"]
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+            qs = qs.filter(archived_at__gte=since)
+        if options["dry_run"]:
+            self.stdout.write(f"Would restore {qs.count()} meetings.")
+            return
+
+        began = time.perf_counter()
+        count = archive.restore(qs, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Restored {count} meetings ({time.perf_counter() - began:.1f}s)."
+        ))
@@ -0,0 +1,163 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections
+
+from meetings.models import Meeting, MeetingRoom
+from meetings.services import book_meeting
+
+MODES = {
+    "sqlite": {"SQLITE_TUNED": "0"},
+    "sqlite-tuned": {"SQLITE_TUNED": "1"},
+    "postgres": {"DB_POOL": "0"},
+    "postgres-pool": {"DB_POOL": "1"},
+}
+ROOM_NAME = "Write benchmark"
+# Far enough ahead that benchmark bookings never meet real ones.
+FIRST_SLOT = datetime(2090, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure booking write throughput with concurrent worker processes for each "
+        "database mode. SQLite modes use a temporary file; PostgreSQL modes need "
+        "--postgres-url pointing at a scratch database (it is migrated and written to)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modes", default="sqlite,sqlite-tuned",
+            help=f"Comma-separated modes to run, from {', '.join(MODES)} (default: sqlite,sqlite-tuned).",
+        )
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent processes (default: 8).")
+        parser.add_argument("--writes", type=int, default=100, help="Bookings per worker (default: 100).")
+        parser.add_argument("--postgres-url", default=os.environ.get("BENCHMARK_DATABASE_URL", ""),
+                            help="postgres:// URL for the PostgreSQL modes (or BENCHMARK_DATABASE_URL).")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+        # Internal: the per-mode steps, run in child processes with that mode's environment.
+        parser.add_argument("--prepare", action="store_true", help="(internal)")
+        parser.add_argument("--worker", type=int, help="(internal)")
+        parser.add_argument("--room", type=int, help="(internal)")
+        parser.add_argument("--user", type=int, help="(internal)")
+        parser.add_argument("--start-at", type=float, help="(internal)")
+
+    def handle(self, *args, **options):
+        if options["prepare"]:
+            return self.prepare()
+        if options["worker"] is not None:
+            return self.work(options)
+
+        modes = [mode.strip() for mode in options["modes"].split(",") if mode.strip()]
+        unknown = set(modes) - set(MODES)
+        if unknown:
+            raise CommandError(f"Unknown modes: {', '.join(sorted(unknown))}.")
+        results = []
+        for mode in modes:
+            if mode.startswith("postgres") and not options["postgres_url"]:
+                self.stderr.write(f"Skipping {mode}: no --postgres-url given.")
+                continue
+            with tempfile.TemporaryDirectory() as tmp:
+                results.append(self.run_mode(mode, self.mode_env(mode, tmp, options), options))
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for row in results:
+            self.stdout.write(
+                f"{row['mode']:>14}: {row['writes_per_second']:8.1f} writes/s  "
+                f"p50 {row['p50_ms']:7.1f} ms  p95 {row['p95_ms']:7.1f} ms  "
+                f"{row['errors']} errors ({row['workers']} workers x {row['writes_per_worker']})"
+            )
+
+    # ---------- orchestration ----------
+    def mode_env(self, mode, tmp, options):
+        env = {
+            key: value for key, value in os.environ.items()
+            if key not in ("DATABASE_URL", "POSTGRES_DB")
+        }
+        env.update(MODES[mode])
+        if mode.startswith("postgres"):
+            env["DATABASE_URL"] = options["postgres_url"]
+        else:
+            env["SQLITE_PATH"] = os.path.join(tmp, "benchmark.sqlite3")
+        return env
+
+    def manage(self, *args):
+        return [sys.executable, str(settings.BASE_DIR / "manage.py"), *args]
+
+    def run_mode(self, mode, env, options):
+        subprocess.run(self.manage("migrate", "-v0"), env=env, check=True)
+        prepared = json.loads(
+            subprocess.run(self.manage("benchmark_db_writes", "--prepare"), env=env, check=True,
+                           capture_output=True, text=True).stdout
+        )
+        # Every worker starts at the same instant, after Django has loaded.
+        start_at = time.time() + 2 + options["workers"] * 0.1
+        workers = [
+            subprocess.Popen(
+                self.manage(
+                    "benchmark_db_writes", "--worker", str(n), "--workers", str(options["workers"]),
+                    "--writes", str(options["writes"]), "--room", str(prepared["room"]),
+                    "--user", str(prepared["user"]), "--start-at", str(start_at),
+                ),
+                env=env, stdout=subprocess.PIPE, text=True,
+            )
+            for n in range(options["workers"])
+        ]
+        reports = [json.loads(worker.communicate()[0]) for worker in workers]
+
+        latencies = sorted(ms for report in reports for ms in report["latencies_ms"])
+        written = sum(report["written"] for report in reports)
+        elapsed = max(report["finished_at"] for report in reports) - start_at
+        return {
+            "mode": mode,
+            "workers": options["workers"],
+            "writes_per_worker": options["writes"],
+            "written": written,
+            "errors": sum(report["errors"] for report in reports),
+            "seconds": round(elapsed, 3),
+            "writes_per_second": round(written / elapsed, 1) if elapsed > 0 else 0.0,
+            "p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+            "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2) if latencies else 0.0,
+        }
+
+    # ---------- child processes ----------
+    def prepare(self):
+        MeetingRoom.objects.filter(name=ROOM_NAME).delete()
+        room = MeetingRoom.objects.create(name=ROOM_NAME, capacity=10)
+        user, _ = User.objects.get_or_create(username="write-benchmark")
+        self.stdout.write(json.dumps({"room": room.pk, "user": user.pk}))
+
+    def work(self, options):
+        worker, workers = options["worker"], options["workers"]
+        latencies, errors = [], 0
+        time.sleep(max(0.0, options["start_at"] - time.time()))
+        for n in range(options["writes"]):
+            # Interleaved slots: every booking succeeds unless the database refuses it.
+            start = FIRST_SLOT + timedelta(hours=n * workers + worker)
+            meeting = Meeting(
+                title=f"Benchmark {worker}/{n}", organizer_id=options["user"],
+                room_id=options["room"], start_time=start, end_time=start + timedelta(minutes=30),
+            )
+            began = time.perf_counter()
+            try:
+                book_meeting(meeting)
+                latencies.append((time.perf_counter() - began) * 1000)
+            except OperationalError:
+                errors += 1
+            finally:
+                # What the end of a request does: keep or release the connection.
+                close_old_connections()
+        self.stdout.write(json.dumps({
+            "written": len(latencies), "errors": errors,
+            "latencies_ms": latencies, "finished_at": time.time(),
+        }))
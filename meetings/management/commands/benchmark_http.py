@@ -0,0 +1,207 @@
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from meetings.models import Meeting, MeetingRoom
+
+SERVERS = {
+    # Same number of processes for both; WSGI gets threads, ASGI one event loop each.
+    "wsgi": lambda port, options: [
+        sys.executable, "-m", "gunicorn", "meeting_manager.wsgi:application",
+        "--bind", f"127.0.0.1:{port}", "--workers", str(options["processes"]),
+        "--threads", str(options["threads"]), "--log-level", "warning",
+    ],
+    "asgi": lambda port, options: [
+        sys.executable, "-m", "uvicorn", "meeting_manager.asgi:application",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(options["processes"]),
+        "--log-level", "warning", "--no-access-log",
+    ],
+}
+DEFAULT_PATHS = "/,/meetings/,/all_meetings/,/minutes_repository/,/meetings/{meeting}/"
+USERNAME = "http-benchmark"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/s and latency percentiles of the read views served under "
+        "WSGI (gunicorn) and ASGI (uvicorn), against a temporary seeded SQLite database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--servers", default="wsgi,asgi",
+            help=f"Comma-separated servers to run, from {', '.join(SERVERS)} (default: wsgi,asgi).",
+        )
+        parser.add_argument(
+            "--paths", default=DEFAULT_PATHS,
+            help="Comma-separated paths requested round-robin; {meeting} is a seeded meeting id.",
+        )
+        parser.add_argument("--concurrency", type=int, default=32, help="Concurrent clients (default: 32).")
+        parser.add_argument("--requests", type=int, default=2000, help="Measured requests per server (default: 2000).")
+        parser.add_argument("--warmup", type=int, default=100, help="Unmeasured requests first (default: 100).")
+        parser.add_argument("--processes", type=int, default=2, help="Server processes (default: 2).")
+        parser.add_argument("--threads", type=int, default=8, help="Threads per WSGI process (default: 8).")
+        parser.add_argument("--meetings", type=int, default=500, help="Meetings to seed (default: 500).")
+        parser.add_argument("--json", action="store_true", help="Print results as JSON.")
+        # Internal: seeding, run in a child process against the temporary database.
+        parser.add_argument("--prepare", action="store_true", help="(internal)")
+
+    def handle(self, *args, **options):
+        if options["prepare"]:
+            return self.prepare(options)
+
+        servers = [server.strip() for server in options["servers"].split(",") if server.strip()]
+        unknown = set(servers) - set(SERVERS)
+        if unknown:
+            raise CommandError(f"Unknown servers: {', '.join(sorted(unknown))}.")
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {key: value for key, value in os.environ.items() if key not in ("DATABASE_URL", "POSTGRES_DB")}
+            env["SQLITE_PATH"] = os.path.join(tmp, "benchmark.sqlite3")
+            subprocess.run(self.manage("migrate", "-v0"), env=env, check=True)
+            prepared = json.loads(
+                subprocess.run(
+                    self.manage("benchmark_http", "--prepare", "--meetings", str(options["meetings"])),
+                    env=env, check=True, capture_output=True, text=True,
+                ).stdout
+            )
+            paths = [
+                path.strip().format(meeting=prepared["meeting"])
+                for path in options["paths"].split(",") if path.strip()
+            ]
+            results = [self.run_server(server, env, prepared["session"], paths, options) for server in servers]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for row in results:
+            self.stdout.write(
+                f"{row['server']:>5}: {row['requests_per_second']:8.1f} req/s  "
+                f"p50 {row['p50_ms']:7.1f} ms  p99 {row['p99_ms']:7.1f} ms  "
+                f"{row['errors']} errors ({row['concurrency']} clients, {row['requests']} requests)"
+            )
+            for path, stats in row["paths"].items():
+                self.stdout.write(f"{'':>7}{path:<28} p50 {stats['p50_ms']:7.1f} ms  p99 {stats['p99_ms']:7.1f} ms")
+
+    def manage(self, *args):
+        return [sys.executable, str(settings.BASE_DIR / "manage.py"), *args]
+
+    # ---------- servers ----------
+    def run_server(self, server, env, session, paths, options):
+        port = _free_port()
+        process = subprocess.Popen(SERVERS[server](port, options), env=env, cwd=settings.BASE_DIR)
+        try:
+            self.wait_until_up(port, process)
+            cookie = f"{settings.SESSION_COOKIE_NAME}={session}"
+            self.load(port, cookie, paths, options["warmup"], options["concurrency"])
+            began = time.perf_counter()
+            samples = self.load(port, cookie, paths, options["requests"], options["concurrency"])
+            elapsed = time.perf_counter() - began
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+        ok = [(path, ms) for path, ms, status in samples if status == 200]
+        latencies = sorted(ms for _, ms in ok)
+        by_path = {}
+        for path in paths:
+            path_latencies = sorted(ms for p, ms in ok if p == path)
+            if path_latencies:
+                by_path[path] = {
+                    "p50_ms": round(statistics.median(path_latencies), 2),
+                    "p99_ms": round(_percentile(path_latencies, 0.99), 2),
+                }
+        return {
+            "server": server,
+            "concurrency": options["concurrency"],
+            "processes": options["processes"],
+            "requests": len(samples),
+            "errors": len(samples) - len(ok),
+            "seconds": round(elapsed, 3),
+            "requests_per_second": round(len(ok) / elapsed, 1) if elapsed > 0 else 0.0,
+            "p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+            "p99_ms": round(_percentile(latencies, 0.99), 2) if latencies else 0.0,
+            "paths": by_path,
+        }
+
+    def wait_until_up(self, port, process, timeout=30):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"Server exited with status {process.returncode}.")
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                return
+            except OSError:
+                time.sleep(0.2)
+        raise CommandError(f"Server did not listen on port {port} within {timeout}s.")
+
+    # ---------- load ----------
+    def load(self, port, cookie, paths, total, concurrency):
+        """(path, latency ms, status) for ``total`` GETs issued by ``concurrency`` clients."""
+        def fetch(n):
+            path = paths[n % len(paths)]
+            began = time.perf_counter()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            try:
+                conn.request("GET", path, headers={"Cookie": cookie, "Host": "localhost"})
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except OSError:
+                status = 0
+            finally:
+                conn.close()
+            return path, (time.perf_counter() - began) * 1000, status
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(fetch, range(total)))
+
+    # ---------- child process ----------
+    def prepare(self, options):
+        user, _ = User.objects.get_or_create(username=USERNAME)
+        others = [User.objects.get_or_create(username=f"{USERNAME}-{n}")[0] for n in range(4)]
+        rooms = [MeetingRoom.objects.create(name=f"Benchmark room {n}", capacity=10) for n in range(5)]
+        now = timezone.now()
+        meetings = []
+        for n in range(options["meetings"]):
+            start = now + timedelta(hours=n - options["meetings"] // 2)
+            meetings.append(Meeting(
+                title=f"Benchmark meeting {n}", organizer=(user if n % 2 else others[n % 4]),
+                room=rooms[n % len(rooms)], start_time=start, end_time=start + timedelta(minutes=45),
+                series_end=start + timedelta(minutes=45),
+                minutes_file=f"minutes/benchmark-{n}.pdf" if n % 3 == 0 else "",
+            ))
+        meetings = Meeting.objects.bulk_create(meetings)
+
+        # A logged-in session for the load generator.
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        self.stdout.write(json.dumps({"session": session.session_key, "meeting": meetings[0].pk}))
@@ -0,0 +1,52 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from meetings.archive import history
+from meetings.exports import CHUNK_SIZE, FORMATS, stream_export
+from meetings.filters import filter_meetings
+
+
+class Command(BaseCommand):
+    help = "Stream meetings, archived ones included, to a file or stdout as CSV, NDJSON or ICS."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument("--output", "-o", help="File to write (default: stdout).")
+        parser.add_argument("--q", help="Full-text search query.")
+        parser.add_argument("--status", choices=["all", "upcoming", "ongoing", "ended"])
+        parser.add_argument("--date-from", help="First start date (YYYY-MM-DD).")
+        parser.add_argument("--date-to", help="Last start date (YYYY-MM-DD).")
+        parser.add_argument("--organizer", help="Only meetings organised by this username.")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        organizer = None
+        if options["organizer"]:
+            try:
+                organizer = User.objects.get(username=options["organizer"])
+            except User.DoesNotExist:
+                raise CommandError(f"No user named {options['organizer']!r}.")
+        params = {
+            "q": options["q"],
+            "status": options["status"],
+            "date_from": options["date_from"],
+            "date_to": options["date_to"],
+        }
+        now = timezone.localtime()
+
+        def build(qs):
+            if organizer is not None:
+                qs = qs.filter(organizer=organizer)
+            return filter_meetings(qs, params, now)
+
+        qs = history(build)
+
+        chunks = stream_export(qs, options["format"], options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
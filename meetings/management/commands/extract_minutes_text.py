@@ -0,0 +1,22 @@
+import os
+
+from django.core.management.base import BaseCommand
+
+from meetings.extraction import extract_pending
+
+
+class Command(BaseCommand):
+    help = "Extract the text of stored minutes files into the search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes", type=int, default=os.cpu_count() or 1,
+            help="Worker processes parsing files (default: CPU count).",
+        )
+        parser.add_argument(
+            "--all", action="store_true", help="Re-extract files that were already processed."
+        )
+
+    def handle(self, *args, **options):
+        count = extract_pending(processes=options["processes"], force=options["all"])
+        self.stdout.write(self.style.SUCCESS(f"Extracted text from {count} files."))
@@ -0,0 +1,75 @@
+import json
+import sys
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.imports import BATCH_SIZE, READERS, ImportFormatError, import_meetings
+
+
+class Command(BaseCommand):
+    help = (
+        "Import meetings from a CSV or iCalendar file. Rows clashing with existing "
+        "bookings or with earlier rows are skipped and reported (see meetings.imports)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin.")
+        parser.add_argument("--format", choices=sorted(READERS), help="Input format (default: from the file extension).")
+        parser.add_argument("--organizer", help="Username for rows that name no organizer.")
+        parser.add_argument("--dry-run", action="store_true", help="Check every row but write nothing.")
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                            help=f"Rows read, checked and inserted at a time (default: {BATCH_SIZE}).")
+        parser.add_argument("--report", help="Write the per-row JSON report to this file.")
+
+    def handle(self, *args, **options):
+        path, fmt = options["path"], options["format"]
+        if fmt is None:
+            fmt = path.rsplit(".", 1)[-1].lower() if "." in path else None
+            if fmt not in READERS:
+                raise CommandError("Cannot tell the format from the file name; pass --format.")
+        organizer = None
+        if options["organizer"]:
+            try:
+                organizer = User.objects.get(username=options["organizer"])
+            except User.DoesNotExist:
+                raise CommandError(f"No user named {options['organizer']!r}.")
+
+        began = time.perf_counter()
+        try:
+            if path == "-":
+                report = self._import(sys.stdin, fmt, organizer, options)
+            else:
+                with open(path, encoding="utf-8-sig", newline="") as handle:
+                    report = self._import(handle, fmt, organizer, options)
+        except (OSError, UnicodeDecodeError, ImportFormatError) as exc:
+            raise CommandError(str(exc))
+        elapsed = time.perf_counter() - began
+
+        if options["report"]:
+            with open(options["report"], "w") as handle:
+                json.dump(report, handle, indent=2)
+        problems = [row for row in report["rows"] if row["status"] != "created"]
+        shown = problems if options["verbosity"] > 1 else problems[:20]
+        for row in shown:
+            if row["status"] == "invalid":
+                detail = " ".join(row["errors"])
+            else:
+                detail = "clashes with " + ", ".join(
+                    [f"meeting {pk}" for pk in row["meetings"]] + [f"row {n}" for n in row["rows"]]
+                )
+            self.stdout.write(f"  row {row['row']}: {row['status']}: {detail}")
+        if len(shown) < len(problems):
+            self.stdout.write(f"  ... and {len(problems) - len(shown)} more (see --report).")
+        verb = "Would create" if report["dry_run"] else "Created"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {report['created']} meetings; {report['conflicts']} conflicts, "
+            f"{report['invalid']} invalid rows ({elapsed:.1f}s)."
+        ))
+
+    def _import(self, lines, fmt, organizer, options):
+        return import_meetings(
+            lines, fmt, organizer=organizer, dry_run=options["dry_run"],
+            batch_size=options["batch_size"],
+        )
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from meetings.uploads import purge_stale_uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete idle minutes upload sessions: unfinished ones with their staged bytes, "
+        "finished ones with any stored file no meeting refers to."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hours", type=int, default=24, help="Idle hours before an upload is stale (default: 24)."
+        )
+
+    def handle(self, *args, **options):
+        count = purge_stale_uploads(timedelta(hours=options["hours"]))
+        self.stdout.write(self.style.SUCCESS(f"Purged {count} stale uploads."))
@@ -0,0 +1,27 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from meetings.analytics import rebuild
+from meetings.models import RoomDailyUsage
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-room daily usage rollup read by the utilisation dashboard."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="first_day", type=date.fromisoformat,
+                            help="First local date to rebuild (default: each room's first meeting).")
+        parser.add_argument("--to", dest="last_day", type=date.fromisoformat,
+                            help="Last local date to rebuild (default: each room's last meeting).")
+        parser.add_argument("--room", type=int, action="append", dest="rooms",
+                            help="Only this room id (repeatable).")
+        parser.add_argument("--if-empty", action="store_true",
+                            help="Do nothing if the rollup already has rows (for deploy scripts).")
+
+    def handle(self, *args, **options):
+        if options["if_empty"] and RoomDailyUsage.objects.exists():
+            self.stdout.write("Room usage rollup already populated; skipping.")
+            return
+        count = rebuild(options["first_day"], options["last_day"], options["rooms"])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} room-day rows."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from meetings.models import Meeting
+from meetings.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Drop and refill the meeting full-text search index."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database", default="default", help="Database alias to rebuild (default: default)."
+        )
+
+    def handle(self, *args, **options):
+        backend = get_backend(options["database"])
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {Meeting.objects.using(options['database']).count()} meetings "
+                f"with {type(backend).__name__}."
+            )
+        )
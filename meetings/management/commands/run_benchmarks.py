@@ -0,0 +1,67 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.benchmarks import CASES, Skip, compare, run_suite
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency percentiles and query counts of the main pages, booking "
+        "conflict checks and the API list, and write them as JSON for comparing runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cases", help=f"Comma-separated cases (default: all of {', '.join(CASES)}).")
+        parser.add_argument("--iterations", type=int, default=20, help="Timed runs per case (default: 20).")
+        parser.add_argument("--warmup", type=int, default=2, help="Untimed runs per case first (default: 2).")
+        parser.add_argument("--warm", action="store_true", help="Keep caches between runs.")
+        parser.add_argument("--user", help="Username to run as (default: the organizer with most meetings).")
+        parser.add_argument("--output", help="Write the JSON result to this file.")
+        parser.add_argument("--compare", help="A previous JSON result to compare against.")
+        parser.add_argument("--threshold", type=float, default=0.2,
+                            help="Median slowdown counted as a regression (default: 0.2 = 20%%).")
+        parser.add_argument("--fail-on-regression", action="store_true",
+                            help="Exit with an error if --compare finds a regression.")
+        parser.add_argument("--json", action="store_true", help="Print the JSON result.")
+
+    def handle(self, *args, **options):
+        names = [name.strip() for name in (options["cases"] or "").split(",") if name.strip()]
+        try:
+            result = run_suite(names or None, options["iterations"], options["warmup"],
+                               options["warm"], options["user"])
+        except (ValueError, Skip) as exc:
+            raise CommandError(str(exc))
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(result, fh, indent=2)
+        if options["json"]:
+            self.stdout.write(json.dumps(result, indent=2))
+        else:
+            rows = result["meta"]["rows"]
+            self.stdout.write(
+                f"{rows['meetings']} meetings, {rows['rooms']} rooms, {rows['users']} users "
+                f"on {result['meta']['database']} as {result['meta']['user']}"
+            )
+            for name, case in result["cases"].items():
+                if case["status"] != "ok":
+                    self.stdout.write(f"{name:>22}: skipped ({case['reason']})")
+                    continue
+                self.stdout.write(
+                    f"{name:>22}: p50 {case['p50_ms']:8.2f} ms  p95 {case['p95_ms']:8.2f} ms  "
+                    f"p99 {case['p99_ms']:8.2f} ms  {case['queries']:3d} queries"
+                )
+
+        if options["compare"]:
+            with open(options["compare"]) as fh:
+                rows = compare(json.load(fh), result, options["threshold"])
+            regressed = [row for row in rows if row["regressed"]]
+            for row in rows:
+                self.stdout.write(
+                    f"{row['case']:>22}: p50 {row['baseline_p50_ms']:8.2f} -> {row['p50_ms']:8.2f} ms "
+                    f"({row['p50_change']:+.0%})  queries {row['baseline_queries']} -> {row['queries']}"
+                    + ("  REGRESSED" if row["regressed"] else "")
+                )
+            if regressed and options["fail_on_regression"]:
+                raise CommandError(f"{len(regressed)} case(s) regressed.")
@@ -0,0 +1,54 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from meetings.queue import Worker, task_metrics
+
+
+class Command(BaseCommand):
+    help = "Run background tasks from the database queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int, default=4,
+            help="Tasks run at once (default: 4; 0 runs them in this thread).",
+        )
+        parser.add_argument(
+            "--processes", action="store_true", help="Use a process pool instead of threads."
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=10, help="Tasks claimed per query (default: 10)."
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=1.0,
+            help="Seconds to wait when the queue is empty (default: 1).",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit when no tasks are due instead of polling."
+        )
+        parser.add_argument(
+            "--stats", action="store_true", help="Print per-task counts and timings, then exit."
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            for row in task_metrics():
+                self.stdout.write(
+                    f"{row['name']}: {row['done']} done, {row['failed']} failed, "
+                    f"{row['queued']} queued, {row['running']} running; "
+                    f"avg {row['avg_ms'] or 0:.1f} ms, max {row['max_ms'] or 0:.1f} ms"
+                )
+            return
+
+        worker = Worker(
+            concurrency=options["concurrency"],
+            mode="process" if options["processes"] else "thread",
+            batch_size=options["batch_size"],
+            poll_interval=options["poll_interval"],
+        )
+        # Finish the current batch on Ctrl-C / SIGTERM, then exit.
+        signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+        signal.signal(signal.SIGINT, lambda *_: worker.stop())
+        self.stdout.write(f"Worker {worker.name} started.")
+        processed = worker.run(once=options["once"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} tasks."))
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meetings.analytics import rebuild
+from meetings.search import get_backend
+from meetings.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate users, rooms and non-overlapping meetings for load tests and "
+        "benchmarks (see meetings.seeding). Defaults to a million meetings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=2000, help="Users to create (default: 2000).")
+        parser.add_argument("--rooms", type=int, default=2000, help="Rooms for one-off meetings (default: 2000).")
+        parser.add_argument("--meetings", type=int, default=1_000_000, help="Meetings in total (default: 1000000).")
+        parser.add_argument("--series", type=int, help="How many of them are weekly series (default: 1%%).")
+        parser.add_argument("--span-days", type=int, default=365, help="Days the meetings spread over (default: 365).")
+        parser.add_argument("--minutes-share", type=float, default=0.1,
+                            help="Share of past meetings with a minutes file (default: 0.1).")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows per bulk_create (default: 5000).")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for repeatable data (default: 0).")
+        parser.add_argument("--prefix", default="seed", help="Prefix of generated user and room names (default: seed).")
+        parser.add_argument("--index", action="store_true", help="Rebuild the full-text search index afterwards.")
+        parser.add_argument("--rollup", action="store_true", help="Rebuild the room usage rollup afterwards.")
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["rooms"] < 1:
+            raise CommandError("--users and --rooms must be at least 1.")
+        seeder = Seeder(
+            options["users"], options["rooms"], options["meetings"],
+            series=options["series"], span_days=options["span_days"],
+            minutes_share=options["minutes_share"], batch_size=options["batch_size"],
+            seed=options["seed"], prefix=options["prefix"],
+            progress=lambda message: self.stdout.write(f"  {message}") if options["verbosity"] > 1 else None,
+        )
+        if seeder.already_seeded():
+            raise CommandError(f"Data with prefix {options['prefix']!r} exists; pass another --prefix.")
+
+        began = time.perf_counter()
+        counts = seeder.run()
+        elapsed = time.perf_counter() - began
+        self.stdout.write(
+            f"Created {counts['meetings']} meetings, {counts['rooms']} rooms and "
+            f"{counts['users']} users in {elapsed:.1f}s ({counts['meetings'] / max(elapsed, 1e-9):.0f} meetings/s)."
+        )
+        if options["index"]:
+            began = time.perf_counter()
+            get_backend().rebuild()
+            self.stdout.write(f"Rebuilt the search index in {time.perf_counter() - began:.1f}s.")
+        if options["rollup"]:
+            began = time.perf_counter()
+            rows = rebuild()
+            self.stdout.write(f"Wrote {rows} room-day usage rows in {time.perf_counter() - began:.1f}s.")
+        self.stdout.write(self.style.SUCCESS("Done."))
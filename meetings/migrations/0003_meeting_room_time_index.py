@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def add_overlap_constraint(apps, schema_editor):
+    """Reject overlapping bookings at the database level where supported."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.execute(
+        "ALTER TABLE meetings_meeting "
+        "ADD CONSTRAINT meetings_meeting_no_room_overlap "
+        "EXCLUDE USING gist (room_id WITH =, tstzrange(start_time, end_time) WITH &&)"
+    )
+
+
+def drop_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "ALTER TABLE meetings_meeting "
+        "DROP CONSTRAINT IF EXISTS meetings_meeting_no_room_overlap"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0002_alter_meeting_options_meeting_minutes_file"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(
+                fields=["room", "end_time", "start_time"],
+                name="meeting_room_time_idx",
+            ),
+        ),
+        migrations.RunPython(add_overlap_constraint, drop_overlap_constraint),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0003_meeting_room_time_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(
+                fields=["organizer", "end_time", "start_time"],
+                name="meeting_organizer_time_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from meetings.search import get_backend
+
+    get_backend(schema_editor.connection.alias).setup()
+
+
+def drop_search_index(apps, schema_editor):
+    from meetings.search import get_backend
+
+    get_backend(schema_editor.connection.alias).drop()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0004_meeting_organizer_time_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0005_meeting_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScopeVersion",
+            fields=[
+                (
+                    "scope",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("version", models.PositiveBigIntegerField(default=0)),
+                ("changed_at", models.DateTimeField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.2.7 on 2026-10-18 18:30
+
+import django.core.validators
+import django.db.models.deletion
+import meetings.storage
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_existing_references(apps, schema_editor):
+    """Create MinutesBlob rows for files uploaded before reference counting."""
+    Meeting = apps.get_model("meetings", "Meeting")
+    MinutesBlob = apps.get_model("meetings", "MinutesBlob")
+    rows = (
+        Meeting.objects.exclude(minutes_file__isnull=True)
+        .exclude(minutes_file="")
+        .values("minutes_file")
+        .annotate(refs=Count("id"))
+    )
+    MinutesBlob.objects.bulk_create(
+        [MinutesBlob(name=row["minutes_file"], ref_count=row["refs"]) for row in rows],
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0006_scopeversion"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MinutesBlob",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("size", models.PositiveBigIntegerField(default=0)),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="meeting",
+            name="minutes_file",
+            field=models.FileField(
+                blank=True,
+                help_text="Upload the official minutes document (PDF, DOCX, etc.).",
+                max_length=255,
+                null=True,
+                storage=meetings.storage.get_minutes_storage,
+                upload_to="meeting_minutes/",
+                validators=[
+                    django.core.validators.FileExtensionValidator(
+                        ("pdf", "doc", "docx", "txt")
+                    )
+                ],
+            ),
+        ),
+        migrations.CreateModel(
+            name="MinutesUpload",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("filename", models.CharField(max_length=255)),
+                ("size", models.PositiveBigIntegerField()),
+                ("received", models.PositiveBigIntegerField(default=0)),
+                ("stored_name", models.CharField(blank=True, max_length=255)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "meeting",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="meetings.meeting",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(count_existing_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+def rebuild_search_index(apps, schema_editor):
+    # The index gains a column for the minutes' text.
+    from meetings.search import get_backend
+
+    backend = get_backend(schema_editor.connection.alias)
+    backend.drop()
+    backend.setup()
+    backend.index(apps.get_model("meetings", "Meeting").objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0007_minutes_storage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="minutesblob",
+            name="text",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="minutesblob",
+            name="extracted_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="minutesblob",
+            name="extraction_error",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(rebuild_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+from django.db import migrations, models
+
+
+def fill_series_end(apps, schema_editor):
+    # Existing meetings are one-offs: the series ends with the meeting.
+    Meeting = apps.get_model("meetings", "Meeting")
+    Meeting.objects.using(schema_editor.connection.alias).update(series_end=models.F("end_time"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0009_task"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meeting",
+            name="recurrence",
+            field=models.CharField(
+                blank=True,
+                choices=[("", "Does not repeat"), ("daily", "Daily"), ("weekly", "Weekly"), ("monthly", "Monthly")],
+                default="",
+                max_length=10,
+                verbose_name="repeats",
+            ),
+        ),
+        migrations.AddField(
+            model_name="meeting",
+            name="recurrence_interval",
+            field=models.PositiveSmallIntegerField(default=1, verbose_name="every"),
+        ),
+        migrations.AddField(
+            model_name="meeting",
+            name="recurrence_count",
+            field=models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="occurrences"),
+        ),
+        migrations.AddField(
+            model_name="meeting",
+            name="recurrence_until",
+            field=models.DateField(blank=True, null=True, verbose_name="repeat until"),
+        ),
+        migrations.AddField(
+            model_name="meeting",
+            name="recurrence_exceptions",
+            field=models.JSONField(blank=True, default=list, verbose_name="skipped dates"),
+        ),
+        migrations.AddField(
+            model_name="meeting",
+            name="series_end",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_series_end, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="meeting",
+            index=models.Index(fields=["room", "series_end", "start_time"], name="meeting_room_series_idx"),
+        ),
+    ]
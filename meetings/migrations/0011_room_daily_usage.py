@@ -0,0 +1,38 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0010_meeting_recurrence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RoomDailyUsage",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("meeting_count", models.PositiveIntegerField(default=0)),
+                ("booked_seconds", models.PositiveIntegerField(default=0)),
+                ("hourly_seconds", models.JSONField(default=list)),
+                ("updated_at", models.DateTimeField()),
+                (
+                    "room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_usage",
+                        to="meetings.meetingroom",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Room daily usage",
+                "indexes": [models.Index(fields=["date"], name="room_daily_usage_date_idx")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("room", "date"), name="room_daily_usage_unique")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,107 @@
+import django.core.validators
+import django.db.models.deletion
+import meetings.storage
+from django.conf import settings
+from django.db import migrations, models
+
+
+def detach_search_index(apps, schema_editor):
+    # Archived meetings keep their search rows under the same id, so the
+    # PostgreSQL index table must no longer cascade deletes from Meeting.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "ALTER TABLE meetings_meeting_search "
+            "DROP CONSTRAINT IF EXISTS meetings_meeting_search_meeting_id_fkey"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0011_room_daily_usage"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedMeeting",
+            fields=[
+                ("title", models.CharField(max_length=200)),
+                ("description", models.TextField(blank=True, null=True)),
+                ("start_time", models.DateTimeField()),
+                ("end_time", models.DateTimeField()),
+                ("is_active", models.BooleanField(default=True)),
+                (
+                    "minutes_file",
+                    models.FileField(
+                        blank=True,
+                        help_text="Upload the official minutes document (PDF, DOCX, etc.).",
+                        max_length=255,
+                        null=True,
+                        storage=meetings.storage.get_minutes_storage,
+                        upload_to="meeting_minutes/",
+                        validators=[
+                            django.core.validators.FileExtensionValidator(("pdf", "doc", "docx", "txt"))
+                        ],
+                    ),
+                ),
+                (
+                    "recurrence",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("", "Does not repeat"),
+                            ("daily", "Daily"),
+                            ("weekly", "Weekly"),
+                            ("monthly", "Monthly"),
+                        ],
+                        default="",
+                        max_length=10,
+                        verbose_name="repeats",
+                    ),
+                ),
+                ("recurrence_interval", models.PositiveSmallIntegerField(default=1, verbose_name="every")),
+                (
+                    "recurrence_count",
+                    models.PositiveSmallIntegerField(blank=True, null=True, verbose_name="occurrences"),
+                ),
+                ("recurrence_until", models.DateField(blank=True, null=True, verbose_name="repeat until")),
+                (
+                    "recurrence_exceptions",
+                    models.JSONField(blank=True, default=list, verbose_name="skipped dates"),
+                ),
+                ("series_end", models.DateTimeField(editable=False, null=True)),
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField()),
+                (
+                    "organizer",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "room",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="meetings.meetingroom",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Archived meeting",
+                "verbose_name_plural": "Archived meetings",
+                "ordering": ["-start_time"],
+                "indexes": [
+                    models.Index(fields=["start_time", "id"], name="archived_meeting_start_idx"),
+                    models.Index(fields=["organizer", "start_time"], name="archived_meeting_org_idx"),
+                    models.Index(
+                        fields=["room", "series_end", "start_time"],
+                        name="archived_meeting_room_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(detach_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+def clear_rollup(apps, schema_editor):
+    # Existing rows have no peak; build.sh's "rebuild_room_usage --if-empty"
+    # refills the emptied table on the next deploy.
+    RoomDailyUsage = apps.get_model("meetings", "RoomDailyUsage")
+    RoomDailyUsage.objects.using(schema_editor.connection.alias).all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meetings", "0013_meeting_start_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="roomdailyusage",
+            name="peak_meetings",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="roomdailyusage",
+            name="peak_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(clear_rollup, migrations.RunPython.noop),
+    ]
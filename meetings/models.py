@@ -1,6 +1,12 @@
+import uuid
+
+from django.core.validators import FileExtensionValidator
 from django.db import models
 from django.contrib.auth.models import User
 
+from . import recurrence
+from .storage import ALLOWED_EXTENSIONS, get_minutes_storage
+
 
 class MeetingRoom(models.Model):
     """Represents a physical or virtual meeting room."""
@@ -13,8 +19,17 @@ class MeetingRoom(models.Model):
         return self.name
 
 
-class Meeting(models.Model):
-    """Stores meeting details, including uploaded minutes."""
+class MeetingQuerySet(models.QuerySet):
+    # Columns rendered by the meeting list templates.
+    LIST_FIELDS = ("id", "title", "start_time", "end_time", "room__name", "organizer__username")
+
+    def for_listing(self, *extra_fields):
+        """Join room and organizer and load only the columns list pages render."""
+        return self.select_related("room", "organizer").only(*self.LIST_FIELDS, *extra_fields)
+
+
+class AbstractMeeting(models.Model):
+    """Columns shared by current meetings and the archive (see meetings.archive)."""
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
     organizer = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -29,15 +44,221 @@ class Meeting(models.Model):
     # New field for uploaded meeting minutes (PDF, DOCX, etc.)
     minutes_file = models.FileField(
         upload_to="meeting_minutes/",
+        storage=get_minutes_storage,
+        validators=[FileExtensionValidator(ALLOWED_EXTENSIONS)],
+        max_length=255,
         blank=True,
         null=True,
         help_text="Upload the official minutes document (PDF, DOCX, etc.)."
     )
 
+    # Repeat rule; start_time/end_time are the first occurrence (see meetings.recurrence).
+    recurrence = models.CharField(
+        "repeats", max_length=10, choices=recurrence.FREQUENCY_CHOICES, blank=True, default=""
+    )
+    recurrence_interval = models.PositiveSmallIntegerField("every", default=1)
+    recurrence_count = models.PositiveSmallIntegerField("occurrences", blank=True, null=True)
+    recurrence_until = models.DateField("repeat until", blank=True, null=True)
+    recurrence_exceptions = models.JSONField("skipped dates", default=list, blank=True)
+    # End of the last occurrence; equals end_time for one-off meetings.
+    series_end = models.DateTimeField(editable=False, null=True)
+
+    objects = MeetingQuerySet.as_manager()
+
+    # True on ArchivedMeeting rows, which are read-only.
+    is_archived = False
+
     def __str__(self):
         return f"{self.title} ({self.room.name})"
 
+    @property
+    def is_recurring(self):
+        return bool(self.recurrence)
+
+    class Meta:
+        abstract = True
+
+
+class Meeting(AbstractMeeting):
+    """Stores meeting details, including uploaded minutes."""
+
+    def clean(self):
+        recurrence.validate(self)
+
+    def save(self, *args, **kwargs):
+        self.series_end = recurrence.series_end(self)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "series_end"}
+        super().save(*args, **kwargs)
+
     class Meta:
         ordering = ["-start_time"]
         verbose_name = "Meeting"
         verbose_name_plural = "Meetings"
+        indexes = [
+            # Serves the room overlap check in meetings.services.
+            models.Index(
+                fields=["room", "end_time", "start_time"],
+                name="meeting_room_time_idx",
+            ),
+            # Lets meetings.stats roll a user's counts forward without
+            # reading their ended meetings.
+            models.Index(
+                fields=["organizer", "end_time", "start_time"],
+                name="meeting_organizer_time_idx",
+            ),
+            # Series conflict checks and the availability index, which need
+            # series that began before the window.
+            models.Index(
+                fields=["room", "series_end", "start_time"],
+                name="meeting_room_series_idx",
+            ),
+            # A user's list pages and start date ranges (see meetings.filters).
+            models.Index(fields=["organizer", "start_time"], name="meeting_organizer_start_idx"),
+            # Keyset pages over all meetings and their start date ranges.
+            models.Index(fields=["start_time", "id"], name="meeting_start_idx"),
+        ]
+
+
+class ArchivedMeeting(AbstractMeeting):
+    """
+    A meeting moved out of ``Meeting`` after its last occurrence ended, under
+    its original id. Written and removed only by meetings.archive.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+
+    is_archived = True
+
+    class Meta:
+        ordering = ["-start_time"]
+        verbose_name = "Archived meeting"
+        verbose_name_plural = "Archived meetings"
+        indexes = [
+            # History listings and exports page through start_time.
+            models.Index(fields=["start_time", "id"], name="archived_meeting_start_idx"),
+            # A user's searches and "mine" exports over the archive (dashboard
+            # counts cover current meetings only).
+            models.Index(fields=["organizer", "start_time"], name="archived_meeting_org_idx"),
+            # The room usage rollup reads archived occurrences by room and day.
+            models.Index(
+                fields=["room", "series_end", "start_time"],
+                name="archived_meeting_room_idx",
+            ),
+        ]
+
+
+class ScopeVersion(models.Model):
+    """
+    Change counter for a slice of meeting data ("global", "room:3", ...).
+    Bumped by signals in the same transaction as the change and used to build
+    ETag/Last-Modified validators (see meetings.versioning).
+    """
+    scope = models.CharField(max_length=64, primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    changed_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.scope} v{self.version}"
+
+
+class MinutesBlob(models.Model):
+    """A stored minutes file and the number of meetings that use it."""
+    name = models.CharField(max_length=255, primary_key=True)
+    size = models.PositiveBigIntegerField(default=0)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Plain text of the document, filled in the background (see meetings.extraction).
+    text = models.TextField(blank=True)
+    extracted_at = models.DateTimeField(blank=True, null=True)
+    extraction_error = models.CharField(max_length=255, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class MinutesUpload(models.Model):
+    """A resumable, chunked minutes upload in progress (see meetings.uploads)."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    meeting = models.ForeignKey(Meeting, on_delete=models.CASCADE, blank=True, null=True)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    received = models.PositiveBigIntegerField(default=0)
+    stored_name = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def is_complete(self):
+        return bool(self.stored_name)
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
+
+
+class Task(models.Model):
+    """A unit of background work in the database-backed queue (see meetings.queue)."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    run_at = models.DateTimeField()
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    worker = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    duration_ms = models.FloatField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            # Dequeue: the oldest due tasks in a status.
+            models.Index(fields=["status", "run_at"], name="task_status_run_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}]"
+
+
+class RoomDailyUsage(models.Model):
+    """
+    Booked time per room and local day, with a 24-entry list of booked
+    seconds per hour and the most meetings running at once in the room that
+    day. Maintained incrementally by meetings.analytics.
+    """
+    room = models.ForeignKey(MeetingRoom, on_delete=models.CASCADE, related_name="daily_usage")
+    date = models.DateField()
+    meeting_count = models.PositiveIntegerField(default=0)
+    booked_seconds = models.PositiveIntegerField(default=0)
+    hourly_seconds = models.JSONField(default=list)
+    peak_meetings = models.PositiveIntegerField(default=0)
+    peak_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = "Room daily usage"
+        constraints = [
+            models.UniqueConstraint(fields=["room", "date"], name="room_daily_usage_unique"),
+        ]
+        indexes = [
+            # Dashboards read every room for a date range.
+            models.Index(fields=["date"], name="room_daily_usage_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.room_id} {self.date}: {self.booked_seconds}s"
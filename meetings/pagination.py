@@ -0,0 +1,309 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are addressed by an opaque cursor holding the ordering values of the
+last (or first) row shown, so every page is an index range scan
+``WHERE (start_time, id) < (...) ORDER BY ... LIMIT n`` instead of an OFFSET
+that grows with the page number. Totals are optional: ``count_mode`` is one of
+
+* ``"none"``     - no count query,
+* ``"capped"``   - count at most ``count_cap`` rows ("1000+"),
+* ``"estimate"`` - the planner's row estimate on PostgreSQL, capped elsewhere
+  (exact for sources that are not a QuerySet),
+* ``"exact"``    - a full COUNT(*).
+"""
+import base64
+import binascii
+import json
+import math
+from dataclasses import dataclass
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+
+def default_page_size():
+    return getattr(settings, "MEETING_PAGE_SIZE", 10)
+
+
+def max_page_size():
+    return getattr(settings, "MEETING_MAX_PAGE_SIZE", 100)
+
+
+def clamp_page_size(value, default=None):
+    """Parse a client-supplied page size into 1..MEETING_MAX_PAGE_SIZE."""
+    default = default or default_page_size()
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, max_page_size()))
+
+
+# ---------- cursor encoding ----------
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values, direction, number):
+    payload = {"v": [_encode_value(v) for v in values], "d": direction, "n": number}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """(values, direction, page number) or None for a missing or malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = [_decode_value(v) for v in payload["v"]]
+        direction = payload["d"]
+        number = int(payload["n"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        return None
+    if direction not in ("next", "prev") or number < 1:
+        return None
+    return values, direction, number
+
+
+def _accepts(output_field, value):
+    """True if a decoded cursor ``value`` can be compared with ``output_field``."""
+    kind = output_field.get_internal_type()
+    if kind == "DateTimeField":
+        return isinstance(value, datetime) and timezone.is_aware(value)
+    if isinstance(value, bool):
+        return False
+    if kind.endswith(("IntegerField", "AutoField")):
+        return isinstance(value, int)
+    if kind == "FloatField":
+        return isinstance(value, (int, float))
+    if kind in ("CharField", "TextField"):
+        return isinstance(value, str)
+    return False
+
+
+# ---------- pages ----------
+class KeysetPage:
+    def __init__(self, paginator, object_list, number, has_next, has_previous):
+        self.paginator = paginator
+        self.object_list = object_list
+        self.number = number
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __repr__(self):
+        return f"<KeysetPage {self.number}>"
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return None
+        return self.paginator.cursor_for(self.object_list[-1], "next", self.number + 1)
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous:
+            return None
+        return self.paginator.cursor_for(self.object_list[0], "prev", self.number - 1)
+
+    def snapshot(self):
+        """A picklable copy of the page, with the cursors and totals it renders."""
+        return PageSnapshot(
+            object_list=list(self.object_list),
+            number=self.number,
+            has_next=self.has_next,
+            has_previous=self.has_previous,
+            next_cursor=self.next_cursor,
+            previous_cursor=self.previous_cursor,
+            paginator=PaginatorSnapshot(
+                per_page=self.paginator.per_page,
+                count=self.paginator.count,
+                num_pages=self.paginator.num_pages,
+                count_is_exact=self.paginator.count_is_exact,
+            ),
+        )
+
+
+@dataclass
+class PaginatorSnapshot:
+    per_page: int
+    count: int | None
+    num_pages: int | None
+    count_is_exact: bool
+
+
+@dataclass
+class PageSnapshot:
+    """Frozen KeysetPage, safe to keep in a cache (see meetings.listing_cache)."""
+    object_list: list
+    number: int
+    has_next: bool
+    has_previous: bool
+    next_cursor: str | None
+    previous_cursor: str | None
+    paginator: PaginatorSnapshot
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+
+class KeysetPaginator:
+    def __init__(
+        self,
+        queryset,
+        per_page=None,
+        ordering=("-start_time", "-id"),
+        count_mode="none",
+        count_cap=1000,
+    ):
+        self.queryset = queryset
+        self.per_page = clamp_page_size(per_page)
+        self.ordering = tuple(ordering)
+        # Planner estimates need one QuerySet; merged sources such as
+        # meetings.archive.History are counted exactly instead.
+        if count_mode == "estimate" and not isinstance(queryset, QuerySet):
+            count_mode = "exact"
+        self.count_mode = count_mode
+        self.count_cap = count_cap
+
+    @property
+    def _keys(self):
+        return [(name.lstrip("-"), name.startswith("-")) for name in self.ordering]
+
+    def cursor_for(self, obj, direction, number):
+        # Rows may be model instances or values() dicts.
+        get = obj.get if isinstance(obj, dict) else lambda field: getattr(obj, field)
+        return encode_cursor([get(field) for field, _ in self._keys], direction, number)
+
+    def _after(self, values, reverse):
+        """Rows strictly after ``values`` in ordering (or before it when ``reverse``)."""
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(self._keys, values):
+            lookup = "lt" if descending != reverse else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def _valid(self, values):
+        """True if cursor ``values`` match the ordering's fields in number and type."""
+        if len(values) != len(self.ordering):
+            return False
+        # A History (meetings.archive) orders every table it reads the same way.
+        query = getattr(self.queryset, "querysets", [self.queryset])[0].query
+        return all(
+            _accepts(query.resolve_ref(field).output_field, value)
+            for (field, _), value in zip(self._keys, values)
+        )
+
+    def _plan(self, cursor):
+        """(queryset slice to fetch, function turning its rows into the page) for ``cursor``."""
+        decoded = decode_cursor(cursor)
+        if decoded is not None and not self._valid(decoded[0]):
+            decoded = None
+
+        if decoded is None:
+            qs = self.queryset.order_by(*self.ordering)[: self.per_page + 1]
+            return qs, lambda rows: KeysetPage(
+                self, rows[: self.per_page], 1, len(rows) > self.per_page, False
+            )
+
+        values, direction, number = decoded
+        if direction == "next":
+            qs = self.queryset.filter(self._after(values, reverse=False)).order_by(*self.ordering)
+            return qs[: self.per_page + 1], lambda rows: KeysetPage(
+                self, rows[: self.per_page], number, len(rows) > self.per_page, True
+            )
+
+        flipped = [name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering]
+        qs = self.queryset.filter(self._after(values, reverse=True)).order_by(*flipped)
+
+        def previous_page(rows):
+            has_previous = len(rows) > self.per_page
+            rows = rows[: self.per_page][::-1]
+            return KeysetPage(self, rows, max(number, 1) if has_previous else 1, True, has_previous)
+
+        return qs[: self.per_page + 1], previous_page
+
+    def get_page(self, cursor=None):
+        qs, make_page = self._plan(cursor)
+        return make_page(list(qs))
+
+    async def aget_page(self, cursor=None):
+        """``get_page`` for async views; the total, if any, is loaded too."""
+        qs, make_page = self._plan(cursor)
+        page = make_page([row async for row in qs])
+        await self.aload_count()
+        return page
+
+    # ---------- totals ----------
+    @cached_property
+    def count(self):
+        """Total rows per ``count_mode``; None when counting is disabled."""
+        if self.count_mode == "exact":
+            return self.queryset.count()
+        if self.count_mode == "estimate" and connections[self.queryset.db].vendor == "postgresql":
+            return self._planner_estimate()
+        if self.count_mode in ("capped", "estimate"):
+            return self.queryset.order_by()[: self.count_cap + 1].count()
+        return None
+
+    async def aload_count(self):
+        """Fill ``count`` off the event loop so templates never query for it."""
+        if self.count_mode != "none" and "count" not in self.__dict__:
+            await sync_to_async(getattr)(self, "count")
+
+    @property
+    def count_is_exact(self):
+        if self.count is None:
+            return False
+        if self.count_mode == "exact":
+            return True
+        if self.count_mode == "estimate" and connections[self.queryset.db].vendor == "postgresql":
+            return False
+        return self.count <= self.count_cap
+
+    @property
+    def num_pages(self):
+        if self.count is None:
+            return None
+        return max(1, math.ceil(self.count / self.per_page))
+
+    def _planner_estimate(self):
+        sql, params = self.queryset.order_by().query.sql_with_params()
+        with connections[self.queryset.db].cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
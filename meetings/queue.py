@@ -0,0 +1,248 @@
+"""
+A small background task queue stored in the project database.
+
+Functions decorated with ``@task`` can be queued with ``fn.enqueue(**kwargs)``;
+the Task row is written in the caller's transaction, so work is only picked
+up if the request that queued it commits. ``manage.py run_tasks`` starts a
+``Worker`` that claims due tasks in batches, runs them on a pool of threads or
+processes and records the outcome and duration of each:
+
+* success      -> ``done``
+* an exception -> back to ``queued`` with exponential backoff, or ``failed``
+  once ``max_attempts`` runs have failed.
+
+Claiming uses ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database has it
+(PostgreSQL) so several workers can share the queue; on SQLite the
+``IMMEDIATE`` transaction mode in settings serialises claims instead. Tasks
+left ``running`` by a crashed worker are re-queued after ``TASK_LEASE_SECONDS``.
+Task arguments must be JSON-serialisable. Process pools rely on fork(), so
+children inherit the configured Django and the task registry.
+"""
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Avg, Count, F, Max, Q, Sum
+from django.utils import timezone
+
+from .models import Task
+
+_registry = {}
+
+
+class TaskFunction:
+    """A registered task; call it directly to run it in-process."""
+
+    def __init__(self, func, name, max_attempts, backoff):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, *, run_at=None, **kwargs):
+        return enqueue(self.name, kwargs, run_at=run_at, max_attempts=self.max_attempts)
+
+    def retry_delay(self, attempts):
+        """Seconds to wait before run number ``attempts + 1``."""
+        cap = getattr(settings, "TASK_MAX_BACKOFF", 60 * 60)
+        return min(self.backoff * 2 ** max(attempts - 1, 0), cap)
+
+
+def task(name=None, *, max_attempts=3, backoff=30):
+    """Register a function as a queueable task, by default under its dotted path."""
+    def decorator(func):
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        registered = TaskFunction(func, task_name, max_attempts, backoff)
+        _registry[task_name] = registered
+        return registered
+    return decorator
+
+
+def enqueue(name, kwargs=None, *, run_at=None, max_attempts=None):
+    if name not in _registry:
+        raise KeyError(f"No task registered as {name!r}.")
+    return Task.objects.create(
+        name=name,
+        kwargs=kwargs or {},
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or _registry[name].max_attempts,
+    )
+
+
+# ---------- claiming and recording ----------
+def claim(batch_size, worker=""):
+    """Mark up to ``batch_size`` due tasks as running and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Task.objects.select_for_update(skip_locked=True)
+            .filter(status=Task.QUEUED, run_at__lte=now)
+            .order_by("run_at", "id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return []
+        Task.objects.filter(id__in=ids).update(
+            status=Task.RUNNING, worker=worker, started_at=now, attempts=F("attempts") + 1
+        )
+        return list(Task.objects.filter(id__in=ids).order_by("run_at", "id"))
+
+
+def execute(name, kwargs):
+    """Run a task; returns (traceback or None, milliseconds). Safe to call in a child process."""
+    started = time.perf_counter()
+    try:
+        _registry[name].func(**kwargs)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    return error, (time.perf_counter() - started) * 1000
+
+
+def _execute_in_thread(name, kwargs):
+    try:
+        return execute(name, kwargs)
+    finally:
+        # Each pool thread has its own connection; don't leave it open between tasks.
+        connection.close()
+
+
+def record(task_row, error, duration_ms):
+    """Store a run's outcome, scheduling a retry if attempts remain."""
+    now = timezone.now()
+    updates = {"finished_at": now, "duration_ms": duration_ms, "last_error": error or ""}
+    if error is None:
+        updates["status"] = Task.DONE
+    elif task_row.attempts < task_row.max_attempts and task_row.name in _registry:
+        delay = _registry[task_row.name].retry_delay(task_row.attempts)
+        updates.update(status=Task.QUEUED, run_at=now + timedelta(seconds=delay))
+    else:
+        updates["status"] = Task.FAILED
+    Task.objects.filter(pk=task_row.pk).update(**updates)
+
+
+def requeue_stale(lease_seconds=None):
+    """Return tasks stuck in ``running`` past the lease to the queue."""
+    lease = lease_seconds or getattr(settings, "TASK_LEASE_SECONDS", 15 * 60)
+    cutoff = timezone.now() - timedelta(seconds=lease)
+    stale = Task.objects.filter(status=Task.RUNNING, started_at__lt=cutoff)
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Task.FAILED, last_error="Worker lost while running the task."
+    )
+    return failed + stale.update(status=Task.QUEUED, run_at=timezone.now())
+
+
+def purge_finished(days=None):
+    """Delete tasks that finished more than ``TASK_RETENTION_DAYS`` ago."""
+    days = days if days is not None else getattr(settings, "TASK_RETENTION_DAYS", 7)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Task.objects.filter(
+        status__in=[Task.DONE, Task.FAILED], finished_at__lt=cutoff
+    ).delete()
+    return deleted
+
+
+def task_metrics():
+    """Per task name: counts by status and run-time statistics in milliseconds."""
+    return list(
+        Task.objects.values("name")
+        .annotate(
+            queued=Count("id", filter=Q(status=Task.QUEUED)),
+            running=Count("id", filter=Q(status=Task.RUNNING)),
+            done=Count("id", filter=Q(status=Task.DONE)),
+            failed=Count("id", filter=Q(status=Task.FAILED)),
+            avg_ms=Avg("duration_ms"),
+            max_ms=Max("duration_ms"),
+            total_ms=Sum("duration_ms"),
+        )
+        .order_by("name")
+    )
+
+
+# ---------- worker ----------
+_inherited_connections = []
+
+
+def _init_worker_process():
+    # A forked child must not use or close the parent's database sockets.
+    # Keep the inherited handles referenced (so they are never finalised
+    # here) and let Django open fresh connections in this process.
+    for conn in connections.all(initialized_only=True):
+        _inherited_connections.append(conn.connection)
+        conn.connection = None
+
+
+class Worker:
+    """
+    Claims tasks in batches and runs each batch on a pool.
+
+    ``mode`` is ``"thread"`` or ``"process"``; ``concurrency=0`` runs tasks in
+    the calling thread, which is handy for debugging and tests.
+    """
+
+    housekeeping_interval = 60
+
+    def __init__(self, concurrency=4, mode="thread", batch_size=10, poll_interval=1.0, name=None):
+        self.concurrency = concurrency
+        self.mode = mode
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    def _pool(self):
+        if self.concurrency == 0:
+            return None
+        if self.mode == "process":
+            return ProcessPoolExecutor(self.concurrency, initializer=_init_worker_process)
+        return ThreadPoolExecutor(self.concurrency, thread_name_prefix="task-worker")
+
+    def run_batch(self, pool, batch):
+        if pool is None:
+            for task_row in batch:
+                record(task_row, *execute(task_row.name, task_row.kwargs))
+            return
+        runner = execute if self.mode == "process" else _execute_in_thread
+        futures = {pool.submit(runner, t.name, t.kwargs): t for t in batch}
+        for future in as_completed(futures):
+            try:
+                outcome = future.result()
+            except Exception:  # The pool itself failed, e.g. a child process died.
+                outcome = (traceback.format_exc(), None)
+            record(futures[future], *outcome)
+
+    def run(self, once=False):
+        """Process tasks until stopped (or, with ``once``, until none are due). Returns the count."""
+        processed = 0
+        last_housekeeping = 0
+        pool = self._pool()
+        try:
+            while not self._stop.is_set():
+                if time.monotonic() - last_housekeeping > self.housekeeping_interval:
+                    requeue_stale()
+                    purge_finished()
+                    last_housekeeping = time.monotonic()
+                batch = claim(self.batch_size, self.name)
+                if not batch:
+                    if once:
+                        break
+                    self._stop.wait(self.poll_interval)
+                    continue
+                self.run_batch(pool, batch)
+                processed += len(batch)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True)
+        return processed
@@ -0,0 +1,202 @@
+"""
+Recurring meetings.
+
+A series is a single Meeting row: ``start_time``/``end_time`` describe the
+first occurrence and the ``recurrence*`` fields an RRULE-style rule
+(FREQ=DAILY/WEEKLY/MONTHLY, INTERVAL, COUNT or UNTIL, plus EXDATE-style
+skipped dates). Occurrences are never stored; ``occurrences()`` generates
+them on demand, jumping straight to the requested window, and ``expand()``
+merges several meetings' occurrences in start order.
+
+Occurrences keep the first one's local wall-clock time (``TIME_ZONE``), so a
+09:00 stand-up stays at 09:00 across DST changes. As in RFC 5545, a monthly
+rule skips months without that day (the 31st) and COUNT counts occurrences
+before skipped dates are removed. ``series_end`` (the end of the last
+occurrence, or ``end_time`` for a one-off) is stored so window queries can
+find series that started before the window.
+"""
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from heapq import merge
+from itertools import count as counter
+from typing import NamedTuple
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+DAILY = "daily"
+WEEKLY = "weekly"
+MONTHLY = "monthly"
+FREQUENCY_CHOICES = [
+    ("", "Does not repeat"),
+    (DAILY, "Daily"),
+    (WEEKLY, "Weekly"),
+    (MONTHLY, "Monthly"),
+]
+
+# Meeting fields that make up the rule.
+FIELDS = (
+    "recurrence", "recurrence_interval", "recurrence_count",
+    "recurrence_until", "recurrence_exceptions",
+)
+
+# Upper bound on a series' length; keeps booking checks and feeds bounded.
+MAX_OCCURRENCES = 500
+
+_STEP_DAYS = {DAILY: 1, WEEKLY: 7}
+
+
+class Occurrence(NamedTuple):
+    meeting_id: int
+    start: datetime
+    end: datetime
+
+
+def _add_months(value, months):
+    """``value`` moved by ``months``, or None if that month lacks the day."""
+    month_index = value.month - 1 + months
+    year, month = value.year + month_index // 12, month_index % 12 + 1
+    try:
+        return value.replace(year=year, month=month)
+    except ValueError:
+        return None
+
+
+def _candidate(first_local, frequency, interval, n):
+    """Naive local start of the ``n``th generated instance (None if skipped)."""
+    if frequency == MONTHLY:
+        return _add_months(first_local, n * interval)
+    return first_local + timedelta(days=_STEP_DAYS[frequency] * interval * n)
+
+
+def _until_limit(meeting):
+    """Naive local datetime after which no occurrence may start."""
+    if meeting.recurrence_until:
+        return datetime.combine(meeting.recurrence_until, time.max)
+    return None
+
+
+def _exception_dates(meeting):
+    return {date.fromisoformat(value) for value in meeting.recurrence_exceptions or ()}
+
+
+def occurrences(meeting, start=None, end=None):
+    """
+    Occurrences of ``meeting`` overlapping [start, end), in order. The window
+    is optional on either side; a one-off meeting yields itself.
+    """
+    duration = meeting.end_time - meeting.start_time
+    if not meeting.recurrence:
+        if (start is None or meeting.end_time > start) and (end is None or meeting.start_time < end):
+            yield Occurrence(meeting.pk, meeting.start_time, meeting.end_time)
+        return
+
+    tz = timezone.get_current_timezone()
+    first_local = timezone.localtime(meeting.start_time, tz).replace(tzinfo=None)
+    interval = meeting.recurrence_interval or 1
+    limit = meeting.recurrence_count or MAX_OCCURRENCES
+    until = _until_limit(meeting)
+    skipped = _exception_dates(meeting)
+
+    first_n = 0
+    if start is not None and meeting.recurrence in _STEP_DAYS:
+        # Daily/weekly instances are evenly spaced: jump to the window.
+        step = timedelta(days=_STEP_DAYS[meeting.recurrence] * interval)
+        window_local = timezone.localtime(start - duration, tz).replace(tzinfo=None)
+        first_n = max(0, (window_local - first_local) // step)
+
+    generated = first_n
+    for n in counter(first_n):
+        if generated >= limit:
+            return
+        local = _candidate(first_local, meeting.recurrence, interval, n)
+        if local is None:
+            continue
+        generated += 1
+        if until is not None and local > until:
+            return
+        occurrence_start = timezone.make_aware(local, tz)
+        if end is not None and occurrence_start >= end:
+            return
+        occurrence_end = occurrence_start + duration
+        if local.date() in skipped or (start is not None and occurrence_end <= start):
+            continue
+        yield Occurrence(meeting.pk, occurrence_start, occurrence_end)
+
+
+def series_end(meeting):
+    """End of the last occurrence (``end_time`` for one-off meetings)."""
+    last = None
+    for last in occurrences(meeting):
+        pass
+    return last.end if last else meeting.end_time
+
+
+def expand(meetings, start=None, end=None):
+    """Occurrences of every meeting in ``meetings`` overlapping [start, end), by start."""
+    return merge(*(occurrences(m, start, end) for m in meetings), key=lambda o: o.start)
+
+
+def in_window(queryset, start, end):
+    """Meetings (one-off or series) with an occurrence that may overlap [start, end)."""
+    return queryset.filter(start_time__lt=end, series_end__gt=start)
+
+
+def validate(meeting):
+    """Raise ValidationError for an unusable rule on ``meeting``."""
+    if not meeting.recurrence:
+        return
+    if not meeting.recurrence_count and not meeting.recurrence_until:
+        raise ValidationError("A repeating meeting needs a number of occurrences or an end date.")
+    if meeting.recurrence_count and meeting.recurrence_count > MAX_OCCURRENCES:
+        raise ValidationError(f"A series can have at most {MAX_OCCURRENCES} occurrences.")
+    if meeting.recurrence_interval < 1:
+        raise ValidationError("The repeat interval must be at least 1.")
+    if not meeting.start_time or not meeting.end_time:
+        return
+    if meeting.recurrence_until and meeting.recurrence_until < timezone.localtime(meeting.start_time).date():
+        raise ValidationError("The series cannot end before its first meeting.")
+    shortest_gap = timedelta(
+        days=_STEP_DAYS.get(meeting.recurrence, 28) * meeting.recurrence_interval
+    )
+    if meeting.end_time - meeting.start_time > shortest_gap:
+        raise ValidationError("Occurrences of a series cannot overlap each other.")
+    try:
+        _exception_dates(meeting)
+    except (TypeError, ValueError):
+        raise ValidationError("Skipped dates must be YYYY-MM-DD.")
+    if not meeting.recurrence_count:
+        first = timezone.localtime(meeting.start_time).date()
+        if meeting.recurrence == MONTHLY:
+            span = (meeting.recurrence_until.year - first.year) * 12 + (
+                meeting.recurrence_until.month - first.month
+            )
+        else:
+            span = (meeting.recurrence_until - first).days // _STEP_DAYS[meeting.recurrence]
+        if span // meeting.recurrence_interval + 1 > MAX_OCCURRENCES:
+            raise ValidationError(f"A series can have at most {MAX_OCCURRENCES} occurrences.")
+
+
+def rrule(meeting):
+    """The RFC 5545 RRULE value for a series, or "" for a one-off meeting."""
+    if not meeting.recurrence:
+        return ""
+    parts = [f"FREQ={meeting.recurrence.upper()}", f"INTERVAL={meeting.recurrence_interval or 1}"]
+    if meeting.recurrence_count:
+        parts.append(f"COUNT={meeting.recurrence_count}")
+    elif meeting.recurrence_until:
+        tz = timezone.get_current_timezone()
+        until = timezone.make_aware(datetime.combine(meeting.recurrence_until, time.max), tz)
+        parts.append(f"UNTIL={until.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')}")
+    return ";".join(parts)
+
+
+def exception_starts(meeting):
+    """Start datetimes of skipped occurrences (for EXDATE)."""
+    if not meeting.recurrence_exceptions:
+        return []
+    tz = timezone.get_current_timezone()
+    local_time = timezone.localtime(meeting.start_time, tz).time()
+    return sorted(
+        timezone.make_aware(datetime.combine(day, local_time), tz)
+        for day in _exception_dates(meeting)
+    )
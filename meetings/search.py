@@ -0,0 +1,251 @@
+"""
+Full-text search over meetings.
+
+The searchable text of each meeting (title, description, room name,
+organizer username and the extracted text of its minutes file) is copied
+into a side table owned by the active backend:
+
+* ``SQLiteFTS5Backend``  - an FTS5 virtual table, ranked with bm25().
+* ``PostgresBackend``    - a tsvector column with a GIN index, ranked with ts_rank().
+* ``IcontainsBackend``   - no index; the original icontains filters, for other databases.
+
+The table is created by migration 0005 and kept in sync by the signals in
+``meetings.signals``; ``meetings.extraction`` re-indexes a file's meetings
+once its text is extracted. ``manage.py rebuild_search_index`` refills it
+from scratch. Archived meetings keep their rows under the same id, and
+``search()`` accepts a Meeting or ArchivedMeeting queryset (see
+``meetings.archive``).
+Set ``MEETING_SEARCH_BACKEND`` to a dotted path to override the choice.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Exists, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import ArchivedMeeting, Meeting, MinutesBlob
+
+
+def _terms(query):
+    """Word tokens of a user query; punctuation never reaches the search syntax."""
+    return re.findall(r"\w+", query or "")
+
+
+def _documents(meetings):
+    """(meeting id, title, description, room name, organizer username, minutes text) rows."""
+    minutes_text = MinutesBlob.objects.filter(name=OuterRef("minutes_file")).values("text")[:1]
+    return (
+        meetings.order_by()
+        .annotate(minutes_text=Subquery(minutes_text))
+        .values_list(
+            "id", "title", "description", "room__name", "organizer__username", "minutes_text"
+        )
+    )
+
+
+class SearchBackend:
+    """Base class; subclasses own a side table keyed by meeting id."""
+
+    table = "meetings_meeting_search"
+    batch_size = 1000
+
+    def __init__(self, using="default"):
+        self.using = using
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def setup(self):
+        """Create the index table if it does not exist."""
+
+    def drop(self):
+        """Drop the index table."""
+
+    def index_rows(self, rows):
+        """Insert or replace the given ``_documents`` rows."""
+
+    def remove(self, meeting_ids):
+        """Remove meetings from the index."""
+
+    def index(self, meetings):
+        """Index a Meeting queryset in batches."""
+        batch = []
+        for row in _documents(meetings).iterator(chunk_size=self.batch_size):
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.index_rows(batch)
+                batch = []
+        if batch:
+            self.index_rows(batch)
+
+    def rebuild(self):
+        self.drop()
+        self.setup()
+        self.index(Meeting.objects.using(self.using))
+        self.index(ArchivedMeeting.objects.using(self.using))
+
+    def search(self, queryset, query):
+        """Filter ``queryset`` to matches, annotated with ``search_rank`` and ordered by it."""
+        raise NotImplementedError
+
+
+class IcontainsBackend(SearchBackend):
+    """Unindexed fallback matching the original view filters."""
+
+    def index(self, meetings):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, query):
+        query = (query or "").strip()
+        return queryset.filter(
+            Q(title__icontains=query)
+            | Q(description__icontains=query)
+            | Q(room__name__icontains=query)
+            | Q(organizer__username__icontains=query)
+            | Exists(
+                MinutesBlob.objects.filter(name=OuterRef("minutes_file"), text__icontains=query)
+            )
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteFTS5Backend(SearchBackend):
+    def setup(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5("
+                "title, description, room, organizer, minutes, "
+                "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+            )
+
+    def drop(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def index_rows(self, rows):
+        rows = list(rows)
+        self.remove([row[0] for row in rows])
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, description, room, organizer, minutes) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                [(pk, title, description or "", room, organizer, minutes or "")
+                 for pk, title, description, room, organizer, minutes in rows],
+            )
+
+    def remove(self, meeting_ids):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [(pk,) for pk in meeting_ids],
+            )
+
+    def search(self, queryset, query):
+        # Every term must match, each as a prefix: "ali boa" finds "Alice" in "Boardroom".
+        match = " ".join('"%s"*' % term for term in _terms(query))
+        if not match:
+            return queryset.none()
+        meeting_table = queryset.model._meta.db_table
+        # Joined rather than ranked in a correlated subquery: bm25() there
+        # re-runs the whole MATCH for every candidate row. The unary + keeps
+        # SQLite from probing the index by rowid per meeting, so the MATCH
+        # runs once and drives the join.
+        return (
+            queryset.extra(
+                tables=[self.table],
+                where=[f"{self.table} MATCH %s", f"{meeting_table}.id = +{self.table}.rowid"],
+                params=[match],
+            )
+            .annotate(search_rank=RawSQL(f"-bm25({self.table})", (), output_field=FloatField()))
+            .order_by("-search_rank", "-start_time", "-id")
+        )
+
+
+class PostgresBackend(SearchBackend):
+    config = "simple"
+
+    def setup(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "meeting_id bigint PRIMARY KEY, "
+                "document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.table}_document_gin "
+                f"ON {self.table} USING gin (document)"
+            )
+
+    def drop(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def index_rows(self, rows):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (meeting_id, document) VALUES (%s, "
+                f"setweight(to_tsvector('{self.config}', %s), 'A') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'C') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'B') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'B') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'D')) "
+                "ON CONFLICT (meeting_id) DO UPDATE SET document = EXCLUDED.document",
+                [(pk, title, description or "", room, organizer, minutes or "")
+                 for pk, title, description, room, organizer, minutes in rows],
+            )
+
+    def remove(self, meeting_ids):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE meeting_id = ANY(%s)", (list(meeting_ids),)
+            )
+
+    def search(self, queryset, query):
+        tsquery = " & ".join(f"{term}:*" for term in _terms(query))
+        if not tsquery:
+            return queryset.none()
+        meeting_table = queryset.model._meta.db_table
+        return (
+            queryset.filter(
+                id__in=RawSQL(
+                    f"SELECT meeting_id FROM {self.table} "
+                    f"WHERE document @@ to_tsquery('{self.config}', %s)",
+                    (tsquery,),
+                    output_field=FloatField(),
+                )
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    f"SELECT ts_rank(document, to_tsquery('{self.config}', %s)) "
+                    f"FROM {self.table} WHERE meeting_id = {meeting_table}.id",
+                    (tsquery,),
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("-search_rank", "-start_time", "-id")
+        )
+
+
+_VENDOR_BACKENDS = {
+    "sqlite": SQLiteFTS5Backend,
+    "postgresql": PostgresBackend,
+}
+
+
+def get_backend(using="default"):
+    """Search backend for database alias ``using``."""
+    path = getattr(settings, "MEETING_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)(using)
+    vendor = connections[using].vendor
+    return _VENDOR_BACKENDS.get(vendor, IcontainsBackend)(using)
+
+
+def search_meetings(queryset, query):
+    """Ranked full-text matches for ``query`` within a Meeting or ArchivedMeeting ``queryset``."""
+    return get_backend(queryset.db).search(queryset, query)
@@ -0,0 +1,219 @@
+"""
+Bulk data for load tests and benchmarks (``manage.py seed_meetings``).
+
+Users, rooms, minutes blobs and meetings are written with ``bulk_create`` in
+batches, which skips model signals. The state those signals keep current is
+refreshed once at the end instead: scope versions are bumped so no cached
+page survives, and the search index and room usage rollup can be rebuilt in
+one pass each.
+
+Bookings look like real ones and never overlap. Each room's one-off
+meetings take distinct hourly slots between 08:00 and 18:00 local time,
+last 30 to 60 minutes and are spread over ``span_days`` (three quarters in
+the past). Weekly series get rooms of their own, one weekday and hour slot
+per series. Organizers are skewed so a few users own many meetings, and a
+share of meetings point at a small pool of minutes files with extracted
+text.
+"""
+import random
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db.models import Count
+from django.utils import timezone
+
+from . import recurrence, versioning
+from .models import Meeting, MeetingRoom, MinutesBlob
+
+SLOT_HOURS = range(8, 18)
+TOPICS = [
+    "Budget", "Roadmap", "Hiring", "Procurement", "Security", "Onboarding", "Board",
+    "Marketing", "Finance", "Operations", "Compliance", "Partnership", "Training", "Product",
+]
+KINDS = ["review", "sync", "planning", "stand-up", "workshop", "retrospective", "briefing"]
+FLOORS = ["Ground floor", "1st floor", "2nd floor", "3rd floor", "Annex"]
+MINUTES_POOL = 50
+SERIES_SLOTS = [(weekday, hour) for weekday in range(5) for hour in SLOT_HOURS]
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Seeder:
+    def __init__(
+        self, users, rooms, meetings, *, series=None, span_days=365, minutes_share=0.1,
+        batch_size=5000, seed=0, prefix="seed", password="seed-pass", progress=None,
+    ):
+        self.users = users
+        self.rooms = rooms
+        self.meetings = meetings
+        self.series = meetings // 100 if series is None else series
+        self.span_days = span_days
+        self.minutes_share = minutes_share
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.prefix = prefix
+        self.password = password
+        self.progress = progress or (lambda message: None)
+
+    def already_seeded(self):
+        return User.objects.filter(username__startswith=f"{self.prefix}-user-").exists()
+
+    def run(self):
+        """Write everything; returns the number of rows per model."""
+        user_ids = self.create_users()
+        room_ids = self.create_rooms()
+        minutes = self.create_minutes()
+        created = self.create_meetings(user_ids, room_ids, minutes)
+        versioning.bump(versioning.GLOBAL, versioning.USERS, versioning.ROOMS)
+        return {
+            "users": len(user_ids),
+            "rooms": len(room_ids),
+            "minutes_files": len(minutes),
+            "meetings": created,
+        }
+
+    # ---------- users, rooms, files ----------
+    def create_users(self):
+        hashed = make_password(self.password)
+        User.objects.bulk_create(
+            (User(username=f"{self.prefix}-user-{n}", password=hashed) for n in range(self.users)),
+            batch_size=self.batch_size,
+        )
+        self.progress(f"{self.users} users")
+        return list(
+            User.objects.filter(username__startswith=f"{self.prefix}-user-")
+            .order_by("pk").values_list("pk", flat=True)
+        )
+
+    def create_rooms(self):
+        total = self.rooms + -(-self.series // len(SERIES_SLOTS))
+        MeetingRoom.objects.bulk_create(
+            (
+                MeetingRoom(
+                    name=f"{self.prefix} room {n}",
+                    location=self.random.choice(FLOORS),
+                    capacity=self.random.choice([4, 6, 8, 10, 12, 20, 40]),
+                )
+                for n in range(total)
+            ),
+            batch_size=self.batch_size,
+        )
+        self.progress(f"{total} rooms")
+        return list(
+            MeetingRoom.objects.filter(name__startswith=f"{self.prefix} room ")
+            .order_by("pk").values_list("pk", flat=True)
+        )
+
+    def create_minutes(self):
+        if not self.minutes_share:
+            return []
+        names = [f"meeting_minutes/{self.prefix}-minutes-{n}.pdf" for n in range(MINUTES_POOL)]
+        now = timezone.now()
+        MinutesBlob.objects.bulk_create(
+            [
+                MinutesBlob(
+                    name=name, size=20_000, extracted_at=now,
+                    text=" ".join(self.random.choices(TOPICS + KINDS, k=40)),
+                )
+                for name in names
+            ],
+            ignore_conflicts=True,
+        )
+        return names
+
+    # ---------- meetings ----------
+    def _title(self):
+        return f"{self.random.choice(TOPICS)} {self.random.choice(KINDS)}"
+
+    def _day_starts(self, days):
+        first_day = timezone.localdate() - timedelta(days=days * 3 // 4)
+        tz = timezone.get_current_timezone()
+        return [
+            timezone.make_aware(datetime.combine(first_day + timedelta(days=n), time.min), tz)
+            for n in range(days)
+        ]
+
+    def _one_offs(self, user_ids, room_ids, minutes, organizer_weights):
+        plain_rooms = room_ids[: self.rooms]
+        one_offs = self.meetings - self.series
+        per_room, extra = divmod(one_offs, len(plain_rooms)) if plain_rooms else (0, 0)
+        days = max(self.span_days, -(-(per_room + 1) // len(SLOT_HOURS)))
+        day_starts = self._day_starts(days)
+        now = timezone.now()
+        for index, room_id in enumerate(plain_rooms):
+            slots = self.random.sample(range(days * len(SLOT_HOURS)), per_room + (index < extra))
+            for slot in slots:
+                day, hour = divmod(slot, len(SLOT_HOURS))
+                start = day_starts[day] + timedelta(hours=SLOT_HOURS[hour])
+                end = start + timedelta(minutes=self.random.choice([30, 45, 60]))
+                yield Meeting(
+                    title=self._title(),
+                    description=f"Agenda: {self._title().lower()}." if self.random.random() < 0.5 else "",
+                    organizer_id=self.random.choices(user_ids, cum_weights=organizer_weights)[0],
+                    room_id=room_id,
+                    start_time=start,
+                    end_time=end,
+                    series_end=end,
+                    minutes_file=(
+                        self.random.choice(minutes)
+                        if minutes and end < now and self.random.random() < self.minutes_share
+                        else ""
+                    ),
+                )
+
+    def _series(self, user_ids, room_ids, organizer_weights):
+        series_rooms = room_ids[self.rooms:]
+        # First occurrences fall in the span's first four weeks.
+        day_starts = self._day_starts(self.span_days)
+        for n in range(self.series):
+            room_id = series_rooms[n // len(SERIES_SLOTS)]
+            weekday, hour = SERIES_SLOTS[n % len(SERIES_SLOTS)]
+            first_day = self.random.randrange(0, min(len(day_starts), 28))
+            first_day += (weekday - day_starts[first_day].weekday()) % 7
+            start = day_starts[0] + timedelta(days=first_day, hours=hour)
+            meeting = Meeting(
+                title=self._title(),
+                organizer_id=self.random.choices(user_ids, cum_weights=organizer_weights)[0],
+                room_id=room_id,
+                start_time=start,
+                end_time=start + timedelta(minutes=self.random.choice([30, 45, 60])),
+                recurrence=recurrence.WEEKLY,
+                recurrence_interval=1,
+                recurrence_count=self.random.randint(4, 52),
+                minutes_file="",
+            )
+            meeting.series_end = recurrence.series_end(meeting)
+            yield meeting
+
+    def create_meetings(self, user_ids, room_ids, minutes):
+        # Zipf-like: organizer i books about 1/(i+1) as often as the first.
+        organizer_weights, total = [], 0.0
+        for rank in range(len(user_ids)):
+            total += 1.0 / (rank + 1)
+            organizer_weights.append(total)
+
+        created = 0
+        rows = self._one_offs(user_ids, room_ids, minutes, organizer_weights)
+        for batch in _batches(rows, self.batch_size):
+            Meeting.objects.bulk_create(batch)
+            created += len(batch)
+            self.progress(f"{created} meetings")
+        series = list(self._series(user_ids, room_ids, organizer_weights))
+        Meeting.objects.bulk_create(series, batch_size=self.batch_size)
+        created += len(series)
+
+        for row in Meeting.objects.filter(
+            minutes_file__startswith=f"meeting_minutes/{self.prefix}-"
+        ).values("minutes_file").annotate(refs=Count("id")).order_by():
+            MinutesBlob.objects.filter(name=row["minutes_file"]).update(ref_count=row["refs"])
+        return created
@@ -0,0 +1,104 @@
+from django.db import IntegrityError, transaction
+
+from .models import Meeting, MeetingRoom
+from .recurrence import FIELDS as RULE_FIELDS, expand, in_window, occurrences
+
+
+# Name of the PostgreSQL exclusion constraint added in migration 0003.
+OVERLAP_CONSTRAINT = "meetings_meeting_no_room_overlap"
+
+
+class BookingConflict(Exception):
+    """Raised when a meeting overlaps an existing booking in the same room."""
+
+    def __init__(self, meeting, conflicts=()):
+        self.meeting = meeting
+        self.room = meeting.room
+        # (occurrence, clashing occurrence) pairs, see series_conflicts().
+        self.conflicts = list(conflicts)
+        message = f"A meeting already exists in {meeting.room.name} during this time."
+        if meeting.recurrence and self.conflicts:
+            first = self.conflicts[0][0].start
+            message = (
+                f"{len(self.conflicts)} occurrence(s) clash with existing meetings in "
+                f"{meeting.room.name}, starting {first:%b %d, %Y %H:%M}."
+            )
+        super().__init__(message)
+
+
+def find_conflicts(room, start_time, end_time, exclude_id=None):
+    """
+    Return meetings in ``room`` whose stored first occurrence overlaps the
+    half-open range [start, end); use ``series_conflicts`` to include repeats.
+    The ``end_time__gt`` predicate comes first in the composite index, so past
+    meetings are skipped without being read no matter how long the history is.
+    """
+    qs = Meeting.objects.filter(
+        room=room,
+        end_time__gt=start_time,
+        start_time__lt=end_time,
+    )
+    if exclude_id is not None:
+        qs = qs.exclude(id=exclude_id)
+    return qs
+
+
+def series_conflicts(meeting):
+    """
+    (occurrence, clashing occurrence) pairs for every occurrence of
+    ``meeting`` against the other bookings in its room.
+
+    Works for one-off meetings and whole series alike with a single query:
+    everything in the room that may overlap the series' overall span is read
+    once, expanded for that span, and swept against the series in start order.
+    """
+    mine = list(occurrences(meeting))
+    if not mine:
+        return []
+    span_start, span_end = mine[0].start, mine[-1].end
+    others = in_window(Meeting.objects.filter(room_id=meeting.room_id), span_start, span_end)
+    if meeting.pk is not None:
+        others = others.exclude(pk=meeting.pk)
+    theirs = list(expand(
+        others.order_by().only("id", "start_time", "end_time", *RULE_FIELDS),
+        span_start, span_end,
+    ))
+
+    conflicts, active, j = [], [], 0
+    for occurrence in mine:
+        # Occurrences of a series never overlap, so ``mine`` is sorted by
+        # both start and end and each of ``theirs`` is visited once.
+        while j < len(theirs) and theirs[j].start < occurrence.end:
+            active.append(theirs[j])
+            j += 1
+        active = [other for other in active if other.end > occurrence.start]
+        conflicts.extend((occurrence, other) for other in active)
+    return conflicts
+
+
+def has_conflict(meeting):
+    """True if any occurrence of ``meeting`` would overlap another booking in its room."""
+    return bool(series_conflicts(meeting))
+
+
+def book_meeting(meeting):
+    """
+    Check for overlaps and save ``meeting`` in one transaction.
+
+    The room row is locked first, so concurrent bookings for the same room are
+    serialised on backends with row locks (SQLite serialises every write
+    transaction instead, see ``transaction_mode`` in settings). On PostgreSQL
+    the exclusion constraint is the final guard against double bookings.
+    """
+    try:
+        with transaction.atomic():
+            MeetingRoom.objects.select_for_update().filter(pk=meeting.room_id).first()
+            conflicts = series_conflicts(meeting)
+            if conflicts:
+                raise BookingConflict(meeting, conflicts)
+            meeting.save()
+    except IntegrityError as exc:
+        if OVERLAP_CONSTRAINT in str(exc):
+            raise BookingConflict(meeting) from exc
+        raise
+    return meeting
@@ -0,0 +1,215 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .analytics import schedule_refresh
+from .availability import availability
+from .extraction import schedule_extraction
+from .live import hub, meeting_event
+from .models import ArchivedMeeting, Meeting, MeetingRoom
+from .search import get_backend
+from .storage import add_reference, drop_reference
+from .stats import invalidate_user_stats
+from . import versioning
+
+
+# -----------------------------------
+# AVAILABILITY INDEX
+# -----------------------------------
+@receiver(post_save, sender=Meeting)
+def meeting_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: availability.meeting_saved(instance))
+
+
+@receiver(post_delete, sender=Meeting)
+def meeting_deleted(sender, instance, **kwargs):
+    meeting_id = instance.pk
+    transaction.on_commit(lambda: availability.meeting_deleted(meeting_id))
+
+
+@receiver(post_save, sender=MeetingRoom)
+def room_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: availability.room_changed(instance))
+
+
+@receiver(post_delete, sender=MeetingRoom)
+def room_deleted(sender, instance, **kwargs):
+    room_id = instance.pk
+    transaction.on_commit(lambda: availability.room_deleted(room_id))
+
+
+# -----------------------------------
+# DASHBOARD STATS
+# -----------------------------------
+@receiver(post_save, sender=Meeting)
+@receiver(post_delete, sender=Meeting)
+def meeting_changed_stats(sender, instance, **kwargs):
+    organizer_ids = {instance.organizer_id}
+    previous = getattr(instance, "_previous", None)
+    if previous:
+        # An edit that hands the meeting over changes both organizers' counts.
+        organizer_ids.add(previous["organizer_id"])
+
+    def invalidate():
+        for organizer_id in organizer_ids:
+            invalidate_user_stats(organizer_id)
+
+    transaction.on_commit(invalidate)
+
+
+# -----------------------------------
+# FULL-TEXT SEARCH INDEX
+# -----------------------------------
+# Written in the same transaction as the meeting so the index never drifts.
+# Archived meetings keep their rows (see meetings.archive) until deleted.
+@receiver(post_save, sender=Meeting)
+def index_meeting(sender, instance, using, **kwargs):
+    get_backend(using).index(Meeting.objects.using(using).filter(pk=instance.pk))
+
+
+@receiver(post_delete, sender=Meeting)
+@receiver(post_delete, sender=ArchivedMeeting)
+def unindex_meeting(sender, instance, using, **kwargs):
+    get_backend(using).remove([instance.pk])
+
+
+@receiver(post_save, sender=MeetingRoom)
+def reindex_room_meetings(sender, instance, using, created, **kwargs):
+    if not created:
+        get_backend(using).index(Meeting.objects.using(using).filter(room=instance))
+        get_backend(using).index(ArchivedMeeting.objects.using(using).filter(room=instance))
+
+
+@receiver(post_save, sender=User)
+def reindex_organizer_meetings(sender, instance, using, created, update_fields, **kwargs):
+    if created or (update_fields is not None and "username" not in update_fields):
+        return
+    get_backend(using).index(Meeting.objects.using(using).filter(organizer=instance))
+    get_backend(using).index(ArchivedMeeting.objects.using(using).filter(organizer=instance))
+
+
+# -----------------------------------
+# CONDITIONAL GET VERSIONS
+# -----------------------------------
+# Bumped inside the writing transaction (``global`` once it commits) so a
+# rolled-back write leaves the versions (and clients' ETags) untouched.
+@receiver(pre_save, sender=Meeting)
+def remember_previous_state(sender, instance, using, **kwargs):
+    """
+    Note the stored room, organizer, minutes file and time span so an edit can
+    bump the versions on both sides, move the minutes reference and refresh
+    the usage rollup for the days the meeting left.
+    """
+    instance._previous = None
+    if instance.pk:
+        instance._previous = (
+            Meeting.objects.using(using)
+            .filter(pk=instance.pk)
+            .values("room_id", "organizer_id", "minutes_file", "start_time", "series_end")
+            .first()
+        )
+
+
+def _meeting_scopes(meeting):
+    return (
+        versioning.GLOBAL,
+        versioning.room_scope(meeting.room_id),
+        versioning.organizer_scope(meeting.organizer_id),
+        versioning.meeting_scope(meeting.pk),
+    )
+
+
+@receiver(post_save, sender=Meeting)
+def bump_meeting_versions(sender, instance, **kwargs):
+    scopes = list(_meeting_scopes(instance))
+    previous = getattr(instance, "_previous", None)
+    if previous:
+        scopes.append(versioning.room_scope(previous["room_id"]))
+        scopes.append(versioning.organizer_scope(previous["organizer_id"]))
+    versioning.bump(*scopes)
+
+
+@receiver(post_delete, sender=Meeting)
+@receiver(post_delete, sender=ArchivedMeeting)
+def bump_deleted_meeting_versions(sender, instance, **kwargs):
+    versioning.bump(*_meeting_scopes(instance))
+
+
+@receiver(post_save, sender=MeetingRoom)
+@receiver(post_delete, sender=MeetingRoom)
+def bump_room_versions(sender, instance, **kwargs):
+    versioning.bump(versioning.GLOBAL, versioning.ROOMS, versioning.room_scope(instance.pk))
+
+
+@receiver(post_save, sender=User)
+def bump_user_versions(sender, instance, created, update_fields, **kwargs):
+    if created or (update_fields is not None and "username" not in update_fields):
+        return
+    versioning.bump(
+        versioning.GLOBAL, versioning.USERS, versioning.organizer_scope(instance.pk)
+    )
+
+
+# -----------------------------------
+# MINUTES FILE REFERENCE COUNTS
+# -----------------------------------
+@receiver(post_save, sender=Meeting)
+def count_minutes_reference(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous", None)
+    old_name = (previous or {}).get("minutes_file") or ""
+    new_name = instance.minutes_file.name if instance.minutes_file else ""
+    if old_name != new_name:
+        add_reference(new_name)
+        drop_reference(old_name)
+        # No-op for files whose text is already extracted.
+        schedule_extraction(new_name)
+
+
+@receiver(post_delete, sender=Meeting)
+@receiver(post_delete, sender=ArchivedMeeting)
+def release_minutes_reference(sender, instance, **kwargs):
+    if instance.minutes_file:
+        drop_reference(instance.minutes_file.name)
+
+
+# -----------------------------------
+# ROOM USAGE ROLLUP
+# -----------------------------------
+# Queued in the writing transaction, like minutes extraction.
+@receiver(post_save, sender=Meeting)
+def refresh_room_usage(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous", None)
+    span = (instance.room_id, instance.start_time, instance.series_end or instance.end_time)
+    if previous:
+        old_span = (previous["room_id"], previous["start_time"], previous["series_end"])
+        if old_span != span and old_span[2] is not None:
+            schedule_refresh(*old_span)
+    schedule_refresh(*span)
+
+
+@receiver(post_delete, sender=Meeting)
+@receiver(post_delete, sender=ArchivedMeeting)
+def refresh_deleted_room_usage(sender, instance, **kwargs):
+    schedule_refresh(instance.room_id, instance.start_time, instance.series_end or instance.end_time)
+
+
+# -----------------------------------
+# LIVE EVENTS
+# -----------------------------------
+# Built now, published only once the write is committed.
+@receiver(post_save, sender=Meeting)
+def publish_meeting_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous", None)
+    event = meeting_event(
+        "booked" if created else "updated",
+        instance,
+        previous_room=previous["room_id"] if previous else None,
+    )
+    transaction.on_commit(lambda: hub.publish(event))
+
+
+@receiver(post_delete, sender=Meeting)
+def publish_meeting_deleted(sender, instance, **kwargs):
+    event = meeting_event("deleted", instance)
+    transaction.on_commit(lambda: hub.publish(event))
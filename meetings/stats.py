@@ -0,0 +1,128 @@
+"""
+Per-user dashboard statistics.
+
+Counts are computed with one conditional-aggregation query and cached per
+user together with ``as_of`` (when they were correct), the next instant a
+meeting of that user changes status and the version of the user's
+``organizer:<id>`` scope (see ``meetings.versioning``). Until that instant,
+and while the version holds, the cached counts are returned after a single
+primary-key lookup of the version; after it, only the user's meetings that
+were not yet ended at ``as_of`` are re-aggregated to roll the counts forward.
+Async views use ``aget_dashboard_stats``.
+
+Every write that changes a user's meetings bumps that scope, so the check
+catches writes made by other worker processes, whose caches this process
+cannot clear. Saving or deleting a meeting also drops the organizers' entries
+in the writing process (see ``meetings.signals``).
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Min, Q
+
+from . import versioning
+from .filters import ENDED, ONGOING, UPCOMING, status_q
+from .models import Meeting
+
+
+def _cache_key(user_id):
+    return f"meetings:stats:{user_id}"
+
+
+def _timeout():
+    return getattr(settings, "DASHBOARD_STATS_TIMEOUT", 60 * 60 * 24)
+
+
+def _is_current(entry, now):
+    # Upcoming -> ongoing happens at start_time, ongoing -> ended just after
+    # end_time, so counts hold while now < next_start and now <= next_end.
+    next_start, next_end = entry["next_start"], entry["next_end"]
+    return (next_start is None or now < next_start) and (next_end is None or now <= next_end)
+
+
+def _aggregates(now):
+    return {
+        "total_meetings": Count("id"),
+        "upcoming_count": Count("id", filter=status_q(UPCOMING, now)),
+        "ongoing_count": Count("id", filter=status_q(ONGOING, now)),
+        "ended_count": Count("id", filter=status_q(ENDED, now)),
+        "next_start": Min("start_time", filter=Q(start_time__gt=now)),
+        "next_end": Min("end_time", filter=Q(end_time__gte=now)),
+    }
+
+
+def compute_stats(user, now):
+    """Total/upcoming/ongoing/ended counts for ``user``'s meetings in one query."""
+    data = Meeting.objects.filter(organizer=user).aggregate(**_aggregates(now))
+    data["as_of"] = now
+    return data
+
+
+async def acompute_stats(user, now):
+    """``compute_stats`` for async views."""
+    data = await Meeting.objects.filter(organizer=user).aaggregate(**_aggregates(now))
+    data["as_of"] = now
+    return data
+
+
+def _roll_forward(user, entry, now):
+    """Advance cached counts from ``entry['as_of']`` to ``now``."""
+    as_of = entry["as_of"]
+    delta = Meeting.objects.filter(organizer=user, end_time__gte=as_of).aggregate(
+        started=Count("id", filter=Q(start_time__gt=as_of, start_time__lte=now)),
+        finished=Count("id", filter=Q(end_time__lt=now)),
+        next_start=Min("start_time", filter=Q(start_time__gt=now)),
+        next_end=Min("end_time", filter=Q(end_time__gte=now)),
+    )
+    entry = dict(entry)
+    entry["upcoming_count"] -= delta["started"]
+    entry["ended_count"] += delta["finished"]
+    entry["ongoing_count"] = (
+        entry["total_meetings"] - entry["upcoming_count"] - entry["ended_count"]
+    )
+    entry["next_start"] = delta["next_start"]
+    entry["next_end"] = delta["next_end"]
+    entry["as_of"] = now
+    return entry
+
+
+def _usable(entry, version, now):
+    return entry is not None and entry["version"] == version and entry["as_of"] <= now
+
+
+def get_dashboard_stats(user, now):
+    """Cached stats for ``user`` that are correct at ``now``."""
+    key = _cache_key(user.pk)
+    scope = versioning.organizer_scope(user.pk)
+    version = versioning.get_versions([scope])[scope][0]
+    entry = cache.get(key)
+    if _usable(entry, version, now):
+        if _is_current(entry, now):
+            return entry
+        entry = _roll_forward(user, entry, now)
+    else:
+        entry = compute_stats(user, now)
+        entry["version"] = version
+    cache.set(key, entry, _timeout())
+    return entry
+
+
+async def aget_dashboard_stats(user, now):
+    """``get_dashboard_stats`` for async views."""
+    key = _cache_key(user.pk)
+    scope = versioning.organizer_scope(user.pk)
+    version = (await versioning.aget_versions([scope]))[scope][0]
+    entry = await cache.aget(key)
+    if _usable(entry, version, now):
+        if _is_current(entry, now):
+            return entry
+        entry = await sync_to_async(_roll_forward)(user, entry, now)
+    else:
+        entry = await acompute_stats(user, now)
+        entry["version"] = version
+    await cache.aset(key, entry, _timeout())
+    return entry
+
+
+def invalidate_user_stats(user_id):
+    cache.delete(_cache_key(user_id))
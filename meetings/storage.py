@@ -0,0 +1,109 @@
+"""
+Content-addressed storage for meeting minutes.
+
+Files are stored as ``minutes/<aa>/<sha256><ext>``: the name is derived from
+the file's SHA-256, so uploading the same document to several meetings stores
+it once. ``MinutesBlob`` rows count how many meetings point at each stored
+file; the signals in ``meetings.signals`` adjust the count when a meeting's
+``minutes_file`` changes or the meeting is deleted, and the file is removed
+when the count drops to zero.
+"""
+import hashlib
+import os
+
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+ALLOWED_EXTENSIONS = ("pdf", "doc", "docx", "txt")
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Leading bytes of the binary formats we accept; .txt has no signature.
+_SIGNATURES = {
+    "pdf": (b"%PDF",),
+    "docx": (b"PK\x03\x04",),
+    "doc": (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",),
+}
+
+
+def content_name(digest, original_name):
+    ext = os.path.splitext(original_name)[1].lower()
+    return f"minutes/{digest[:2]}/{digest}{ext}"
+
+
+def sha256_of(content):
+    """Hex SHA-256 of a Django File, read in chunks."""
+    digest = hashlib.sha256()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    if hasattr(content, "seek"):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def signature_matches(extension, head):
+    """True if ``head`` (the first bytes of a file) fits its extension."""
+    signatures = _SIGNATURES.get(extension.lower().lstrip("."))
+    return signatures is None or head.startswith(signatures)
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by content hash and never duplicates them."""
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, "chunks"):
+            from django.core.files import File
+
+            content = File(content, name)
+        target = content_name(sha256_of(content), name or content.name)
+        if self.exists(target):
+            return target
+        return super().save(target, content, max_length=max_length)
+
+    def get_available_name(self, name, max_length=None):
+        # Same name means same content, so an existing file is reused as-is.
+        return name
+
+
+# No explicit location: follows MEDIA_ROOT/MEDIA_URL, including test overrides.
+minutes_storage = ContentAddressedStorage()
+
+
+def get_minutes_storage():
+    """Callable for FileField(storage=...) so migrations don't serialise the instance."""
+    return minutes_storage
+
+
+# ---------- reference counting ----------
+def add_reference(name):
+    from .models import MinutesBlob
+
+    if not name:
+        return
+    updated = MinutesBlob.objects.filter(name=name).update(ref_count=F("ref_count") + 1)
+    if not updated:
+        size = minutes_storage.size(name) if minutes_storage.exists(name) else 0
+        MinutesBlob.objects.create(name=name, size=size, ref_count=1)
+
+
+def drop_reference(name):
+    """Decrement a blob's count; delete the blob and file after commit at zero."""
+    from .models import MinutesBlob
+
+    if not name:
+        return
+    MinutesBlob.objects.filter(name=name, ref_count__gt=0).update(ref_count=F("ref_count") - 1)
+    deleted, _ = MinutesBlob.objects.filter(name=name, ref_count=0).delete()
+    if deleted:
+        transaction.on_commit(lambda: delete_if_unreferenced(name))
+
+
+def delete_if_unreferenced(name):
+    """Delete the stored file ``name`` unless a blob (a meeting) refers to it."""
+    from .models import MinutesBlob
+
+    # A concurrent upload of the same content may have re-created the blob.
+    if not MinutesBlob.objects.filter(name=name).exists():
+        minutes_storage.delete(name)
@@ -0,0 +1,16 @@
+"""Background tasks run by ``manage.py run_tasks`` (see meetings.queue)."""
+from datetime import date
+
+from .analytics import refresh_room_days
+from .extraction import extract_blob
+from .queue import task
+
+
+@task("meetings.extract_minutes_text", backoff=60)
+def extract_minutes_text(name):
+    extract_blob(name)
+
+
+@task("meetings.refresh_room_usage")
+def refresh_room_usage(room_id, first_day, last_day):
+    refresh_room_days(room_id, date.fromisoformat(first_day), date.fromisoformat(last_day))
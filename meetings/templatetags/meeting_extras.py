@@ -0,0 +1,39 @@
+import os
+
+from django import template
+from django.core.handlers.asgi import ASGIRequest
+from django.utils.html import format_html
+
+from meetings.filters import ENDED, ONGOING, STATUS_CHOICES, UPCOMING, meeting_status
+
+register = template.Library()
+
+
+@register.filter
+def endswith(value, suffix):
+    """True if the string ``value`` ends with ``suffix``."""
+    return str(value).endswith(suffix)
+
+
+@register.filter
+def basename(value):
+    """File name part of a storage path."""
+    return os.path.basename(str(value))
+
+
+@register.filter
+def streams_events(request):
+    """True if ``request`` is served over ASGI, which can hold live event streams."""
+    return isinstance(request, ASGIRequest)
+
+
+_BADGE_CLASSES = {UPCOMING: "bg-primary", ONGOING: "bg-success", ENDED: "bg-danger"}
+
+
+@register.simple_tag
+def status_badge(meeting, now):
+    """Upcoming/Ongoing/Ended badge for ``meeting`` at ``now`` (see meetings.filters)."""
+    status = meeting_status(meeting, now)
+    return format_html(
+        '<span class="badge {}">{}</span>', _BADGE_CLASSES[status], dict(STATUS_CHOICES)[status]
+    )
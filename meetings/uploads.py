@@ -0,0 +1,154 @@
+"""
+Chunked, resumable minutes uploads.
+
+A client opens a session with the file name and size, then sends the bytes
+in order as raw request bodies tagged with their ``Upload-Offset``. Each
+chunk is streamed from the request straight into a staging file (never held
+in memory), optionally checked against an ``X-Chunk-SHA256`` header, and the
+session's ``received`` offset is advanced. After an interruption the client
+asks for the session's offset and resumes from there. When the last byte
+arrives the staging file is checked, hashed and moved into the
+content-addressed minutes storage (see ``meetings.storage``), and attached to
+the session's meeting. A file that fails those checks is discarded together
+with its session.
+"""
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from .models import MinutesUpload
+from .storage import ALLOWED_EXTENSIONS, delete_if_unreferenced, minutes_storage, signature_matches
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """A rejected upload request; ``status`` is the HTTP status to answer with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def max_upload_size():
+    return getattr(settings, "MINUTES_MAX_UPLOAD_SIZE", 50 * 1024 * 1024)
+
+
+def max_chunk_size():
+    return getattr(settings, "MINUTES_MAX_CHUNK_SIZE", 8 * 1024 * 1024)
+
+
+def staging_dir():
+    return getattr(settings, "MINUTES_UPLOAD_STAGING_DIR", os.path.join(settings.MEDIA_ROOT, "uploads"))
+
+
+def staging_path(upload):
+    return os.path.join(staging_dir(), f"{upload.pk}.part")
+
+
+def start_upload(user, filename, size, meeting):
+    """Open a session for ``meeting``'s minutes after checking the file type and size."""
+    filename = os.path.basename(filename or "")
+    extension = os.path.splitext(filename)[1].lower().lstrip(".")
+    if extension not in ALLOWED_EXTENSIONS:
+        raise UploadError(f"Only {', '.join('.' + e for e in ALLOWED_EXTENSIONS)} files are accepted.")
+    if size <= 0 or size > max_upload_size():
+        raise UploadError(f"File size must be between 1 byte and {max_upload_size()} bytes.", status=413)
+    upload = MinutesUpload.objects.create(user=user, meeting=meeting, filename=filename, size=size)
+    os.makedirs(staging_dir(), exist_ok=True)
+    open(staging_path(upload), "wb").close()
+    return upload
+
+
+def append_chunk(upload, offset, stream, length, chunk_sha256=None):
+    """
+    Write ``length`` bytes from ``stream`` at ``offset``. Bytes that do arrive
+    are kept even if the connection drops, so the client can resume from the
+    returned session's ``received`` offset.
+    """
+    if upload.is_complete:
+        raise UploadError("Upload is already complete.", status=409)
+    if offset != upload.received:
+        raise UploadError(f"Expected offset {upload.received}.", status=409)
+    if length > max_chunk_size():
+        raise UploadError(f"Chunks may be at most {max_chunk_size()} bytes.", status=413)
+    if offset + length > upload.size:
+        raise UploadError("Chunk runs past the declared file size.")
+
+    digest = hashlib.sha256()
+    written = 0
+    with open(staging_path(upload), "r+b") as handle:
+        handle.seek(offset)
+        handle.truncate()
+        while written < length:
+            piece = stream.read(min(STREAM_CHUNK_SIZE, length - written))
+            if not piece:
+                break
+            handle.write(piece)
+            digest.update(piece)
+            written += len(piece)
+        if chunk_sha256 and (written != length or digest.hexdigest() != chunk_sha256.lower()):
+            handle.seek(offset)
+            handle.truncate()
+            raise UploadError("Chunk checksum mismatch; resend it.")
+
+    # Only advance if nobody else moved the offset meanwhile.
+    advanced = MinutesUpload.objects.filter(pk=upload.pk, received=offset).update(
+        received=offset + written, updated_at=timezone.now()
+    )
+    if not advanced:
+        raise UploadError("Upload was modified concurrently; fetch the offset and resume.", status=409)
+    upload.received = offset + written
+    if upload.received == upload.size:
+        finish_upload(upload)
+    return upload
+
+
+def finish_upload(upload):
+    """Validate the staged file, store it by content hash and attach it."""
+    path = staging_path(upload)
+    extension = os.path.splitext(upload.filename)[1]
+    with open(path, "rb") as handle:
+        matches = signature_matches(extension, handle.read(16))
+        if matches:
+            handle.seek(0)
+            upload.stored_name = minutes_storage.save(upload.filename, File(handle, upload.filename))
+    os.remove(path)
+    if not matches:
+        # Every byte arrived, so there is nothing to resume.
+        upload.delete()
+        raise UploadError(f"File content does not look like a {extension} document.", status=415)
+    upload.save(update_fields=["stored_name", "updated_at"])
+
+    if upload.meeting_id:
+        meeting = upload.meeting
+        meeting.minutes_file.name = upload.stored_name
+        meeting.save(update_fields=["minutes_file"])
+    return upload
+
+
+def purge_stale_uploads(max_age=timedelta(days=1)):
+    """
+    Delete sessions idle for longer than ``max_age`` and return the count:
+    unfinished ones with their staged bytes, finished ones once their file
+    belongs to the meeting. A finished file no meeting refers to (uploads
+    started without a meeting, before one was required) is deleted too.
+    """
+    stale = MinutesUpload.objects.filter(updated_at__lt=timezone.now() - max_age)
+    count = 0
+    for upload in stale.iterator():
+        if upload.is_complete:
+            if not upload.meeting_id:
+                delete_if_unreferenced(upload.stored_name)
+        else:
+            try:
+                os.remove(staging_path(upload))
+            except FileNotFoundError:
+                pass
+        upload.delete()
+        count += 1
+    return count
@@ -15,4 +15,15 @@ urlpatterns = [
     path("all_meetings/", views.all_meetings, name="all_meetings"),
     path("signup/", views.signup_view, name="signup"),
     path("minutes_repository/", views.minutes_repository, name="minutes_repository"),
+    path("meetings/<int:meeting_id>/minutes/", views.download_minutes, name="download_minutes"),
+    path("minutes/uploads/", views.start_minutes_upload, name="start_minutes_upload"),
+    path("minutes/uploads/<uuid:upload_id>/", views.minutes_upload, name="minutes_upload"),
+    path("occurrences/", views.meeting_occurrences, name="meeting_occurrences"),
+    path("availability/", views.room_availability, name="room_availability"),
+    path("analytics/rooms/", views.room_utilization, name="room_utilization"),
+    path("cache/stats/", views.listing_cache_stats, name="listing_cache_stats"),
+    path("live/meetings/", views.live_events, name="live_events"),
+    path("export/<str:fmt>/", views.export_meetings, name="export_meetings"),
+    path("feeds/rooms/<int:room_id>.ics", views.room_feed, name="room_feed"),
+    path("feeds/organizers/<int:user_id>.ics", views.organizer_feed, name="organizer_feed"),
 ]
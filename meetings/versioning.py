@@ -0,0 +1,200 @@
+"""
+Per-scope change versions and conditional GET support.
+
+Every write to a Meeting, MeetingRoom or organizer bumps the ScopeVersion rows
+it affects (see ``meetings.signals``):
+
+* ``global``        - any meeting or room change,
+* ``room:<id>``     - meetings in that room, or the room itself,
+* ``organizer:<id>``- meetings organised by that user, or the user's name,
+* ``meeting:<id>``  - that meeting,
+* ``rooms``/``users`` - any room / username change (for pages that show names).
+
+Views wrapped in ``@versioned(...)`` turn the versions of the scopes they
+depend on into ETag and Last-Modified headers and answer matching requests
+with 304 after a single primary-key lookup, before any queryset or template
+work. The rows live in the database so every worker process sees the same
+versions.
+
+Scope rows are bumped inside the writing transaction, except ``global``:
+every booking touches it, and holding its row lock until commit would queue
+bookings in different rooms behind each other. It is bumped once the write
+commits, in a transaction of its own.
+"""
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .models import ScopeVersion
+
+GLOBAL = "global"
+ROOMS = "rooms"
+USERS = "users"
+
+
+def room_scope(room_id):
+    return f"room:{room_id}"
+
+
+def organizer_scope(user_id):
+    return f"organizer:{user_id}"
+
+
+def meeting_scope(meeting_id):
+    return f"meeting:{meeting_id}"
+
+
+def bump(*scopes):
+    """Increment the version of each scope, creating rows as needed; ``global`` after commit."""
+    scopes = set(scopes)
+    if GLOBAL in scopes:
+        scopes.discard(GLOBAL)
+        transaction.on_commit(lambda: _bump([GLOBAL]))
+    if scopes:
+        _bump(sorted(scopes))
+
+
+def _bump(scopes):
+    now = timezone.now()
+    updated = ScopeVersion.objects.filter(scope__in=scopes).update(
+        version=F("version") + 1, changed_at=now
+    )
+    if updated < len(scopes):
+        existing = set(
+            ScopeVersion.objects.filter(scope__in=scopes).values_list("scope", flat=True)
+        )
+        ScopeVersion.objects.bulk_create(
+            [ScopeVersion(scope=s, version=1, changed_at=now) for s in scopes if s not in existing],
+            ignore_conflicts=True,
+        )
+
+
+def get_versions(scopes):
+    """Map scope -> (version, changed_at); unknown scopes are version 0."""
+    found = {
+        scope: (version, changed_at)
+        for scope, version, changed_at in ScopeVersion.objects.filter(
+            scope__in=scopes
+        ).values_list("scope", "version", "changed_at")
+    }
+    return {scope: found.get(scope, (0, None)) for scope in scopes}
+
+
+async def aget_versions(scopes):
+    """``get_versions`` for async views."""
+    found = {
+        scope: (version, changed_at)
+        async for scope, version, changed_at in ScopeVersion.objects.filter(
+            scope__in=scopes
+        ).values_list("scope", "version", "changed_at")
+    }
+    return {scope: found.get(scope, (0, None)) for scope in scopes}
+
+
+def _time_bucket():
+    """Start of the current status window; list badges flip as time passes."""
+    size = getattr(settings, "CONDITIONAL_GET_TIME_BUCKET", 60)
+    now = timezone.now().timestamp()
+    return datetime.fromtimestamp(now - now % size, tz=dt_timezone.utc)
+
+
+def validators(scopes, *, vary=(), time_bucket=False, versions=None):
+    """
+    (etag, last_modified) for content that depends on ``scopes``; pass
+    ``versions`` from ``get_versions`` to skip the lookup.
+    """
+    if versions is None:
+        versions = get_versions(sorted(set(scopes)))
+    parts = [f"{scope}={version}" for scope, (version, _) in versions.items()]
+    parts.extend(str(value) for value in vary)
+    stamps = [changed_at for _, changed_at in versions.values() if changed_at]
+    if time_bucket:
+        bucket = _time_bucket()
+        parts.append(bucket.isoformat())
+        stamps.append(bucket)
+    etag = hashlib.md5("|".join(parts).encode()).hexdigest()
+    last_modified = max(stamps) if stamps else None
+    return etag, last_modified
+
+
+def _has_pending_messages(request):
+    return hasattr(request, "_messages") and len(messages.get_messages(request)) > 0
+
+
+def conditional_response(request, etag, last_modified):
+    """A 304/412 response if the request's validators match, else None."""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=quote_etag(etag), last_modified=timestamp)
+
+
+def set_validators(response, etag, last_modified):
+    if response.status_code == 200:
+        response.headers.setdefault("ETag", quote_etag(etag))
+        if last_modified:
+            response.headers.setdefault("Last-Modified", http_date(last_modified.timestamp()))
+    return response
+
+
+def _vary(request, per_user):
+    # The CSRF cookie too: pages render {% csrf_token %} (the logout form), and
+    # logging in again rotates it, so an older copy would post a stale token.
+    vary = [request.COOKIES.get(settings.CSRF_COOKIE_NAME, "")]
+    if per_user:
+        vary.append(request.user.pk)
+    return vary
+
+
+def versioned(scopes, *, time_bucket=False, per_user=True):
+    """
+    Decorator for GET views, sync or async. ``scopes(request, **kwargs)``
+    lists the scopes the page depends on. Pages with pending flash messages
+    are never 304'd, and the ETag varies with the user and CSRF cookie.
+    """
+    def respond(request, versions, vary):
+        # Reused by the view, e.g. as a cache version (see meetings.listing_cache).
+        request.scope_versions = versions
+        etag, last_modified = validators(
+            versions, vary=vary, time_bucket=time_bucket, versions=versions
+        )
+        return etag, last_modified, conditional_response(request, etag, last_modified)
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                # Resolved once here so ``scopes`` and the view can read
+                # request.user without a synchronous query.
+                request.user = await request.auser()
+                if request.method not in ("GET", "HEAD") or await sync_to_async(
+                    _has_pending_messages
+                )(request):
+                    return await view(request, *args, **kwargs)
+                vary = _vary(request, per_user)
+                versions = await aget_versions(sorted(set(scopes(request, *args, **kwargs))))
+                etag, last_modified, response = respond(request, versions, vary)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return set_validators(response, etag, last_modified)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD") or _has_pending_messages(request):
+                return view(request, *args, **kwargs)
+            vary = _vary(request, per_user)
+            versions = get_versions(sorted(set(scopes(request, *args, **kwargs))))
+            etag, last_modified, response = respond(request, versions, vary)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return set_validators(response, etag, last_modified)
+        return wrapper
+    return decorator
@@ -1,37 +1,61 @@
 from django.contrib import messages
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, redirect, get_object_or_404
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import login
 from django.utils import timezone
-from django.core.paginator import Paginator
-from django.db.models import Q
-
+from django.utils.text import slugify
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_http_methods
+from django.utils.dateparse import parse_datetime
+from meeting_manager.routing import replica_reads
+from datetime import date, timedelta
+from itertools import islice
+
+from .analytics import usage_summary
+from .availability import availability
+from .exports import FORMATS as EXPORT_FORMATS, stream_export
+from . import archive, feeds, listing_cache, live
+from .downloads import serve_file
+from .filters import filter_meetings
 from .forms import MeetingForm, CustomUserCreationForm
-from .models import Meeting
+from .models import Meeting, MinutesUpload
+from .pagination import KeysetPaginator, clamp_page_size
+from .recurrence import FIELDS as RULE_FIELDS, expand, in_window, occurrences
+from .search import search_meetings
+from .services import BookingConflict, book_meeting
+from .stats import aget_dashboard_stats
+from . import versioning
+from .storage import minutes_storage
+from .uploads import UploadError, append_chunk, start_upload
+from .versioning import versioned
+
+# Context processors read the session and messages, which are sync-only.
+arender = sync_to_async(render)
 
 
 # -----------------------------------
 # HOME DASHBOARD
 # -----------------------------------
+@replica_reads
 @login_required
-def home(request):
+async def home(request):
     """User dashboard showing meeting stats for their own meetings only"""
     now = timezone.localtime()
-    qs = Meeting.objects.filter(organizer=request.user)
-
-    total_meetings = qs.count()
-    upcoming_count = qs.filter(start_time__gt=now).count()
-    ongoing_count = qs.filter(start_time__lte=now, end_time__gte=now).count()
-    ended_count = qs.filter(end_time__lt=now).count()
+    # Resolved asynchronously once; the context processors reuse it.
+    request.user = await request.auser()
+    stats = await aget_dashboard_stats(request.user, now)
 
     context = {
-        "total_meetings": total_meetings,
-        "upcoming_count": upcoming_count,
-        "ongoing_count": ongoing_count,
-        "ended_count": ended_count,
+        "total_meetings": stats["total_meetings"],
+        "upcoming_count": stats["upcoming_count"],
+        "ongoing_count": stats["ongoing_count"],
+        "ended_count": stats["ended_count"],
         "now": now,
     }
-    return render(request, "meetings/home.html", context)
+    return await arender(request, "meetings/home.html", context)
 
 
 # -----------------------------------
@@ -46,20 +70,19 @@ def create_meeting(request):
             meeting.organizer = request.user
 
             # Prevent booking conflict (same room overlapping time)
-            conflict_exists = Meeting.objects.filter(
-                room=meeting.room,
-                start_time__lt=meeting.end_time,
-                end_time__gt=meeting.start_time,
-            ).exists()
-
-            if conflict_exists:
-                messages.error(
-                    request,
-                    f"A meeting already exists in {meeting.room.name} during this time. Please choose another slot.",
-                )
+            try:
+                book_meeting(meeting)
+            except BookingConflict as exc:
+                if meeting.is_recurring:
+                    messages.error(request, f"{exc} Please choose another slot.")
+                else:
+                    messages.error(
+                        request,
+                        f"A meeting already exists in {meeting.room.name} during this time. Please choose another slot."
+                        + _alternatives_hint(meeting),
+                    )
                 return render(request, "meetings/create_meeting.html", {"form": form})
 
-            meeting.save()
             messages.success(request, "Meeting created successfully!")
             return redirect("meeting_list")
 
@@ -69,46 +92,174 @@ def create_meeting(request):
     return render(request, "meetings/create_meeting.html", {"form": form})
 
 
+def _alternatives_hint(meeting):
+    """Short suggestion text appended to booking conflict messages."""
+    suggestions = availability.suggest_alternatives(
+        meeting.room_id, meeting.start_time, meeting.end_time
+    )
+    hint = ""
+    if suggestions["rooms"]:
+        names = ", ".join(room["name"] for room in suggestions["rooms"][:3])
+        hint += f" Free rooms at that time: {names}."
+    if suggestions["next_slot"]:
+        next_start = timezone.localtime(suggestions["next_slot"][0])
+        hint += f" {meeting.room.name} is next free at {next_start:%b %d, %Y %I:%M %p}."
+    return hint
+
+
+# -----------------------------------
+# ROOM AVAILABILITY (JSON)
+# -----------------------------------
+def _parse_when(value):
+    dt = parse_datetime(value or "")
+    if dt is not None and timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+MAX_AVAILABILITY_WINDOW = timedelta(days=92)
+
+
+@login_required
+def room_availability(request):
+    """
+    Free rooms and free slots between ``start`` and ``end`` (at most 92 days).
+    Optional: ``capacity`` (minimum seats), ``rooms`` (comma-separated ids) and
+    ``duration`` (minutes) to also return the earliest slot free in every room.
+    """
+    start = _parse_when(request.GET.get("start"))
+    end = _parse_when(request.GET.get("end"))
+    if not start or not end or not start < end <= start + MAX_AVAILABILITY_WINDOW:
+        return JsonResponse(
+            {"error": "start and end must be ISO datetimes with end after start, at most 92 days apart."},
+            status=400,
+        )
+
+    try:
+        capacity = int(request.GET.get("capacity") or 0)
+        room_ids = [int(pk) for pk in request.GET.get("rooms", "").split(",") if pk.strip()] or None
+        duration = int(request.GET.get("duration") or 0)
+    except ValueError:
+        return JsonResponse({"error": "capacity, rooms and duration must be integers."}, status=400)
+
+    free_rooms = availability.free_rooms(start, end, capacity, room_ids)
+    slots = availability.free_slots(room_ids, start, end, min_capacity=capacity)
+    data = {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "free_rooms": free_rooms,
+        "free_slots": {
+            str(pk): [[s.isoformat(), e.isoformat()] for s, e in room_slots]
+            for pk, room_slots in slots.items()
+        },
+    }
+    if duration and room_ids:
+        slot = availability.earliest_common_slot(room_ids, timedelta(minutes=duration), start, end)
+        data["earliest_common_slot"] = [slot[0].isoformat(), slot[1].isoformat()] if slot else None
+    return JsonResponse(data)
+
+
+# -----------------------------------
+# MEETING OCCURRENCES (JSON CALENDAR)
+# -----------------------------------
+MAX_OCCURRENCE_WINDOW = timedelta(days=92)
+
+
+@replica_reads
+@login_required
+def meeting_occurrences(request):
+    """
+    Every meeting occurrence between ``start`` and ``end`` (at most 92 days),
+    with recurring meetings expanded for that window only. Optional: ``room``
+    (id) and ``mine=1``.
+    """
+    start = _parse_when(request.GET.get("start"))
+    end = _parse_when(request.GET.get("end"))
+    if not start or not end or not start < end <= start + MAX_OCCURRENCE_WINDOW:
+        return JsonResponse(
+            {"error": "start and end must be ISO datetimes at most 92 days apart."}, status=400
+        )
+    qs = in_window(Meeting.objects.for_listing(*RULE_FIELDS), start, end)
+    if request.GET.get("room", "").isdigit():
+        qs = qs.filter(room_id=request.GET["room"])
+    if request.GET.get("mine"):
+        qs = qs.filter(organizer=request.user)
+    meetings = {meeting.pk: meeting for meeting in qs.order_by()}
+    data = [
+        {
+            "meeting": occurrence.meeting_id,
+            "title": meetings[occurrence.meeting_id].title,
+            "room": meetings[occurrence.meeting_id].room.name,
+            "organizer": meetings[occurrence.meeting_id].organizer.username,
+            "start": occurrence.start.isoformat(),
+            "end": occurrence.end.isoformat(),
+        }
+        for occurrence in expand(meetings.values(), start, end)
+    ]
+    return JsonResponse({"start": start.isoformat(), "end": end.isoformat(), "occurrences": data})
+
+
+# -----------------------------------
+# ROOM UTILISATION (JSON)
+# -----------------------------------
+MAX_UTILIZATION_DAYS = 366
+
+
+@replica_reads
+@login_required
+def room_utilization(request):
+    """
+    Per-room utilisation between the ``from`` and ``to`` dates (default: the
+    last 30 days), read from the daily usage rollup, and the most meetings
+    running at once. Optional: ``rooms`` (comma-separated ids).
+    """
+    today = timezone.localdate()
+    try:
+        first_day = date.fromisoformat(request.GET.get("from") or (today - timedelta(days=29)).isoformat())
+        last_day = date.fromisoformat(request.GET.get("to") or today.isoformat())
+        room_ids = [int(pk) for pk in request.GET.get("rooms", "").split(",") if pk.strip()] or None
+    except ValueError:
+        return JsonResponse({"error": "from and to must be YYYY-MM-DD dates and rooms integers."}, status=400)
+    if not first_day <= last_day < first_day + timedelta(days=MAX_UTILIZATION_DAYS):
+        return JsonResponse(
+            {"error": f"to must be on or after from and at most {MAX_UTILIZATION_DAYS} days later."},
+            status=400,
+        )
+    return JsonResponse(usage_summary(first_day, last_day, room_ids))
+
+
+def _paginator(qs, q, per_page=None):
+    """Keyset paginator for a list view; search results page in rank order."""
+    ordering = ("-search_rank", "-start_time", "-id") if q else ("-start_time", "-id")
+    return KeysetPaginator(qs, per_page, ordering=ordering, count_mode="capped")
+
+
 # -----------------------------------
 # USER’S MEETINGS LIST (PRIVATE)
 # -----------------------------------
+@replica_reads
 @login_required
-def meeting_list(request):
-    """Shows ONLY meetings created by the logged-in user"""
+@versioned(
+    lambda request: [versioning.organizer_scope(request.user.pk), versioning.ROOMS],
+    time_bucket=True,
+)
+async def meeting_list(request):
+    """Shows ONLY meetings created by the logged-in user; searches include archived ones."""
     now = timezone.localtime()
-    qs = Meeting.objects.filter(organizer=request.user).order_by("-start_time")
+    q = (request.GET.get("q") or "").strip()
 
     # Filters
-    q = (request.GET.get("q") or "").strip()
-    if q:
-        qs = qs.filter(
-            Q(title__icontains=q)
-            | Q(description__icontains=q)
-            | Q(room__name__icontains=q)
-        )
+    def build(qs):
+        return filter_meetings(qs.filter(organizer=request.user).for_listing(), request.GET, now)
 
+    qs = archive.history(build) if q else build(Meeting.objects.all())
     status = (request.GET.get("status") or "all").lower()
-    if status == "upcoming":
-        qs = qs.filter(start_time__gt=now)
-    elif status == "ongoing":
-        qs = qs.filter(start_time__lte=now, end_time__gte=now)
-    elif status == "ended":
-        qs = qs.filter(end_time__lt=now)
-
     date_from = request.GET.get("date_from")
     date_to = request.GET.get("date_to")
-    if date_from:
-        qs = qs.filter(start_time__date__gte=date_from)
-    if date_to:
-        qs = qs.filter(start_time__date__lte=date_to)
-
-    try:
-        per_page = int(request.GET.get("per_page", 10))
-    except ValueError:
-        per_page = 10
 
-    paginator = Paginator(qs, per_page)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    per_page = clamp_page_size(request.GET.get("per_page"))
+    paginator = _paginator(qs, q, per_page)
+    page_obj = await paginator.aget_page(request.GET.get("cursor"))
 
     context = {
         "meetings": page_obj.object_list,
@@ -121,50 +272,78 @@ def meeting_list(request):
         "date_to": date_to or "",
         "per_page": per_page,
     }
-    return render(request, "meetings/meeting_list.html", context)
+    return await arender(request, "meetings/meeting_list.html", context)
 
 
 # -----------------------------------
 # ALL MEETINGS (READ-ONLY)
 # -----------------------------------
+LISTING_SCOPES = [versioning.GLOBAL, versioning.USERS]
+
+
+@replica_reads
 @login_required
-def all_meetings(request):
+@versioned(lambda request: LISTING_SCOPES, time_bucket=True)
+async def all_meetings(request):
     """
-    Displays ALL meetings from all users (read-only view).
+    Displays ALL meetings from all users, archived ones included (read-only view).
+    Pages and rendered rows come from the shared listing cache.
     """
     now = timezone.localtime()
-    qs = Meeting.objects.all().order_by("-start_time")
-
     q = (request.GET.get("q") or "").strip()
-    if q:
-        qs = qs.filter(
-            Q(title__icontains=q)
-            | Q(description__icontains=q)
-            | Q(room__name__icontains=q)
-            | Q(organizer__username__icontains=q)
-        )
+    cursor = request.GET.get("cursor")
+
+    def build(qs):
+        qs = qs.for_listing()
+        return search_meetings(qs, q) if q else qs
 
-    paginator = Paginator(qs, 10)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    async def build_page():
+        return await _paginator(archive.history(build), q).aget_page(cursor)
+
+    token = await listing_cache.aversion(request, LISTING_SCOPES)
+    page_obj = await listing_cache.aget_page(
+        "all_meetings", token, {"q": q, "cursor": cursor}, build_page
+    )
 
     context = {
         "meetings": page_obj.object_list,
+        "rows": await listing_cache.arender_rows(
+            "meetings/_all_meetings_row.html", page_obj.object_list, token, now
+        ),
         "page_obj": page_obj,
-        "paginator": paginator,
+        "paginator": page_obj.paginator,
         "now": now,
         "q": q,
     }
-    return render(request, "meetings/all_meetings.html", context)
+    return await arender(request, "meetings/all_meetings.html", context)
 
 
 # -----------------------------------
 # MEETING DETAILS
 # -----------------------------------
+@replica_reads
 @login_required
-def meeting_detail(request, meeting_id):
-    """Show meeting details (any user can view)"""
-    meeting = get_object_or_404(Meeting, id=meeting_id)
-    return render(request, "meetings/meeting_detail.html", {"meeting": meeting})
+@versioned(
+    lambda request, meeting_id: [
+        versioning.meeting_scope(meeting_id), versioning.ROOMS, versioning.USERS
+    ]
+)
+async def meeting_detail(request, meeting_id):
+    """Show meeting details (any user can view), archived meetings included"""
+    meeting = await archive.afind(
+        meeting_id, lambda qs: qs.for_listing("description", *RULE_FIELDS)
+    )
+    if meeting is None:
+        raise Http404("No such meeting.")
+    upcoming = []
+    if meeting.is_recurring:
+        upcoming = list(islice(occurrences(meeting, start=timezone.now()), 5))
+    context = {
+        "meeting": meeting,
+        "upcoming_occurrences": upcoming,
+        "room_feed_url": feeds.feed_url(request, feeds.ROOM, meeting.room_id),
+    }
+    return await arender(request, "meetings/meeting_detail.html", context)
 
 
 # -----------------------------------
@@ -179,24 +358,23 @@ def edit_meeting(request, meeting_id):
         if form.is_valid():
             updated = form.save(commit=False)
 
-            overlap = Meeting.objects.filter(
-                room=updated.room,
-                start_time__lt=updated.end_time,
-                end_time__gt=updated.start_time,
-            ).exclude(id=meeting.id).exists()
-
-            if overlap:
-                messages.error(
-                    request,
-                    f"Another meeting already exists in {updated.room.name} at that time.",
-                )
+            try:
+                book_meeting(updated)
+            except BookingConflict as exc:
+                if updated.is_recurring:
+                    messages.error(request, str(exc))
+                else:
+                    messages.error(
+                        request,
+                        f"Another meeting already exists in {updated.room.name} at that time."
+                        + _alternatives_hint(updated),
+                    )
                 return render(
                     request,
                     "meetings/meeting_edit.html",
                     {"form": form, "meeting": meeting},
                 )
 
-            updated.save()
             messages.success(request, "Meeting updated successfully (including minutes if uploaded).")
             return redirect("meeting_detail", meeting_id=meeting.id)
         messages.error(request, "Please correct the errors below.")
@@ -226,32 +404,219 @@ def delete_meeting(request, meeting_id):
 # -----------------------------------
 # MINUTES REPOSITORY (NEW)
 # -----------------------------------
+@replica_reads
 @login_required
-def minutes_repository(request):
-    """Displays all meetings that have uploaded minutes"""
+@versioned(lambda request: LISTING_SCOPES)
+async def minutes_repository(request):
+    """Displays all meetings that have uploaded minutes, archived ones included"""
     now = timezone.localtime()
-    qs = Meeting.objects.filter(minutes_file__isnull=False).exclude(minutes_file="").order_by("-start_time")
-
     q = (request.GET.get("q") or "").strip()
-    if q:
-        qs = qs.filter(
-            Q(title__icontains=q)
-            | Q(description__icontains=q)
-            | Q(room__name__icontains=q)
-            | Q(organizer__username__icontains=q)
-        )
+    cursor = request.GET.get("cursor")
 
-    paginator = Paginator(qs, 10)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    def build(qs):
+        qs = qs.filter(minutes_file__isnull=False).exclude(minutes_file="").for_listing("minutes_file")
+        return search_meetings(qs, q) if q else qs
+
+    async def build_page():
+        return await _paginator(archive.history(build), q).aget_page(cursor)
+
+    token = await listing_cache.aversion(request, LISTING_SCOPES)
+    page_obj = await listing_cache.aget_page(
+        "minutes_repository", token, {"q": q, "cursor": cursor}, build_page
+    )
 
     context = {
         "meetings": page_obj.object_list,
+        "rows": await listing_cache.arender_rows(
+            "meetings/_minutes_row.html", page_obj.object_list, token
+        ),
         "page_obj": page_obj,
-        "paginator": paginator,
+        "paginator": page_obj.paginator,
         "now": now,
         "q": q,
     }
-    return render(request, "meetings/minutes_repository.html", context)
+    return await arender(request, "meetings/minutes_repository.html", context)
+
+
+# -----------------------------------
+# LIVE MEETING EVENTS (SERVER-SENT EVENTS)
+# -----------------------------------
+@login_required
+async def live_events(request):
+    """
+    Booking, edit and delete events for ``rooms`` (comma-separated ids; all
+    rooms when omitted) as a text/event-stream; see ``meetings.live``.
+    """
+    try:
+        rooms = [int(room) for room in request.GET.get("rooms", "").split(",") if room.strip()]
+        last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return JsonResponse({"error": "rooms and Last-Event-ID must be integers."}, status=400)
+    if isinstance(request, ASGIRequest):
+        response = StreamingHttpResponse(
+            live.stream(rooms, last_event_id), content_type="text/event-stream"
+        )
+    else:
+        # Under WSGI an open stream would hold a worker thread: answer with
+        # what is waiting at once; the EventSource polls again after its retry.
+        chunks = [chunk async for chunk in live.stream(rooms, last_event_id, once=True)]
+        response = HttpResponse("".join(chunks), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+# -----------------------------------
+# LISTING CACHE STATS (JSON, STAFF)
+# -----------------------------------
+@staff_member_required
+def listing_cache_stats(request):
+    """Hit/miss counters of this worker process's listing cache."""
+    return JsonResponse(listing_cache.stats())
+
+
+# -----------------------------------
+# BULK EXPORT (STREAMING)
+# -----------------------------------
+@login_required
+def export_meetings(request, fmt):
+    """
+    Stream meetings, archived ones included, as CSV, NDJSON or ICS. Accepts
+    the meeting_list filters (q, status, date_from, date_to); ``mine=1``
+    limits it to your meetings.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise Http404("Unknown export format.")
+    now = timezone.localtime()
+
+    def build(qs):
+        if request.GET.get("mine"):
+            qs = qs.filter(organizer=request.user)
+        return filter_meetings(qs, request.GET, now)
+
+    qs = archive.history(build)
+
+    content_type, extension, _, _ = EXPORT_FORMATS[fmt]
+    response = StreamingHttpResponse(stream_export(qs, fmt), content_type=content_type)
+    stamp = timezone.localtime().strftime("%Y%m%d-%H%M")
+    response["Content-Disposition"] = f'attachment; filename="meetings-{stamp}.{extension}"'
+    return response
+
+
+# -----------------------------------
+# CALENDAR FEEDS (ICS SUBSCRIPTIONS)
+# -----------------------------------
+def _calendar_feed(request, kind, pk):
+    """Serve a cached feed to logged-in users or holders of the signed token."""
+    if not request.user.is_authenticated and not feeds.check_feed_token(
+        kind, pk, request.GET.get("token")
+    ):
+        raise Http404("No such calendar.")
+    etag, last_modified = feeds.feed_validators(kind, pk)
+    not_modified = versioning.conditional_response(request, etag, last_modified)
+    if not_modified is not None:
+        return not_modified
+    text = feeds.get_feed(kind, pk, etag)
+    response = HttpResponse(text, content_type="text/calendar; charset=utf-8")
+    return versioning.set_validators(response, etag, last_modified)
+
+
+@replica_reads
+def room_feed(request, room_id):
+    return _calendar_feed(request, feeds.ROOM, room_id)
+
+
+@replica_reads
+def organizer_feed(request, user_id):
+    return _calendar_feed(request, feeds.ORGANIZER, user_id)
+
+
+# -----------------------------------
+# MINUTES DOWNLOAD
+# -----------------------------------
+@login_required
+@require_http_methods(["GET", "HEAD"])
+def download_minutes(request, meeting_id):
+    """Serve a meeting's minutes to any logged-in user, with Range support."""
+    meeting = archive.find(meeting_id, lambda qs: qs.only("id", "title", "minutes_file"))
+    if meeting is None:
+        raise Http404("No such meeting.")
+    name = meeting.minutes_file.name
+    if not name or not minutes_storage.exists(name):
+        raise Http404("This meeting has no minutes.")
+    extension = name.rsplit(".", 1)[-1] if "." in name else "bin"
+    download_name = f"{slugify(meeting.title) or 'meeting'}-minutes.{extension}"
+    return serve_file(
+        request, minutes_storage, name, download_name,
+        as_attachment=bool(request.GET.get("download")),
+    )
+
+
+# -----------------------------------
+# RESUMABLE MINUTES UPLOADS
+# -----------------------------------
+def _upload_state(upload):
+    return {
+        "id": str(upload.pk),
+        "filename": upload.filename,
+        "size": upload.size,
+        "offset": upload.received,
+        "complete": upload.is_complete,
+        "stored_name": upload.stored_name or None,
+        "meeting": upload.meeting_id,
+    }
+
+
+@login_required
+@require_http_methods(["POST"])
+def start_minutes_upload(request):
+    """
+    Open an upload session. POST ``filename``, ``size`` and the ``meeting``
+    (one of yours) the finished file is attached to.
+    """
+    if not request.POST.get("meeting", "").isdigit():
+        return JsonResponse({"error": "meeting is required."}, status=400)
+    meeting = get_object_or_404(Meeting, id=request.POST["meeting"], organizer=request.user)
+    try:
+        size = int(request.POST.get("size", ""))
+        upload = start_upload(request.user, request.POST.get("filename"), size, meeting=meeting)
+    except ValueError:
+        return JsonResponse({"error": "size must be an integer."}, status=400)
+    except UploadError as exc:
+        return JsonResponse({"error": str(exc)}, status=exc.status)
+    return JsonResponse(_upload_state(upload), status=201)
+
+
+@login_required
+@require_http_methods(["GET", "HEAD", "PATCH"])
+def minutes_upload(request, upload_id):
+    """
+    GET returns the session's offset so an interrupted client can resume.
+    PATCH appends the raw request body at the ``Upload-Offset`` header.
+    """
+    upload = get_object_or_404(MinutesUpload, pk=upload_id, user=request.user)
+    if request.method == "PATCH":
+        try:
+            offset = int(request.headers.get("Upload-Offset", ""))
+            length = int(request.headers.get("Content-Length") or 0)
+        except ValueError:
+            return JsonResponse({"error": "Upload-Offset header is required."}, status=400)
+        try:
+            append_chunk(
+                upload, offset, request, length,
+                chunk_sha256=request.headers.get("X-Chunk-SHA256"),
+            )
+        except UploadError as exc:
+            try:
+                upload.refresh_from_db()
+            except MinutesUpload.DoesNotExist:
+                # Rejected once complete; the session is gone.
+                return JsonResponse({"error": str(exc)}, status=exc.status)
+            return JsonResponse({"error": str(exc), **_upload_state(upload)}, status=exc.status)
+    response = JsonResponse(_upload_state(upload))
+    response["Upload-Offset"] = upload.received
+    return response
 
 
 # -----------------------------------